@@ -0,0 +1,98 @@
+from app.services.batch import BatchRunner
+from app.services.cache import StageCache
+from app.services.clients import ClientRegistry
+from app.services.company_index import CompanyIndex
+from app.services.compaction import Compactor
+from app.services.fit_scoring import FitScorer
+from app.services.jobs import JobQueue
+from app.services.metrics import Metrics
+from app.services.parallel_service import ParallelService
+from app.services.parser import PDFParser
+from app.services.pipeline import PipelineLimits
+from app.services.resume_extractor import ResumeExtractor
+from app.services.resumes import ResumeStore
+from app.services.runs import RunRecordStore
+from app.services.sessions import SessionStore
+from app.services.singleflight import SingleFlight
+from app.services.warmup import CacheWarmer
+from fastapi import Request
+
+
+def get_clients(request: Request) -> ClientRegistry:
+    return request.app.state.clients
+
+
+def get_cache(request: Request) -> StageCache | None:
+    return request.app.state.cache
+
+
+def get_flight(request: Request) -> SingleFlight:
+    return request.app.state.flight
+
+
+def get_compactor(request: Request) -> Compactor:
+    return request.app.state.compactor
+
+
+def get_fit_scorer(request: Request) -> FitScorer:
+    return request.app.state.fit_scorer
+
+
+def get_company_index(request: Request) -> CompanyIndex:
+    return request.app.state.companies
+
+
+def get_parallel_service(request: Request) -> ParallelService:
+    return ParallelService(
+        get_clients(request),
+        get_cache(request),
+        get_flight(request),
+        get_compactor(request),
+        get_fit_scorer(request),
+        get_company_index(request),
+    )
+
+
+def get_resume_extractor(request: Request) -> ResumeExtractor:
+    return request.app.state.resume_extractor
+
+
+def get_pdf_parser(request: Request) -> PDFParser:
+    return PDFParser(
+        get_clients(request),
+        request.app.state.pdf_limits,
+        request.app.state.pdf_pool,
+        get_resume_extractor(request),
+    )
+
+
+def get_resume_store(request: Request) -> ResumeStore:
+    return request.app.state.resumes
+
+
+def get_job_queue(request: Request) -> JobQueue:
+    return request.app.state.jobs
+
+
+def get_batch_runner(request: Request) -> BatchRunner:
+    return request.app.state.batch
+
+
+def get_pipeline_limits(request: Request) -> PipelineLimits:
+    return request.app.state.pipeline_limits
+
+
+def get_run_records(request: Request) -> RunRecordStore:
+    return request.app.state.runs
+
+
+def get_session_store(request: Request) -> SessionStore:
+    return request.app.state.sessions
+
+
+def get_metrics(request: Request) -> Metrics:
+    return request.app.state.metrics
+
+
+def get_cache_warmer(request: Request) -> CacheWarmer:
+    return request.app.state.warmer
@@ -1,12 +1,82 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+
 import dotenv
 import uvicorn
+from app.routes.admin import router as admin_router
+from app.routes.interview import router as interview_router
 from app.routes.pipeline import router as pipeline_router
+from app.routes.runs import router as runs_router
+from app.routes.stats import router as stats_router
+from app.services.batch import BatchRunner
+from app.services.cache import StageCache
+from app.services.clients import ClientRegistry
+from app.services.company_index import CompanyIndex
+from app.services.compaction import Compactor
+from app.services.fit_scoring import FitScorer
+from app.services.jobs import JobQueue
+from app.services.metrics import Metrics
+from app.services.parallel_service import ParallelService
+from app.services.parser import PDFLimits
+from app.services.pipeline import PipelineLimits
+from app.services.resume_extractor import ResumeExtractor
+from app.services.resumes import ResumeStore
+from app.services.runs import RunRecordStore
+from app.services.sessions import SessionStore
+from app.services.singleflight import SingleFlight
+from app.services.warmup import CacheWarmer
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 dotenv.load_dotenv()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # one pooled OpenAI / Parallel client pair for the whole process
+    app.state.metrics = Metrics()
+    app.state.clients = ClientRegistry.from_env(app.state.metrics)
+    app.state.cache = StageCache.from_env(app.state.metrics)
+    app.state.flight = SingleFlight()
+    app.state.compactor = Compactor.from_env()
+    app.state.fit_scorer = FitScorer.from_env()
+    app.state.runs = RunRecordStore.from_env()
+    app.state.jobs = JobQueue.from_env()
+    app.state.jobs.start()
+    # workers are only spawned once a large PDF actually needs them
+    app.state.pdf_limits = PDFLimits.from_env()
+    app.state.pdf_pool = (
+        ProcessPoolExecutor(
+            max_workers=app.state.pdf_limits.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        if app.state.pdf_limits.workers > 1
+        else None
+    )
+    app.state.resume_extractor = ResumeExtractor.from_env()
+    app.state.resumes = ResumeStore.from_env(app.state.flight)
+    app.state.batch = BatchRunner.from_env()
+    app.state.pipeline_limits = PipelineLimits.from_env()
+    app.state.sessions = SessionStore.from_env()
+    # company research runs only here, in the background; requests read the
+    # index. No stage cache, so a refresh always goes upstream.
+    app.state.companies = CompanyIndex.from_env()
+    researcher = ParallelService(
+        app.state.clients, None, app.state.flight, app.state.compactor
+    )
+    app.state.companies.start(researcher.company_research)
+    app.state.warmer = CacheWarmer.from_env(app.state.cache, app.state.companies)
+    yield
+    await app.state.companies.stop()
+    await app.state.sessions.aclose()
+    await app.state.jobs.stop()
+    if app.state.pdf_pool is not None:
+        app.state.pdf_pool.shutdown(wait=False, cancel_futures=True)
+    await app.state.clients.aclose()
+
+
+app = FastAPI(lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -16,6 +86,10 @@ app.add_middleware(
 )
 
 app.include_router(pipeline_router)
+app.include_router(interview_router)
+app.include_router(runs_router)
+app.include_router(admin_router)
+app.include_router(stats_router)
 
 
 @app.get("/")
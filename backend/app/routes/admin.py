@@ -0,0 +1,40 @@
+import secrets
+from typing import List
+
+from app.dependencies import get_cache_warmer, get_parallel_service, get_run_records
+from app.services.parallel_service import ParallelService
+from app.services.runs import RunRecordStore
+from app.services.warmup import CacheWarmer, WarmupError
+from fastapi import APIRouter, Depends, Form, Header, HTTPException
+
+router = APIRouter()
+
+
+@router.post("/admin/warmup")
+async def warmup(
+    jobUrls: List[str] | None = Form(None),
+    top: int | None = Form(None),
+    admin_token: str | None = Header(None, alias="X-Admin-Token"),
+    parallel: ParallelService = Depends(get_parallel_service),
+    runs: RunRecordStore = Depends(get_run_records),
+    warmer: CacheWarmer = Depends(get_cache_warmer),
+):
+    """
+    Precompute job data, company name, references and company research for
+    the given job URLs, or the `top` most requested ones in the run history,
+    and report the coverage. Off unless WARMUP_TOKEN is set, since it spends
+    upstream calls on whatever URLs it is sent.
+    """
+    if warmer.token is None:
+        raise HTTPException(status_code=404, detail="Warm-up is off (no WARMUP_TOKEN)")
+    if not secrets.compare_digest(admin_token or "", warmer.token):
+        raise HTTPException(status_code=401, detail="Invalid X-Admin-Token")
+    job_urls = jobUrls or await warmer.top_urls(runs, top)
+    if not job_urls:
+        raise HTTPException(
+            status_code=422, detail="No job URLs given and none in the run history"
+        )
+    try:
+        return await warmer.warm(job_urls, parallel)
+    except WarmupError as e:
+        raise HTTPException(status_code=409, detail=str(e))
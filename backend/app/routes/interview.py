@@ -0,0 +1,121 @@
+from typing import List
+
+from app.dependencies import (
+    get_parallel_service,
+    get_run_records,
+    get_session_store,
+)
+from app.services.parallel_service import ParallelService
+from app.services.runs import RunRecordStore
+from app.services.sessions import InterviewSession, SessionStore, Turn
+from fastapi import APIRouter, Depends, Form, HTTPException
+
+router = APIRouter()
+
+
+def find_session(session_id: str, sessions: SessionStore) -> InterviewSession:
+    session = sessions.get(session_id)
+    if session is None:
+        raise HTTPException(
+            status_code=404, detail="Unknown or expired session; start a new one"
+        )
+    return session
+
+
+def session_state(session: InterviewSession, sessions: SessionStore) -> dict:
+    return {
+        "session_id": session.session_id,
+        "questions": session.questions,
+        "turns": session.turn_count,
+        "next_question": session.next_question(),
+        "summary": session.summary,
+        "expires_in": sessions.ttl,
+    }
+
+
+@router.post("/interview/session")
+async def start_interview_session(
+    run_id: str = Form(...),
+    questions: List[str] | None = Form(None),
+    parallel: ParallelService = Depends(get_parallel_service),
+    runs: RunRecordStore = Depends(get_run_records),
+    sessions: SessionStore = Depends(get_session_store),
+):
+    """
+    Start a multi-turn mock interview from a finished /pipeline run: its job
+    data, structured resume and practice questions are stored server-side
+    once, so turns only send the answer. `questions` replaces the run's list.
+    """
+    record = await runs.get(run_id)
+    if record is None:
+        raise HTTPException(
+            status_code=404, detail="Unknown or expired run_id; run /pipeline again"
+        )
+    outputs = record.outputs
+    if not questions:
+        questions = [
+            q["question"]
+            for q in (outputs.get("questions") or {}).get("questions", [])
+            if q.get("question")
+        ]
+    context = parallel.interview_session_context(
+        outputs.get("job_data"), outputs.get("user_data"), questions
+    )
+    return session_state(sessions.create(context, questions), sessions)
+
+
+@router.post("/interview/session/{session_id}/turn")
+async def interview_session_turn(
+    session_id: str,
+    answer: str = Form(...),
+    question: str | None = Form(None),
+    parallel: ParallelService = Depends(get_parallel_service),
+    sessions: SessionStore = Depends(get_session_store),
+):
+    """
+    Answer the session's next question (or `question`, if given) and get
+    feedback that takes the earlier turns into account.
+    """
+    session = find_session(session_id, sessions)
+    async with session.lock:
+        question = question or session.next_question()
+        if question is None:
+            raise HTTPException(
+                status_code=409,
+                detail="Every question has been answered; send `question`",
+            )
+        response = await parallel.interview_session_turn(session, question, answer)
+        feedback = response.choices[0].message.content or ""
+        sessions.record_turn(
+            session, Turn(question, answer, feedback), parallel.summarize_interview
+        )
+
+    usage = response.usage
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "response": feedback,
+        "question": question,
+        "turn": session.turn_count,
+        "next_question": session.next_question(),
+        "usage": {
+            "prompt_tokens": usage.prompt_tokens if usage else None,
+            "cached_tokens": getattr(details, "cached_tokens", None),
+            "completion_tokens": usage.completion_tokens if usage else None,
+        },
+    }
+
+
+@router.get("/interview/session/{session_id}")
+async def get_interview_session(
+    session_id: str, sessions: SessionStore = Depends(get_session_store)
+):
+    return session_state(find_session(session_id, sessions), sessions)
+
+
+@router.delete("/interview/session/{session_id}")
+async def end_interview_session(
+    session_id: str, sessions: SessionStore = Depends(get_session_store)
+):
+    if not sessions.delete(session_id):
+        raise HTTPException(status_code=404, detail="Unknown or expired session")
+    return {"session_id": session_id, "deleted": True}
@@ -1,102 +1,357 @@
-from concurrent.futures import ThreadPoolExecutor
+import json
+import time
+from typing import List
 
+from app.dependencies import (
+    get_batch_runner,
+    get_job_queue,
+    get_metrics,
+    get_parallel_service,
+    get_pdf_parser,
+    get_pipeline_limits,
+    get_resume_store,
+    get_run_records,
+)
+from app.services.batch import BatchRunner
+from app.services.jobs import JobQueue, QueueFull
+from app.services.metrics import Metrics, start_trace
 from app.services.parallel_service import ParallelService
-from app.services.parser import PDFParser
-from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from app.services.parser import PDFParser, PDFTooLarge
+from app.services.pipeline import (
+    RESULT_KEYS,
+    PipelineLimits,
+    PipelineRun,
+    build_pipeline,
+)
+from app.services.resumes import ResumeStore
+from app.services.runs import RunRecordStore
+from app.services.scheduler import StageError, StageTimeout
+from app.services.sentences import SentenceSegmenter
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Form,
+    Header,
+    HTTPException,
+    Query,
+    UploadFile,
+)
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
 router = APIRouter()
 
 
+async def read_resume(file: UploadFile, parser: PDFParser, resumes: ResumeStore) -> str:
+    try:
+        # spooled to disk, hashed, and only extracted if not already stored
+        return await resumes.ingest(file, parser)
+    except PDFTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to parse PDF: {e}")
+
+
+async def resolve_resume(
+    file: UploadFile | None,
+    resume_id: str | None,
+    parser: PDFParser,
+    resumes: ResumeStore,
+) -> str:
+    """The resume_id for a pipeline request, from an upload or a stored resume."""
+    if file is not None:
+        return await read_resume(file, parser, resumes)
+    if resume_id is None:
+        raise HTTPException(status_code=422, detail="Send a resume file or resume_id")
+    if await resumes.get(resume_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown resume {resume_id}")
+    return resume_id
+
+
+def stage_error_detail(e: StageError) -> str:
+    if e.stage == "user_data":
+        return f"Failed to structure resume: {e.error}"
+    return str(e)
+
+
+def stage_error_status(e: StageError) -> int:
+    # a required stage ran out of the request's time budget
+    return 504 if isinstance(e.error, StageTimeout) else 500
+
+
+def sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/resume")
+async def upload_resume(
+    file: UploadFile = File(...),
+    parser: PDFParser = Depends(get_pdf_parser),
+    resumes: ResumeStore = Depends(get_resume_store),
+):
+    """
+    Parse and structure a resume once; pass the returned resume_id to
+    /pipeline instead of re-uploading the file.
+    """
+    resume_id = await read_resume(file, parser, resumes)
+    try:
+        user_data = await resumes.structured(resume_id, parser)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to structure resume: {e}")
+    return {"resume_id": resume_id, "user_data": user_data}
+
+
 @router.post("/pipeline")
 async def create_pipeline(
     jobUrl: str = Form(...),
     linkedin: str = Form(...),
-    file: UploadFile = File(...),
+    file: UploadFile | None = File(None),
+    resume_id: str | None = Form(None),
+    previous_run_id: str | None = Form(None),
+    background: bool = Query(False),
+    include_timings: bool = Header(False, alias="X-Include-Timings"),
+    parallel: ParallelService = Depends(get_parallel_service),
+    parser: PDFParser = Depends(get_pdf_parser),
+    jobs: JobQueue = Depends(get_job_queue),
+    runs: RunRecordStore = Depends(get_run_records),
+    resumes: ResumeStore = Depends(get_resume_store),
+    metrics: Metrics = Depends(get_metrics),
+    limits: PipelineLimits = Depends(get_pipeline_limits),
 ):
+    # opt-in per-request breakdown of every upstream call
+    trace = start_trace() if include_timings else None
+    started = time.perf_counter()
+
     # ------- FIRST STEP: PARSE THE PDF RESUME -------
 
-    contents = await file.read()
-    parser = PDFParser()
-    try:
-        result = parser.parse_bytes(contents)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to parse PDF: {e}")
+    resume_id = await resolve_resume(file, resume_id, parser, resumes)
 
-    resume_text = " ".join(result)  # Combine all pages into single text
+    # resume structuring, job data, company name and interviewer profile all
+    # start at once - every later stage kicks off as soon as its inputs land
+    # stages whose inputs match `previous_run_id` are reused, not recomputed
+    run = PipelineRun(
+        build_pipeline(parallel, parser, resumes, limits),
+        {"job_url": jobUrl, "linkedin": linkedin, "resume_id": resume_id},
+        runs,
+        previous_run_id,
+        metrics,
+        limits.deadline,
+    )
+
+    if background:
+        try:
+            job = await jobs.submit(run)
+        except QueueFull as e:
+            raise HTTPException(status_code=429, detail=str(e))
+        return JSONResponse(
+            status_code=202, content={"job_id": job.id, "status": job.status}
+        )
 
     try:
-        structured_output = parser.structure_output(resume_text)  # type: ignore
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to structure resume: {e}")
-    userData = structured_output
+        returnOut = await run.run()
+    except StageError as e:
+        raise HTTPException(
+            status_code=stage_error_status(e), detail=stage_error_detail(e)
+        )
 
-    # we have structured output of their resume here - kick off next steps async
+    if trace is not None:
+        returnOut["timings"] = {
+            "total_ms": round((time.perf_counter() - started) * 1000),
+            "stages_ms": run.timings(),
+            "calls": trace,
+        }
+
+    return returnOut
 
-    parallel = ParallelService()
-    with ThreadPoolExecutor() as executor:
-        # get the company name and job data in parallel
-        # future_company_data = executor.submit(parallel.company_research, jobUrl)
-        future_company_name = executor.submit(parallel.extract_company_name, jobUrl)
-        future_job_data = executor.submit(parallel.search_job_description, jobUrl)
-        company_name = future_company_name.result()
-        job_data = future_job_data.result()
 
-        furture_interviewer_data = executor.submit(
-            parallel.scrape_linkedin_profile, linkedin
+@router.post("/pipeline/batch")
+async def batch_pipeline(
+    jobUrls: List[str] = Form(...),
+    linkedin: List[str] = Form(...),
+    file: UploadFile | None = File(None),
+    resume_id: str | None = Form(None),
+    parallel: ParallelService = Depends(get_parallel_service),
+    parser: PDFParser = Depends(get_pdf_parser),
+    runs: RunRecordStore = Depends(get_run_records),
+    resumes: ResumeStore = Depends(get_resume_store),
+    metrics: Metrics = Depends(get_metrics),
+    batch: BatchRunner = Depends(get_batch_runner),
+    limits: PipelineLimits = Depends(get_pipeline_limits),
+):
+    """
+    Evaluate one resume against many postings.
+
+    `jobUrls` and `linkedin` are repeated form fields; a single `linkedin` is
+    used for every posting, otherwise they are paired by position. Returns
+    every posting's pipeline output ranked by overall_fit_score.
+    """
+    if len(linkedin) not in (1, len(jobUrls)):
+        raise HTTPException(
+            status_code=422,
+            detail="Send one linkedin URL, or one per job URL",
+        )
+    if len(linkedin) == 1:
+        linkedin = linkedin * len(jobUrls)
+    # identical postings are only run once
+    postings = list(dict.fromkeys(zip(jobUrls, linkedin)))
+    if len(postings) > batch.max_jobs:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {batch.max_jobs} job URLs per batch",
         )
-        future_fit_score = executor.submit(
-            parallel.generate_fit_score,
-            job_data,
-            userData,  # type: ignore
-        )  # type: ignore
-        references = executor.submit(parallel.find_references, company_name)
-        questions = executor.submit(
-            parallel.create_interview_questions,
-            job_data,
-            userData,  # type: ignore
-        )  # type: ignore
-        # company_data = future_company_data.result()
-        # future_leetcode_problems = executor.submit(
-        #     parallel.get_leetcode,
-        #     company_data,  # type: ignore
-        #     company_name,
-        # )
-        # leetcode_problems = future_leetcode_problems.result()
-
-        interviewer_data = furture_interviewer_data.result()
-        fit_score = future_fit_score.result()
-        references = references.result()
-        questions = questions.result()
-
-    temp_data = {
-        "company_name": company_name,
-        "job_data": job_data,
-        "profile_data": interviewer_data,
-        "fit_score": fit_score,
-        "references": references,
-        "questions": questions,
-        # "leetcode_problems": leetcode_problems,
-    }
-    cheat_sheet = parallel.cheat_sheet(temp_data)
-    returnOut = {
-        "company_name": company_name,
-        # "company_data": company_data,
-        "job_data": job_data,
-        "profile_data": interviewer_data,
-        "fit_score": fit_score,
-        "references": references,
-        "questions": questions,
-        "cheat_sheet": cheat_sheet,
-        # "leetcode_problems": leetcode_problems,
-    }
 
-    return returnOut
+    resume_id = await resolve_resume(file, resume_id, parser, resumes)
+    return await batch.run(
+        postings, resume_id, parallel, parser, resumes, runs, metrics, limits
+    )
+
+
+@router.get("/pipeline/{job_id}")
+async def get_pipeline_job(job_id: str, jobs: JobQueue = Depends(get_job_queue)):
+    job = await jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown pipeline job {job_id}")
+    return job.to_dict()
+
+
+@router.post("/pipeline/stream")
+async def stream_pipeline(
+    jobUrl: str = Form(...),
+    linkedin: str = Form(...),
+    file: UploadFile | None = File(None),
+    resume_id: str | None = Form(None),
+    previous_run_id: str | None = Form(None),
+    include_timings: bool = Header(False, alias="X-Include-Timings"),
+    parallel: ParallelService = Depends(get_parallel_service),
+    parser: PDFParser = Depends(get_pdf_parser),
+    runs: RunRecordStore = Depends(get_run_records),
+    resumes: ResumeStore = Depends(get_resume_store),
+    metrics: Metrics = Depends(get_metrics),
+    limits: PipelineLimits = Depends(get_pipeline_limits),
+):
+    """
+    Same pipeline as /pipeline, streamed as Server-Sent Events.
+
+    One event per result key (company_name, job_data, profile_data, fit_score,
+    references, company_data, questions, cheat_sheet) is sent the moment that
+    stage finishes, followed by a `summary` event with per-stage timings, or an
+    `error` event.
+    An optional stage that failed or timed out is sent with `data: null` and
+    its `error`.
+    """
+    trace = start_trace() if include_timings else None
+    # parse before the response starts so a bad PDF is still a plain error
+    resume_id = await resolve_resume(file, resume_id, parser, resumes)
+    run = PipelineRun(
+        build_pipeline(parallel, parser, resumes, limits),
+        {"job_url": jobUrl, "linkedin": linkedin, "resume_id": resume_id},
+        runs,
+        previous_run_id,
+        metrics,
+        limits.deadline,
+    )
+
+    async def events():
+        results = {}
+        try:
+            async for finished in run.stream():
+                results[finished.name] = finished.result
+                if finished.name not in RESULT_KEYS:
+                    continue
+                yield sse_event(
+                    finished.name,
+                    {
+                        "data": finished.result,
+                        "duration_ms": round(finished.duration * 1000),
+                        "elapsed_ms": round(finished.elapsed * 1000),
+                        "reused": finished.reused,
+                        "error": finished.error,
+                    },
+                )
+        except StageError as e:
+            yield sse_event(
+                "error", {"stage": e.stage, "detail": stage_error_detail(e)}
+            )
+            return
+
+        output = await run.finish(results)
+        summary = {
+            "stages": list(RESULT_KEYS),
+            "run_id": output["run_id"],
+            "reused_stages": output["reused_stages"],
+            "errors": output["errors"],
+            "timings_ms": run.timings(),
+        }
+        if trace is not None:
+            summary["calls"] = trace
+        yield sse_event("summary", summary)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/interview")
-async def interview_dialogue(question: str = Form(...), answer: str = Form(...)):
-    parallel = ParallelService()
-    response = parallel.interview_dialogue(question, answer)
+async def interview_dialogue(
+    question: str = Form(...),
+    answer: str = Form(...),
+    parallel: ParallelService = Depends(get_parallel_service),
+):
+    response = await parallel.interview_dialogue(question, answer)
 
     return {"response": response}
+
+
+@router.post("/interview/stream")
+async def stream_interview_dialogue(
+    question: str = Form(...),
+    answer: str = Form(...),
+    parallel: ParallelService = Depends(get_parallel_service),
+):
+    """
+    Same feedback as /interview, streamed as Server-Sent Events while it is
+    generated: a `token` event per text delta, a `sentence` event as soon as
+    each sentence is complete (so text-to-speech can start on the first one),
+    then `done` with the whole response, or an `error` event.
+    """
+
+    async def events():
+        segmenter = SentenceSegmenter()
+        parts = []
+        sentences = 0
+        started = time.perf_counter()
+        first_token_ms = None
+        try:
+            async for delta in parallel.interview_dialogue_stream(question, answer):
+                if first_token_ms is None:
+                    first_token_ms = round((time.perf_counter() - started) * 1000)
+                parts.append(delta)
+                yield sse_event("token", {"text": delta})
+                for sentence in segmenter.feed(delta):
+                    yield sse_event("sentence", {"index": sentences, "text": sentence})
+                    sentences += 1
+        except Exception as e:
+            # the response has already started, so report instead of a 5xx
+            yield sse_event("error", {"detail": str(e) or type(e).__name__})
+            return
+
+        rest = segmenter.flush()
+        if rest is not None:
+            yield sse_event("sentence", {"index": sentences, "text": rest})
+        yield sse_event(
+            "done",
+            {
+                "response": "".join(parts),
+                "first_token_ms": first_token_ms,
+                "duration_ms": round((time.perf_counter() - started) * 1000),
+            },
+        )
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
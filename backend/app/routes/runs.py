@@ -0,0 +1,34 @@
+from app.dependencies import get_run_records
+from app.services.runs import RunRecordStore
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+router = APIRouter()
+
+
+@router.get("/runs")
+async def list_runs(
+    company: str | None = None,
+    job_url: str | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    runs: RunRecordStore = Depends(get_run_records),
+):
+    """
+    Recorded pipeline runs, newest first, without their stage outputs.
+    Filter by `company` (any casing) or exact `job_url`; pass `next_cursor`
+    back as `cursor` for the next page.
+    """
+    try:
+        summaries, next_cursor = await runs.list(company, job_url, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"runs": summaries, "next_cursor": next_cursor}
+
+
+@router.get("/runs/{run_id}")
+async def get_run(run_id: str, runs: RunRecordStore = Depends(get_run_records)):
+    """One recorded run with its inputs, stage outputs and timings."""
+    record = await runs.lookup(run_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Unknown run {run_id}")
+    return record.to_dict()
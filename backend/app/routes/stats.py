@@ -0,0 +1,76 @@
+from app.dependencies import (
+    get_batch_runner,
+    get_cache,
+    get_cache_warmer,
+    get_clients,
+    get_company_index,
+    get_compactor,
+    get_fit_scorer,
+    get_flight,
+    get_job_queue,
+    get_metrics,
+    get_resume_extractor,
+    get_resume_store,
+    get_run_records,
+    get_session_store,
+)
+from app.services.batch import BatchRunner
+from app.services.cache import StageCache
+from app.services.clients import ClientRegistry
+from app.services.company_index import CompanyIndex
+from app.services.compaction import Compactor
+from app.services.fit_scoring import FitScorer
+from app.services.jobs import JobQueue
+from app.services.metrics import Metrics
+from app.services.resume_extractor import ResumeExtractor
+from app.services.resumes import ResumeStore
+from app.services.runs import RunRecordStore
+from app.services.sessions import SessionStore
+from app.services.singleflight import SingleFlight
+from app.services.warmup import CacheWarmer
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def get_stats(
+    clients: ClientRegistry = Depends(get_clients),
+    cache: StageCache | None = Depends(get_cache),
+    flight: SingleFlight = Depends(get_flight),
+    jobs: JobQueue = Depends(get_job_queue),
+    compactor: Compactor = Depends(get_compactor),
+    fit_scorer: FitScorer = Depends(get_fit_scorer),
+    extractor: ResumeExtractor = Depends(get_resume_extractor),
+    resumes: ResumeStore = Depends(get_resume_store),
+    batch: BatchRunner = Depends(get_batch_runner),
+    sessions: SessionStore = Depends(get_session_store),
+    companies: CompanyIndex = Depends(get_company_index),
+    runs: RunRecordStore = Depends(get_run_records),
+    warmer: CacheWarmer = Depends(get_cache_warmer),
+):
+    return {
+        "clients": clients.stats(),
+        "rate_limits": clients.governor.stats(),
+        "cache": cache.stats() if cache else None,
+        "singleflight": flight.stats(),
+        "jobs": jobs.stats(),
+        "compaction": compactor.stats(),
+        "fit_scoring": fit_scorer.stats(),
+        "resume_structuring": extractor.stats(),
+        "resumes": resumes.stats(),
+        "batch": batch.stats(),
+        "interview_sessions": sessions.stats(),
+        "company_index": companies.stats(),
+        "runs": await runs.stats(),
+        "warmup": warmer.stats(),
+    }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics_text(metrics: Metrics = Depends(get_metrics)):
+    """Prometheus text exposition of upstream, stage and cache metrics."""
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4"
+    )
@@ -0,0 +1,160 @@
+import asyncio
+import os
+from typing import List, Tuple
+
+from app.services.metrics import Metrics
+from app.services.parallel_service import ParallelService
+from app.services.parser import PDFParser
+from app.services.pipeline import PipelineLimits, PipelineRun, build_pipeline
+from app.services.resumes import ResumeStore
+from app.services.runs import RunRecordStore
+from app.services.singleflight import BatchFlight
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def fit_score_of(output: dict) -> float | None:
+    """overall_fit_score of a pipeline output as a number, if it has one."""
+    try:
+        return float((output.get("fit_score") or {}).get("overall_fit_score"))
+    except (TypeError, ValueError):
+        return None
+
+
+class BatchRunner:
+    """
+    Runs one resume against many postings.
+
+    The resume is parsed and structured once (via the resume store), every
+    posting's pipeline shares a BatchFlight so company-level stages run once
+    per company, and at most `concurrency` pipelines run at a time across
+    all batch requests.
+    """
+
+    def __init__(self, concurrency: int = 8, max_jobs: int = 50):
+        self.concurrency = concurrency
+        self.max_jobs = max_jobs
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.active = 0
+        self.batches = 0
+        self.shared_calls = 0
+
+    @classmethod
+    def from_env(cls) -> "BatchRunner":
+        return cls(
+            concurrency=int(os.getenv("BATCH_CONCURRENCY", "8")),
+            max_jobs=int(os.getenv("BATCH_MAX_JOBS", "50")),
+        )
+
+    async def run(
+        self,
+        postings: List[Tuple[str, str]],
+        resume_id: str,
+        parallel: ParallelService,
+        parser: PDFParser,
+        resumes: ResumeStore,
+        runs: RunRecordStore,
+        metrics: Metrics | None = None,
+        limits: PipelineLimits | None = None,
+    ) -> dict:
+        """
+        Run the pipeline for every (job_url, linkedin) posting.
+
+        Args:
+            postings (list): (job_url, linkedin) pairs, already deduplicated.
+            resume_id (str): Stored resume to evaluate.
+            parallel (ParallelService): Request-scoped service to share from.
+            parser (PDFParser): Parser used to structure the resume.
+            resumes (ResumeStore): Store holding `resume_id`.
+            runs (RunRecordStore): Where each posting's run is recorded.
+            metrics (Metrics): Stage timing metrics, optional.
+            limits (PipelineLimits): Deadline and stage timeouts of each
+                posting's pipeline, optional.
+
+        Returns:
+            dict: `results` ranked by overall_fit_score (best first), `failed`
+            postings with their error, and `shared_stage_calls`.
+        """
+        flight = BatchFlight(parallel.flight)
+        shared = ParallelService(
+            parallel.clients,
+            parallel.cache,
+            flight,
+            parallel.compactor,
+            parallel.fit_scorer,
+            parallel.companies,
+        )
+        graph = build_pipeline(shared, parser, resumes, limits)
+        deadline = limits.deadline if limits is not None else None
+        self.batches += 1
+
+        async def one(job_url: str, linkedin: str) -> dict:
+            async with self._semaphore:
+                self.active += 1
+                try:
+                    run = PipelineRun(
+                        graph,
+                        {
+                            "job_url": job_url,
+                            "linkedin": linkedin,
+                            "resume_id": resume_id,
+                        },
+                        runs,
+                        metrics=metrics,
+                        deadline=deadline,
+                    )
+                    output = await run.run()
+                finally:
+                    self.active -= 1
+            return {
+                "job_url": job_url,
+                "linkedin": linkedin,
+                "overall_fit_score": fit_score_of(output),
+                **output,
+            }
+
+        outcomes = await asyncio.gather(
+            *(one(job_url, linkedin) for job_url, linkedin in postings),
+            return_exceptions=True,
+        )
+
+        results, failed = [], []
+        for (job_url, linkedin), outcome in zip(postings, outcomes):
+            if isinstance(outcome, BaseException):
+                failed.append(
+                    {
+                        "job_url": job_url,
+                        "linkedin": linkedin,
+                        "stage": getattr(outcome, "stage", None),
+                        "error": str(outcome),
+                    }
+                )
+            else:
+                results.append(outcome)
+        # best fit first, postings without a score last
+        results.sort(
+            key=lambda r: (
+                r["overall_fit_score"] is None,
+                -(r["overall_fit_score"] or 0),
+            )
+        )
+        for rank, result in enumerate(results, start=1):
+            result["rank"] = rank
+
+        self.shared_calls += flight.shared
+        return {
+            "resume_id": resume_id,
+            "results": results,
+            "failed": failed,
+            "shared_stage_calls": flight.shared,
+        }
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "max_jobs": self.max_jobs,
+            "active": self.active,
+            "batches": self.batches,
+            "shared_stage_calls": self.shared_calls,
+        }
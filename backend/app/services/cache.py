@@ -0,0 +1,296 @@
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlsplit, urlunsplit
+
+from app.services.metrics import Metrics, trace_event
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DAY = 24 * 60 * 60
+
+# Seconds a cached stage result stays valid. Override with CACHE_TTL_<STAGE>.
+DEFAULT_TTLS = {
+    "search_job_description": 1 * DAY,
+    "extract_company_name": 30 * DAY,
+    "scrape_linkedin_profile": 7 * DAY,
+    "find_references": 1 * DAY,
+    "company_research": 7 * DAY,
+}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so trivially different spellings share a cache entry:
+    lowercase scheme/host, drop the fragment and any trailing slash.
+    """
+    parts = urlsplit(url.strip())
+    path = parts.path.rstrip("/")
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), path, parts.query, "")
+    )
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+def cache_key(stage: str, inputs: Any, prompt_version: str, model: str) -> str:
+    payload = json.dumps(
+        [stage, inputs, prompt_version, model], sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class MemoryBackend:
+    """In-process LRU store of (expires_at, json) entries."""
+
+    blocking = False
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str, ttl: float):
+        self._entries[key] = (time.time() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """On-disk LRU store, so cached results survive restarts and are shared by workers."""
+
+    blocking = True
+
+    def __init__(self, path: str = "cache.sqlite3", max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            return row[0]
+
+    def set(self, key: str, value: str, ttl: float):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now),
+            )
+            # evict least recently used rows beyond the size bound
+            self._conn.execute(
+                """DELETE FROM cache WHERE key IN (
+                    SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+class StageCache:
+    """
+    Content-addressed cache for pipeline stage results.
+
+    Entries are keyed by a hash of (stage, normalized inputs, prompt version,
+    model), so changing a prompt or model naturally misses old entries.
+    """
+
+    def __init__(
+        self, backend, ttls: dict | None = None, metrics: Metrics | None = None
+    ):
+        self.backend = backend
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.metrics = metrics
+        self.hits: dict[str, int] = defaultdict(int)
+        self.misses: dict[str, int] = defaultdict(int)
+
+    @classmethod
+    def from_env(cls, metrics: Metrics | None = None) -> "StageCache | None":
+        """
+        Build the cache from CACHE_BACKEND (memory, sqlite or off),
+        CACHE_PATH, CACHE_MAX_ENTRIES and CACHE_TTL_<STAGE> variables.
+        """
+        kind = os.getenv("CACHE_BACKEND", "memory")
+        if kind == "off":
+            return None
+        max_entries = int(os.getenv("CACHE_MAX_ENTRIES", "1000"))
+        if kind == "sqlite":
+            backend = SQLiteBackend(
+                os.getenv("CACHE_PATH", "cache.sqlite3"), max_entries
+            )
+        elif kind == "memory":
+            backend = MemoryBackend(max_entries)
+        else:
+            raise ValueError(f"Unknown CACHE_BACKEND '{kind}'")
+
+        ttls = {
+            stage: float(os.environ[f"CACHE_TTL_{stage.upper()}"])
+            for stage in DEFAULT_TTLS
+            if f"CACHE_TTL_{stage.upper()}" in os.environ
+        }
+        return cls(backend, ttls, metrics)
+
+    async def _call(self, method, *args):
+        if self.backend.blocking:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def get(self, key: str) -> Any | None:
+        raw = await self._call(self.backend.get, key)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, stage: str, key: str, value: Any):
+        ttl = self.ttls.get(stage, DAY)
+        await self._call(self.backend.set, key, json.dumps(value), ttl)
+
+    async def get_or_compute(
+        self, stage: str, key: str, compute: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        cached = await self.get(key)
+        self._record(stage, "hit" if cached is not None else "miss")
+        if cached is not None:
+            self.hits[stage] += 1
+            return cached
+
+        self.misses[stage] += 1
+        value = await compute()
+        # None means the stage failed to produce output; don't pin that
+        if value is not None:
+            await self.set(stage, key, value)
+        return value
+
+    def _record(self, stage: str, result: str):
+        trace_event(stage=stage, cache=result)
+        if self.metrics is not None:
+            self.metrics.inc(
+                "hireme_cache_requests_total",
+                help="Stage cache lookups by result",
+                stage=stage,
+                result=result,
+            )
+
+    def stats(self) -> dict:
+        stages = sorted(set(self.hits) | set(self.misses))
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "stages": {
+                stage: {
+                    "hits": self.hits[stage],
+                    "misses": self.misses[stage],
+                    "hit_rate": self.hits[stage]
+                    / max(self.hits[stage] + self.misses[stage], 1),
+                }
+                for stage in stages
+            },
+        }
+
+
+def cached_stage(
+    stage: str,
+    *,
+    prompt_version: str,
+    model: str,
+    key: Callable[..., Any] | None = None,
+):
+    """
+    Decorate an async ParallelService method so its result is served from
+    `self.cache` when available, and concurrent identical calls are coalesced
+    through `self.flight` into a single upstream request.
+
+    Args:
+        stage (str): Stage name, used for the TTL and hit/miss counters.
+        prompt_version (str): Bump whenever the stage's prompt changes.
+        model (str): The model producing the result.
+        key (Callable): Maps the method's arguments to normalized cache inputs.
+    """
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(self, *args):
+            inputs = key(*args) if key else list(args)
+            digest = cache_key(stage, inputs, prompt_version, model)
+
+            async def compute():
+                if self.cache is None:
+                    return await fn(self, *args)
+                return await self.cache.get_or_compute(
+                    stage, digest, lambda: fn(self, *args)
+                )
+
+            if self.flight is None:
+                return await compute()
+            return await self.flight.do(digest, compute)
+
+        # lets callers (e.g. the cache warmer) look an entry up without
+        # computing it
+        wrapper.cache_key = lambda *args: cache_key(
+            stage, key(*args) if key else list(args), prompt_version, model
+        )
+        wrapper.stage = stage
+        return wrapper
+
+    return decorator
@@ -0,0 +1,325 @@
+import asyncio
+import importlib.util
+import os
+import time
+import weakref
+from dataclasses import dataclass
+from typing import AsyncIterator, Type
+
+import httpx
+from app.services.metrics import PARALLEL_PRICES, Metrics, trace_event
+from app.services.ratelimit import Governor, is_rate_limited, is_retryable
+from app.services.structured import (
+    ParseRetryPolicy,
+    StructuredOutputError,
+    parse_reply,
+    response_format,
+    supports_structured_outputs,
+)
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from parallel import AsyncParallel
+from parallel import DefaultAsyncHttpxClient as ParallelHttpxClient
+from pydantic import BaseModel
+
+load_dotenv()
+
+
+@dataclass
+class PoolSettings:
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        return cls(
+            max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", cls.max_connections)),
+            max_keepalive_connections=int(
+                os.getenv("HTTP_MAX_KEEPALIVE", cls.max_keepalive_connections)
+            ),
+            keepalive_expiry=float(
+                os.getenv("HTTP_KEEPALIVE_EXPIRY", cls.keepalive_expiry)
+            ),
+            http2=os.getenv("HTTP2", "1") == "1",
+        )
+
+
+class CountingTransport(httpx.AsyncHTTPTransport):
+    """
+    AsyncHTTPTransport that counts requests and newly opened connections, so
+    the registry can report how often keep-alive connections are reused.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.requests = 0
+        self._seen = weakref.WeakSet()
+        self.connections_opened = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await super().handle_async_request(request)
+        self.requests += 1
+        for connection in self._pool.connections:
+            if connection not in self._seen:
+                self._seen.add(connection)
+                self.connections_opened += 1
+        return response
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "connections_reused": max(self.requests - self.connections_opened, 0),
+            "open_connections": len(self._pool.connections),
+        }
+
+
+class ClientRegistry:
+    """
+    Process-wide OpenAI and Parallel clients sharing pooled keep-alive HTTP
+    connections. Created once in the FastAPI lifespan and closed on shutdown.
+
+    Services should call upstreams through `chat`, `chat_json`, `search` and
+    `extract` so every call is timed, metered and goes through the rate-limit
+    governor. The governor owns retries, so the SDKs' own retries are off.
+    """
+
+    def __init__(
+        self,
+        settings: PoolSettings | None = None,
+        metrics: Metrics | None = None,
+        parse_policy: ParseRetryPolicy | None = None,
+        governor: Governor | None = None,
+    ):
+        self.settings = settings or PoolSettings.from_env()
+        self.metrics = metrics or Metrics()
+        self.parse_policy = parse_policy or ParseRetryPolicy.from_env()
+        self.governor = governor or Governor.from_env()
+        # HTTP/2 needs the optional `h2` package; fall back to HTTP/1.1 keep-alive
+        self.http2 = self.settings.http2 and importlib.util.find_spec("h2") is not None
+        self.transports = {
+            "openai": self._transport(),
+            "parallel": self._transport(),
+        }
+        self.openai = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=DefaultAsyncHttpxClient(transport=self.transports["openai"]),
+            max_retries=0,
+        )
+        self.parallel = AsyncParallel(
+            api_key=os.getenv("PARALLEL_API_KEY"),
+            http_client=ParallelHttpxClient(transport=self.transports["parallel"]),
+            max_retries=0,
+        )
+
+    @classmethod
+    def from_env(cls, metrics: Metrics | None = None) -> "ClientRegistry":
+        return cls(
+            PoolSettings.from_env(),
+            metrics,
+            ParseRetryPolicy.from_env(),
+            Governor.from_env(),
+        )
+
+    async def _governed(self, span, upstream: str, name: str, call):
+        """
+        Run `call` (an SDK `with_raw_response` request) under the governor's
+        limiter for `upstream` / `name`, retrying rate limits and transient
+        errors with jittered backoff outside the concurrency slot.
+        """
+        for attempt in range(self.governor.retries + 1):
+            async with self.governor.slot(upstream, name) as (limiter, started):
+                try:
+                    raw = await call()
+                except Exception as e:
+                    if not is_retryable(e) or attempt == self.governor.retries:
+                        raise
+                    response = getattr(e, "response", None)
+                    headers = response.headers if response is not None else {}
+                    if is_rate_limited(e):
+                        limiter.on_rate_limited(started, headers)
+                        self.metrics.inc(
+                            "hireme_upstream_rate_limited_total",
+                            help="429 responses from OpenAI / Parallel",
+                            limiter=limiter.name,
+                        )
+                    delay = self.governor.backoff(attempt, limiter.paused_for())
+                else:
+                    limiter.on_success(raw.headers)
+                    return raw
+            span.retries += 1
+            self.governor.retried += 1
+            await asyncio.sleep(delay)
+
+    async def chat(self, stage: str, **kwargs):
+        """
+        Traced `chat.completions.create`.
+
+        Args:
+            stage (str): Stage label for metrics, e.g. "generate_fit_score".
+            **kwargs: Passed through to the OpenAI SDK.
+
+        Returns:
+            ChatCompletion: The parsed completion.
+        """
+        async with self.metrics.span("openai", stage, kwargs["model"]) as span:
+            raw = await self._governed(
+                span,
+                "openai",
+                kwargs["model"],
+                lambda: self.openai.chat.completions.with_raw_response.create(**kwargs),
+            )
+            response = raw.parse()
+            span.record_usage(response.usage)
+        return response
+
+    async def chat_stream(self, stage: str, **kwargs) -> AsyncIterator[str]:
+        """
+        Traced streaming `chat.completions.create`. The governor admits the
+        request as usual (retries happen before the first token); the reply
+        then streams outside the limiter slot.
+
+        Args:
+            stage (str): Stage label for metrics, e.g. "interview_dialogue".
+            **kwargs: Passed through to the OpenAI SDK.
+
+        Yields:
+            str: The reply's text deltas as they arrive.
+        """
+        model = kwargs["model"]
+        async with self.metrics.span("openai", stage, model) as span:
+            start = time.perf_counter()
+            raw = await self._governed(
+                span,
+                "openai",
+                model,
+                lambda: self.openai.chat.completions.with_raw_response.create(
+                    stream=True, stream_options={"include_usage": True}, **kwargs
+                ),
+            )
+            first_token = None
+            async with raw.parse() as stream:
+                async for chunk in stream:
+                    if chunk.usage is not None:
+                        span.record_usage(chunk.usage)
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if not delta:
+                        continue
+                    if first_token is None:
+                        first_token = time.perf_counter() - start
+                        self.metrics.observe(
+                            "hireme_llm_time_to_first_token_seconds",
+                            first_token,
+                            "Time from a streaming request to its first token",
+                            stage=stage,
+                            model=model,
+                        )
+                        trace_event(
+                            stage=stage, first_token_ms=round(first_token * 1000)
+                        )
+                    yield delta
+
+    async def chat_json(self, stage: str, schema: Type[BaseModel], **kwargs) -> dict:
+        """
+        `chat` for stages that return JSON. Models that support structured
+        outputs are constrained to `schema`'s JSON schema; others (gpt-4) get
+        their reply repaired locally. Either way the reply is validated
+        against `schema`, and a reply that fails is retried up to the stage's
+        `parse_policy` budget.
+
+        Args:
+            stage (str): Stage label for metrics and the retry policy.
+            schema (Type[BaseModel]): Response model of the stage.
+            **kwargs: Passed through to the OpenAI SDK.
+
+        Returns:
+            dict: The validated reply, dumped back to plain JSON types.
+
+        Raises:
+            StructuredOutputError: If every attempt failed to parse.
+        """
+        model = kwargs["model"]
+        mode = "json_schema" if supports_structured_outputs(model) else "repair"
+        if mode == "json_schema":
+            kwargs["response_format"] = response_format(schema)
+        attempts = self.parse_policy.retries(stage) + 1
+        labels = {"stage": stage, "model": model, "mode": mode}
+
+        for attempt in range(1, attempts + 1):
+            start = time.perf_counter()
+            response = await self.chat(stage, **kwargs)
+            choice = response.choices[0]
+            try:
+                if choice.finish_reason == "length":
+                    raise ValueError("reply truncated at max_tokens")
+                if getattr(choice.message, "refusal", None):
+                    raise ValueError(f"refused: {choice.message.refusal}")
+                return parse_reply(choice.message.content, schema).model_dump()
+            except ValueError as exc:
+                reason = type(exc).__name__
+                self.metrics.inc(
+                    "hireme_llm_parse_failures_total",
+                    help="LLM replies that did not parse or validate",
+                    reason=reason,
+                    **labels,
+                )
+                self.metrics.inc(
+                    "hireme_llm_parse_wasted_seconds_total",
+                    time.perf_counter() - start,
+                    "Time spent on LLM replies that had to be discarded",
+                    **labels,
+                )
+                trace_event(stage=stage, parse_failure=reason, attempt=attempt)
+                if attempt < attempts:
+                    self.metrics.inc(
+                        "hireme_llm_parse_retries_total",
+                        help="LLM calls repeated because the reply did not parse",
+                        **labels,
+                    )
+        raise StructuredOutputError(stage, reason, attempts)
+
+    async def search(self, stage: str, **kwargs):
+        """Traced Parallel `beta.search`."""
+        async with self.metrics.span("parallel", stage, "search") as span:
+            raw = await self._governed(
+                span,
+                "parallel",
+                "search",
+                lambda: self.parallel.beta.with_raw_response.search(**kwargs),
+            )
+            span.cost = PARALLEL_PRICES["search"]
+            return await raw.parse()
+
+    async def extract(self, stage: str, **kwargs):
+        """Traced Parallel `beta.extract`."""
+        async with self.metrics.span("parallel", stage, "extract") as span:
+            raw = await self._governed(
+                span,
+                "parallel",
+                "extract",
+                lambda: self.parallel.beta.with_raw_response.extract(**kwargs),
+            )
+            span.cost = PARALLEL_PRICES["extract"] * len(kwargs.get("urls", []))
+            return await raw.parse()
+
+    def _transport(self) -> CountingTransport:
+        return CountingTransport(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.settings.max_connections,
+                max_keepalive_connections=self.settings.max_keepalive_connections,
+                keepalive_expiry=self.settings.keepalive_expiry,
+            ),
+        )
+
+    def stats(self) -> dict:
+        return {
+            "http2": self.http2,
+            **{name: t.stats() for name, t in self.transports.items()},
+        }
+
+    async def aclose(self):
+        await self.openai.close()
+        await self.parallel.close()
@@ -0,0 +1,252 @@
+import json
+import os
+from collections import defaultdict
+from typing import Any, Dict, Tuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Deliberately not a dependency: tiktoken downloads its encodings on first use,
+# and budgets only need to be roughly right. Without it, tokens are estimated
+# at ~4 chars each.
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# Max prompt tokens spent on interpolated data per stage.
+# Override with PROMPT_BUDGET_<STAGE>.
+DEFAULT_BUDGETS = {
+    "cheat_sheet": 6000,
+    "generate_fit_score": 4000,
+    "create_interview_questions": 3000,
+    "interview_session": 3000,
+}
+
+# Long strings seen more than once are only kept the first time
+DEDUPE_MIN_CHARS = 40
+
+
+def count_tokens(text: str, model: str = "gpt-4.1-nano") -> int:
+    if tiktoken is None:
+        return (len(text) + 3) // 4
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        encoding = tiktoken.get_encoding("o200k_base")
+    return len(encoding.encode(text))
+
+
+def minify(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def prune(value: Any, seen: set | None = None) -> Any:
+    """
+    Drop empty values and the `""` placeholder lists the structuring prompts
+    leave behind, trim whitespace, and drop repeated list items and long
+    strings already seen elsewhere in the payload.
+
+    Returns:
+        The pruned value, or None if nothing meaningful is left.
+    """
+    seen = set() if seen is None else seen
+    if isinstance(value, str):
+        text = " ".join(value.split())
+        if not text:
+            return None
+        if len(text) >= DEDUPE_MIN_CHARS:
+            if text in seen:
+                return None
+            seen.add(text)
+        return text
+    if isinstance(value, dict):
+        out = {}
+        for key, item in value.items():
+            item = prune(item, seen)
+            if item is not None:
+                out[key] = item
+        return out or None
+    if isinstance(value, (list, tuple)):
+        out, items = [], set()
+        for item in value:
+            item = prune(item, seen)
+            marker = minify(item)
+            if item is not None and marker not in items:
+                items.add(marker)
+                out.append(item)
+        return out or None
+    return value
+
+
+class _Sizes:
+    """
+    Minified length of values while a payload is trimmed, remembered by
+    identity: a shrink step only rebuilds the containers on the path to the
+    piece it removed, so everything else is serialized once.
+    """
+
+    def __init__(self):
+        self._sizes: Dict[int, Tuple[Any, int]] = {}
+
+    def of(self, value: Any) -> int:
+        entry = self._sizes.get(id(value))
+        if entry is None or entry[0] is not value:
+            entry = (value, len(minify(value)))
+            self._sizes[id(value)] = entry
+        return entry[1]
+
+    def set(self, value: Any, size: int):
+        self._sizes[id(value)] = (value, size)
+
+
+def _shrink(value: Any, sizes: _Sizes) -> Tuple[Any, int]:
+    """
+    Remove roughly the largest piece of `value`.
+
+    Returns:
+        tuple: What is left (None once nothing is) and how many characters
+        of minified JSON that removed.
+    """
+    size = sizes.of(value)
+    if isinstance(value, str):
+        if len(value) <= 16:
+            return None, size
+        out = value[: len(value) // 2].rstrip() + "…"
+        return out, size - sizes.of(out)
+    if isinstance(value, dict):
+        if not value:
+            return None, size
+        key = max(value, key=lambda k: sizes.of(value[k]))
+        smaller, removed = _shrink(value[key], sizes)
+        out = dict(value)
+        if smaller is None:
+            del out[key]
+            if not out:
+                return None, size
+            # the whole `"key":value,` entry goes
+            removed = len(minify(key)) + 1 + sizes.of(value[key]) + 1
+        else:
+            out[key] = smaller
+    elif isinstance(value, list):
+        if len(value) > 1:
+            out, removed = value[:-1], sizes.of(value[-1]) + 1
+        elif not value:
+            return None, size
+        else:
+            smaller, removed = _shrink(value[0], sizes)
+            if smaller is None:
+                return None, size
+            out = [smaller]
+    else:
+        return None, size
+    sizes.set(out, size - removed)
+    return out, removed
+
+
+class Compactor:
+    """
+    Compact structured data before it is interpolated into a prompt: prune,
+    serialize as minified JSON, and enforce a per-stage token budget by
+    shrinking the lowest-priority fields first.
+
+    Token counts before (the old Python-repr interpolation) and after
+    compaction are tracked per stage.
+    """
+
+    def __init__(self, budgets: Dict[str, int] | None = None):
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.tokens_before: Dict[str, int] = defaultdict(int)
+        self.tokens_after: Dict[str, int] = defaultdict(int)
+
+    @classmethod
+    def from_env(cls) -> "Compactor":
+        return cls(
+            {
+                stage: int(os.environ[f"PROMPT_BUDGET_{stage.upper()}"])
+                for stage in DEFAULT_BUDGETS
+                if f"PROMPT_BUDGET_{stage.upper()}" in os.environ
+            }
+        )
+
+    def compact(
+        self,
+        stage: str,
+        fields: Dict[str, Any],
+        priorities: Dict[str, int] | None = None,
+        model: str = "gpt-4.1-nano",
+    ) -> Dict[str, str]:
+        """
+        Compact several prompt fields under one shared token budget.
+
+        Args:
+            stage (str): Stage name, selects the budget and stats bucket.
+            fields (dict): Prompt field name -> structured value.
+            priorities (dict): Field name -> priority; lower is truncated first.
+            model (str): Model whose tokenizer is used for counting.
+
+        Returns:
+            dict: Field name -> minified JSON string ready to interpolate.
+        """
+        priorities = priorities or {}
+        budget = self.budgets.get(stage)
+        seen: set = set()
+        pruned = {name: prune(value, seen) for name, value in fields.items()}
+
+        out = {name: minify(value) for name, value in pruned.items()}
+        total = sum(count_tokens(value, model) for value in out.values())
+        sizes = _Sizes()
+        while (
+            budget is not None
+            and total > budget
+            and any(value is not None for value in pruned.values())
+        ):
+            # trim by characters at the payload's tokens-per-character ratio,
+            # subtracting each removed piece, then count tokens once more
+            chars = sum(sizes.of(value) for value in pruned.values())
+            target = chars * budget / total
+            for name in sorted(pruned, key=lambda n: priorities.get(n, 0)):
+                while pruned[name] is not None and chars > target:
+                    pruned[name], removed = _shrink(pruned[name], sizes)
+                    chars -= removed
+                if chars <= target:
+                    break
+            out = {name: minify(value) for name, value in pruned.items()}
+            total = sum(count_tokens(value, model) for value in out.values())
+
+        self.calls[stage] += 1
+        self.tokens_before[stage] += sum(
+            count_tokens(str(value), model) for value in fields.values()
+        )
+        self.tokens_after[stage] += total
+        return out
+
+    def compact_object(
+        self,
+        stage: str,
+        data: Dict[str, Any],
+        priorities: Dict[str, int] | None = None,
+        model: str = "gpt-4.1-nano",
+    ) -> str:
+        """
+        Like compact, but for a single dict whose top-level keys are the
+        prioritized fields. Returns the whole object as minified JSON.
+        """
+        fields = self.compact(stage, data, priorities, model)
+        return "{" + ",".join(f"{json.dumps(k)}:{v}" for k, v in fields.items()) + "}"
+
+    def stats(self) -> dict:
+        return {
+            "tokenizer": "tiktoken" if tiktoken else "estimate",
+            "stages": {
+                stage: {
+                    "calls": self.calls[stage],
+                    "budget": self.budgets.get(stage),
+                    "avg_tokens_before": self.tokens_before[stage] // self.calls[stage],
+                    "avg_tokens_after": self.tokens_after[stage] // self.calls[stage],
+                }
+                for stage in self.calls
+            },
+        }
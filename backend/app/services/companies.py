@@ -0,0 +1,160 @@
+import re
+from urllib.parse import parse_qs, urlsplit
+
+# Hosted applicant-tracking systems: host pattern -> where the company slug is
+ATS_HOSTS = [
+    # acme.wd5.myworkdayjobs.com/en-US/External/job/...
+    (re.compile(r"^(?P<slug>[\w-]+)\.wd\d+\.myworkdayjobs\.com$"), "host"),
+    # boards.greenhouse.io/acme/jobs/123, job-boards.greenhouse.io/acme/...
+    (re.compile(r"^(?:job-)?boards(?:\.eu)?\.greenhouse\.io$"), "path"),
+    # jobs.lever.co/acme/<uuid>
+    (re.compile(r"^jobs(?:\.eu)?\.lever\.co$"), "path"),
+    # jobs.ashbyhq.com/acme/<uuid>
+    (re.compile(r"^jobs\.ashbyhq\.com$"), "path"),
+    # jobs.smartrecruiters.com/Acme/123
+    (re.compile(r"^(?:jobs|careers)\.smartrecruiters\.com$"), "path"),
+    # apply.workable.com/acme/j/ABC
+    (re.compile(r"^apply\.workable\.com$"), "path"),
+    # jobs.jobvite.com/acme/job/oABC
+    (re.compile(r"^jobs\.jobvite\.com$"), "path"),
+]
+# careers.acme.com, jobs.careers.acme.com, jobs.acme.co.uk, acme.com/careers
+CAREERS_HOST_RE = re.compile(r"^(?:(?:careers|jobs|work|join)\.)+(?P<slug>[\w-]+)\.")
+CAREERS_PATH_RE = re.compile(r"^/(?:[a-z]{2}(?:-[a-z]{2})?/)?(?:careers|jobs)\b", re.I)
+GENERIC_SLUGS = {
+    "embed",
+    "en",
+    "us",
+    "jobs",
+    "careers",
+    "job",
+    "www",
+    "work",
+    "join",
+    "apply",
+    "view",
+}
+# Job aggregators and applicant-tracking systems whose careers-looking URLs
+# name themselves, not the employer
+AGGREGATORS = {
+    "linkedin",
+    "indeed",
+    "glassdoor",
+    "ziprecruiter",
+    "monster",
+    "simplyhired",
+    "wellfound",
+    "handshake",
+    "google",
+    "workable",
+    "jobvite",
+    "greenhouse",
+    "lever",
+    "ashbyhq",
+    "smartrecruiters",
+    "myworkdayjobs",
+    "workday",
+    "icims",
+    "taleo",
+    "bamboohr",
+    "recruitee",
+    "teamtailor",
+    "breezy",
+    "applytojob",
+    "jazzhr",
+    "successfactors",
+}
+
+LEGAL_SUFFIX_RE = re.compile(
+    r"[,\s]+(?:Inc|LLC|L\.L\.C|Ltd|Limited|Corp|Corporation|Co|GmbH|PLC|S\.A|AG)\.?$",
+    re.IGNORECASE,
+)
+LLM_PREAMBLE_RE = re.compile(
+    r"^(?:the\s+)?company(?:\s+name)?(?:\s+is|:)\s*|^company:\s*", re.IGNORECASE
+)
+
+
+def _slug_to_name(slug: str) -> str:
+    words = re.split(r"[-_]+", slug)
+    return " ".join(w if not w.islower() else w.capitalize() for w in words if w)
+
+
+def _employer_slug(slug: str | None) -> str | None:
+    """`slug` unless it names a job board or a generic path segment."""
+    if not slug or slug.lower() in GENERIC_SLUGS or slug.lower() in AGGREGATORS:
+        return None
+    return slug
+
+
+def resolve_company_from_url(url: str, careers_sites: bool = True) -> str | None:
+    """
+    Company name from the URL of a posting on a known job board
+    (Workday, Greenhouse, Lever, Ashby, SmartRecruiters, Workable, Jobvite) or
+    a company careers site, without any network call.
+
+    Args:
+        url (str): The URL of the job posting.
+        careers_sites (bool): Also guess from careers-site hosts and paths
+            (careers.acme.com, acme.com/jobs). Job board slugs are exact;
+            these guesses should be checked against the job description.
+
+    Returns:
+        str | None: The company name derived from the URL slug, or None if
+        the URL does not match a known pattern.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower().split(":")[0]
+    segments = [s for s in parts.path.split("/") if s]
+
+    for pattern, where in ATS_HOSTS:
+        match = pattern.match(host)
+        if not match:
+            continue
+        if where == "host":
+            slug = match.group("slug")
+        else:
+            # greenhouse embeds carry the company in ?for=acme
+            slug = parse_qs(parts.query).get("for", [None])[0] or next(
+                (s for s in segments if s.lower() not in GENERIC_SLUGS), None
+            )
+        slug = _employer_slug(slug)
+        return _slug_to_name(slug) if slug else None
+
+    if not careers_sites:
+        return None
+
+    match = CAREERS_HOST_RE.match(host)
+    if match:
+        slug = _employer_slug(match.group("slug"))
+        return _slug_to_name(slug) if slug else None
+
+    if CAREERS_PATH_RE.match(parts.path):
+        labels = host.removeprefix("www.").split(".")
+        if len(labels) >= 2:
+            # metacareers.com -> meta
+            slug = _employer_slug(re.sub(r"(?<=.)(?:careers|jobs)$", "", labels[0]))
+            return _slug_to_name(slug) if slug else None
+    return None
+
+
+def same_company(a: str, b: str) -> bool:
+    """Whether two names plausibly name one company ("Meta", "Meta Platforms")."""
+    a, b = (re.sub(r"[^a-z0-9]", "", name.lower()) for name in (a, b))
+    return bool(a and b) and (a.startswith(b) or b.startswith(a))
+
+
+def normalize_company_name(name: str | None) -> str | None:
+    """
+    Clean a company name from job data or an LLM answer: drop preambles like
+    "The company name is", quotes, trailing punctuation and legal suffixes.
+    """
+    if not name:
+        return None
+    name = " ".join(name.split()).strip("\"'` ")
+    name = LLM_PREAMBLE_RE.sub("", name).strip("\"'` .")
+    while True:
+        stripped = LEGAL_SUFFIX_RE.sub("", name).strip(" ,.")
+        if stripped == name or not stripped:
+            break
+        name = stripped
+    return name or None
@@ -0,0 +1,384 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Dict, List
+
+from app.services.cache import DAY, normalize_text
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+@dataclass
+class CompanyRecord:
+    key: str  # normalize_text(name)
+    name: str
+    company_info: dict | None = None
+    refreshed_at: float | None = None
+    attempted_at: float | None = None
+    requests: int = 0
+    last_requested: float | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class MemoryCompanyStore:
+    blocking = False
+
+    def __init__(self):
+        self._records: Dict[str, CompanyRecord] = {}
+
+    def get(self, key: str) -> CompanyRecord | None:
+        return self._records.get(key)
+
+    def touch(self, key: str, name: str) -> CompanyRecord:
+        record = self._records.setdefault(key, CompanyRecord(key=key, name=name))
+        record.requests += 1
+        record.last_requested = time.time()
+        return record
+
+    def update(self, key: str, name: str, **fields) -> CompanyRecord:
+        record = self._records.setdefault(key, CompanyRecord(key=key, name=name))
+        for attr, value in fields.items():
+            setattr(record, attr, value)
+        return record
+
+    def top(self, n: int) -> List[CompanyRecord]:
+        return sorted(self._records.values(), key=lambda r: -r.requests)[:n]
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class SQLiteCompanyStore:
+    """Keeps the index on disk, so it is warm as soon as the server restarts."""
+
+    blocking = True
+
+    def __init__(self, path: str = "companies.sqlite3"):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS companies (
+                key TEXT PRIMARY KEY,
+                record TEXT NOT NULL,
+                requests INTEGER NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS companies_requests ON companies (requests)"
+        )
+        self._conn.commit()
+
+    def _read(self, key: str) -> CompanyRecord | None:
+        row = self._conn.execute(
+            "SELECT record FROM companies WHERE key = ?", (key,)
+        ).fetchone()
+        return CompanyRecord(**json.loads(row[0])) if row else None
+
+    def _write(self, record: CompanyRecord):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO companies VALUES (?, ?, ?)",
+            (record.key, json.dumps(record.to_dict()), record.requests),
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> CompanyRecord | None:
+        with self._lock:
+            return self._read(key)
+
+    def touch(self, key: str, name: str) -> CompanyRecord:
+        with self._lock:
+            record = self._read(key) or CompanyRecord(key=key, name=name)
+            record.requests += 1
+            record.last_requested = time.time()
+            self._write(record)
+        return record
+
+    def update(self, key: str, name: str, **fields) -> CompanyRecord:
+        with self._lock:
+            record = self._read(key) or CompanyRecord(key=key, name=name)
+            for attr, value in fields.items():
+                setattr(record, attr, value)
+            self._write(record)
+        return record
+
+    def top(self, n: int) -> List[CompanyRecord]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT record FROM companies ORDER BY requests DESC LIMIT ?", (n,)
+            ).fetchall()
+        return [CompanyRecord(**json.loads(row[0])) for row in rows]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM companies").fetchone()[0]
+
+
+# company name -> structure_research output ({"company_info": {...}})
+Research = Callable[[str], Awaitable[dict | None]]
+
+
+class ResearchPending(Exception):
+    """A company that has no research in the index yet; it is queued for it."""
+
+
+class CompanyIndex:
+    """
+    Structured company research (mission, values, interview process, leetcode
+    topics, recent news) keyed by normalized company name, served on the
+    request path without any upstream call.
+
+    Research runs in the background only: every `interval` seconds the `top_n`
+    most requested companies (and any `seed` companies) whose record is older
+    than half of `max_age` are refreshed, and a lookup that misses queues its
+    company for research so the next request finds it. Records older than
+    `max_age` are still served, marked `stale`. A company whose research
+    failed is not retried for `retry_after` seconds.
+    """
+
+    def __init__(
+        self,
+        store,
+        top_n: int = 50,
+        interval: float = 60 * 60,
+        max_age: float = DAY,
+        concurrency: int = 2,
+        seed: List[str] | None = None,
+        retry_after: float = 5 * 60,
+    ):
+        self.store = store
+        self.top_n = top_n
+        self.interval = interval
+        self.max_age = max_age
+        self.concurrency = concurrency
+        self.seed = seed or []
+        self.retry_after = retry_after
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(top_n, 1))
+        self._queued: set = set()
+        self._tasks: List[asyncio.Task] = []
+        self.research: Research | None = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.dropped = 0
+
+    @classmethod
+    def from_env(cls) -> "CompanyIndex":
+        """
+        Build the index from COMPANY_INDEX_BACKEND (memory or sqlite),
+        COMPANY_INDEX_PATH, COMPANY_INDEX_TOP_N, COMPANY_INDEX_INTERVAL,
+        COMPANY_INDEX_MAX_AGE, COMPANY_INDEX_CONCURRENCY and
+        COMPANY_INDEX_SEED (comma-separated company names).
+        """
+        kind = os.getenv("COMPANY_INDEX_BACKEND", "memory")
+        if kind == "sqlite":
+            store = SQLiteCompanyStore(
+                os.getenv("COMPANY_INDEX_PATH", "companies.sqlite3")
+            )
+        elif kind == "memory":
+            store = MemoryCompanyStore()
+        else:
+            raise ValueError(f"Unknown COMPANY_INDEX_BACKEND '{kind}'")
+        seed = os.getenv("COMPANY_INDEX_SEED", "")
+        return cls(
+            store,
+            top_n=int(os.getenv("COMPANY_INDEX_TOP_N", "50")),
+            interval=float(os.getenv("COMPANY_INDEX_INTERVAL", 60 * 60)),
+            max_age=float(os.getenv("COMPANY_INDEX_MAX_AGE", DAY)),
+            concurrency=int(os.getenv("COMPANY_INDEX_CONCURRENCY", "2")),
+            seed=[name.strip() for name in seed.split(",") if name.strip()],
+        )
+
+    async def _call(self, method, *args, **kwargs):
+        if self.store.blocking:
+            return await asyncio.to_thread(method, *args, **kwargs)
+        return method(*args, **kwargs)
+
+    def _age(self, record: CompanyRecord) -> float | None:
+        if record.refreshed_at is None:
+            return None
+        return time.time() - record.refreshed_at
+
+    def _enqueue(self, record: CompanyRecord):
+        if record.key in self._queued:
+            return
+        if (
+            record.attempted_at is not None
+            and time.time() - record.attempted_at < self.retry_after
+        ):
+            return
+        try:
+            self._queue.put_nowait(record.name)
+        except asyncio.QueueFull:
+            # the periodic sweep still picks it up if it stays popular
+            self.dropped += 1
+            return
+        self._queued.add(record.key)
+
+    async def lookup(self, company_name: str | None) -> dict | None:
+        """
+        The indexed research of a company, counting the request towards its
+        traffic. Never waits on research.
+
+        Args:
+            company_name (str): Company name as resolved by the pipeline.
+
+        Returns:
+            dict: `company_info` plus `refreshed_at`, `age_seconds` and
+            `stale`, or None if the company has not been researched yet (it
+            is then queued for research).
+        """
+        if not company_name:
+            return None
+        record = await self._call(
+            self.store.touch, normalize_text(company_name), company_name
+        )
+        age = self._age(record)
+        if record.company_info is None:
+            self.misses += 1
+            self._enqueue(record)
+            return None
+        stale = age > self.max_age
+        if stale:
+            self.stale_hits += 1
+            self._enqueue(record)
+        else:
+            self.hits += 1
+        return {
+            "company_info": record.company_info,
+            "refreshed_at": record.refreshed_at,
+            "age_seconds": round(age),
+            "stale": stale,
+        }
+
+    async def refresh(self, company_name: str, research: Research) -> bool:
+        """
+        Research one company and store it, keeping the old record on failure.
+
+        Returns:
+            bool: Whether the research succeeded.
+        """
+        key = normalize_text(company_name)
+        try:
+            data = await research(company_name)
+            if not (data or {}).get("company_info"):
+                raise ValueError("research returned no company_info")
+        except Exception as e:
+            self.refresh_failures += 1
+            await self._call(
+                self.store.update,
+                key,
+                company_name,
+                attempted_at=time.time(),
+                error=str(e),
+            )
+            return False
+        self.refreshes += 1
+        await self._call(
+            self.store.update,
+            key,
+            company_name,
+            company_info=data["company_info"],
+            refreshed_at=time.time(),
+            attempted_at=time.time(),
+            error=None,
+        )
+        return True
+
+    async def warm(self, company_name: str, research: Research | None = None) -> str:
+        """
+        Research a company now unless the index already holds a record the
+        refresher would not yet renew (younger than half of `max_age`).
+        Unlike lookup, this does not count as a request for the company.
+
+        Args:
+            company_name (str): Company to warm.
+            research (Callable): Defaults to the refresher's, once started.
+
+        Returns:
+            str: "cached", "warmed" or "failed".
+        """
+        record = await self._call(self.store.get, normalize_text(company_name))
+        if record is not None and record.company_info is not None:
+            if self._age(record) <= self.max_age / 2:
+                return "cached"
+        research = research or self.research
+        if research is None:
+            raise RuntimeError("CompanyIndex.warm needs a research function")
+        return "warmed" if await self.refresh(company_name, research) else "failed"
+
+    async def sweep(self):
+        """Queue the top companies by traffic (and the seeds) that are due."""
+        records = await self._call(self.store.top, self.top_n)
+        for name in self.seed:
+            key = normalize_text(name)
+            if all(r.key != key for r in records):
+                record = await self._call(self.store.get, key)
+                records.append(record or CompanyRecord(key=key, name=name))
+        for record in records:
+            age = self._age(record)
+            if age is None or age > self.max_age / 2:
+                self._enqueue(record)
+
+    async def _worker(self, research: Research):
+        while True:
+            company_name = await self._queue.get()
+            try:
+                await self.refresh(company_name, research)
+            finally:
+                self._queued.discard(normalize_text(company_name))
+                self._queue.task_done()
+
+    async def _sweeper(self):
+        while True:
+            await self.sweep()
+            await asyncio.sleep(self.interval)
+
+    def start(self, research: Research):
+        """
+        Start the refresher.
+
+        Args:
+            research (Callable): Researches one company, e.g.
+                ParallelService.company_research on a cache-less service.
+        """
+        self.research = research
+        self._tasks = [
+            asyncio.create_task(self._worker(research), name=f"company-index-{i}")
+            for i in range(self.concurrency)
+        ]
+        self._tasks.append(
+            asyncio.create_task(self._sweeper(), name="company-index-sweeper")
+        )
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "backend": type(self.store).__name__,
+            "companies": len(self.store),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": (
+                round((self.hits + self.stale_hits) / lookups, 3) if lookups else None
+            ),
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "queued": self._queue.qsize(),
+            "dropped": self.dropped,
+        }
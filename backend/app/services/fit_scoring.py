@@ -0,0 +1,425 @@
+import math
+import os
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CATEGORIES = (
+    "technical_skills_match",
+    "experience_alignment",
+    "education_background",
+    "gpa_and_academics",
+    "previous_company_experience",
+    "leadership_and_involvement",
+)
+# Share of each category in overall_fit_score
+WEIGHTS = {
+    "technical_skills_match": 0.3,
+    "experience_alignment": 0.25,
+    "education_background": 0.15,
+    "gpa_and_academics": 0.1,
+    "previous_company_experience": 0.1,
+    "leadership_and_involvement": 0.1,
+}
+# How much a requirement counts towards technical_skills_match, by where the
+# job description lists it
+REQUIREMENT_WEIGHTS = {
+    "must_have": 3.0,
+    "technical": 2.0,
+    "tools_and_technologies": 2.0,
+    "nice_to_have": 1.0,
+}
+
+# Words, keeping "c++", "c#", "node.js" and "3.84" whole
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOPWORDS = frozenset(
+    """a an and are as at be by for from in into is it of on or our the to
+    with within you your we will who using use etc strong ability experience
+    knowledge working understanding related proficiency skills""".split()
+)
+EDUCATION_RE = re.compile(
+    r"\b(degree|bachelor|master|ph\.?d|b\.?s\.?|m\.?s\.?|b\.?a\.?|university|"
+    r"college|enrolled|graduat\w*|major)\b",
+    re.IGNORECASE,
+)
+DEGREE_LEVELS = (
+    (re.compile(r"\b(ph\.?d|doctor)", re.IGNORECASE), 25),
+    (re.compile(r"\b(master|m\.?s\b|m\.?eng|mba)", re.IGNORECASE), 20),
+    (re.compile(r"\b(bachelor|b\.?s\b|b\.?a\b|b\.?eng|b\.?sc)", re.IGNORECASE), 15),
+)
+GPA_RE = re.compile(r"GPA[:\s]*(\d\.\d+)(?:\s*/\s*(\d(?:\.\d+)?))?", re.IGNORECASE)
+HONORS_RE = re.compile(
+    r"\b(dean'?s list|honou?rs|cum laude|scholar(ship)?|award|fellowship)\b",
+    re.IGNORECASE,
+)
+LEADERSHIP_RE = re.compile(
+    r"\b(led|lead|leading|mentor\w*|manag\w*|found(ed|er)|president|captain|"
+    r"organi[sz]\w*|coordinat\w*|chair\w*|officer|director|head|cto|ceo|"
+    r"spearhead\w*|tutor\w*|owned)\b",
+    re.IGNORECASE,
+)
+
+# Cosine similarity at or below LOW counts as no match, at or above HIGH as a
+# full one; character trigrams give unrelated phrases a small overlap
+LOW, HIGH = 0.1, 0.5
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Features of one text: its content words, plus the character trigrams of
+    each word so "postgres" / "postgresql" or "react" / "reactjs" overlap.
+    """
+    features = []
+    for word in TOKEN_RE.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        features.append(word)
+        padded = f"<{word}>"
+        features.extend(padded[i : i + 3] for i in range(len(padded) - 2))
+    return features
+
+
+def tfidf(documents: Sequence[List[str]]) -> np.ndarray:
+    """
+    Row-normalized TF-IDF matrix (sublinear tf, smoothed idf) of tokenized
+    documents, with the vocabulary and idf taken from `documents` alone.
+    """
+    vocabulary: Dict[str, int] = {}
+    counts = [Counter(doc) for doc in documents]
+    for doc in counts:
+        for term in doc:
+            vocabulary.setdefault(term, len(vocabulary))
+
+    matrix = np.zeros((len(documents), max(len(vocabulary), 1)), dtype=np.float32)
+    for row, doc in enumerate(counts):
+        for term, count in doc.items():
+            matrix[row, vocabulary[term]] = 1 + math.log(count)
+    df = np.count_nonzero(matrix, axis=0)
+    matrix *= np.log((1 + len(documents)) / (1 + df)) + 1
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def coverage(similarity: np.ndarray) -> np.ndarray:
+    """Similarity mapped onto 0..1, how well a requirement is covered."""
+    return np.clip((similarity - LOW) / (HIGH - LOW), 0, 1)
+
+
+def texts(values: Iterable) -> List[str]:
+    return [v.strip() for v in values if isinstance(v, str) and v.strip()]
+
+
+def strings(value) -> List[str]:
+    """Every string anywhere in a JSON-like value."""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [s for v in value.values() for s in strings(v)]
+    if isinstance(value, list):
+        return [s for v in value for s in strings(v)]
+    return []
+
+
+def shorten(text: str, limit: int = 60) -> str:
+    return text if len(text) <= limit else text[: limit - 3].rstrip() + "..."
+
+
+@dataclass
+class ResumeFeatures:
+    """The parts of a structured resume the scorer compares, tokenized once."""
+
+    skills: List[str]
+    bullets: List[str]
+    roles: List[str]
+    companies: List[str]
+    degrees: List[str]
+    everything: List[str]
+    tokens: Dict[str, List[str]] = field(default_factory=dict)
+
+    @classmethod
+    def of(cls, resume: dict) -> "ResumeFeatures":
+        resume = resume or {}
+        experience = [e for e in resume.get("experience") or [] if isinstance(e, dict)]
+        education = [e for e in resume.get("education") or [] if isinstance(e, dict)]
+        features = cls(
+            skills=texts(resume.get("skills") or []),
+            bullets=texts(b for e in experience for b in e.get("bullets") or []),
+            roles=texts(e.get("role") for e in experience),
+            companies=texts(e.get("company") for e in experience),
+            degrees=texts(
+                " ".join(texts([e.get("degree"), e.get("school")])) for e in education
+            ),
+            everything=texts(strings(resume)),
+        )
+        for text in (
+            features.skills + features.bullets + features.roles + features.degrees
+        ):
+            features.tokens[text] = tokenize(text)
+        return features
+
+
+@dataclass
+class FitAssessment:
+    """Category scores of one resume against one job, and what they rest on."""
+
+    scores: Dict[str, int]
+    evidence: Dict[str, dict]
+    overall: int
+
+    def reasons(self) -> Dict[str, str]:
+        """Short factual reasons written from the evidence, without an LLM."""
+
+        def listing(items: List[str], prefix: str, empty: str) -> str:
+            return f"{prefix}{', '.join(items[:3])}." if items else empty
+
+        tech = self.evidence["technical_skills_match"]
+        experience = self.evidence["experience_alignment"]
+        academics = self.evidence["gpa_and_academics"]
+        gpa = f"GPA {academics['gpa']}" if academics["gpa"] else "No GPA listed"
+        return {
+            "technical_skills_match": (
+                f"Covers {tech['covered']} of {tech['total']} listed requirements"
+                + listing(tech["matched"], ", e.g. ", ".")
+                + listing(tech["missing"], " Missing: ", "")
+            ),
+            "experience_alignment": (
+                f"{experience['bullets']} experience bullets cover "
+                f"{experience['covered']} of {experience['total']} responsibilities."
+            ),
+            "education_background": listing(
+                self.evidence["education_background"]["degrees"],
+                "Education: ",
+                "No education listed.",
+            ),
+            "gpa_and_academics": gpa + listing(academics["honors"], "; honors: ", "."),
+            "previous_company_experience": listing(
+                self.evidence["previous_company_experience"]["companies"],
+                "Experience at ",
+                "No previous company experience listed.",
+            ),
+            "leadership_and_involvement": listing(
+                self.evidence["leadership_and_involvement"]["items"],
+                "Leadership: ",
+                "No leadership roles or activities listed.",
+            ),
+        }
+
+    def to_dict(self, reasons: Dict[str, str | None] | None = None) -> dict:
+        """The assessment in the generate_fit_score output shape."""
+        local = self.reasons()
+        reasons = reasons or {}
+        return {
+            "overall_fit_score": self.overall,
+            "categories": {
+                category: {
+                    "score": self.scores[category],
+                    "reason": reasons.get(category) or local[category],
+                }
+                for category in CATEGORIES
+            },
+        }
+
+
+class FitScorer:
+    """
+    Deterministic fit scoring on the CPU.
+
+    Resume skills, bullets and roles and the job's requirements, skills and
+    responsibilities are embedded as TF-IDF vectors (words plus character
+    trigrams); each category score comes from a similarity matrix between
+    the two sides, or from resume fields for education, GPA, companies and
+    leadership. With `reasons="llm"` an LLM still writes the short reasons
+    from the scores and their evidence; with `mode="llm"` the whole score is
+    left to the LLM, as before.
+    """
+
+    def __init__(self, mode: str = "local", reasons: str = "llm"):
+        self.mode = mode
+        self.reasons = reasons
+        self.scored = 0
+        self.seconds = 0.0
+        self.reason_failures = 0
+
+    @classmethod
+    def from_env(cls) -> "FitScorer":
+        return cls(
+            mode=os.getenv("FIT_SCORING", "local").lower(),
+            reasons=os.getenv("FIT_SCORE_REASONS", "llm").lower(),
+        )
+
+    def score(self, job: dict, resume: dict | ResumeFeatures) -> FitAssessment:
+        """
+        Args:
+            job (dict): Structured job data (structure_job output).
+            resume (dict): Structured resume, or its ResumeFeatures.
+
+        Returns:
+            FitAssessment: Scores (0-100) per category, overall and evidence.
+        """
+        start = time.perf_counter()
+        if not isinstance(resume, ResumeFeatures):
+            resume = ResumeFeatures.of(resume)
+        description = (job or {}).get("description") or {}
+        requirements = description.get("requirements") or {}
+        skills = description.get("skills") or {}
+        title = ((job or {}).get("job_info") or {}).get("title") or ""
+
+        must_have = texts(requirements.get("must_have") or [])
+        # degree / enrollment asks are scored under education_background
+        education_asks = [r for r in must_have if EDUCATION_RE.search(r)]
+        sections = {
+            "must_have": [r for r in must_have if r not in education_asks],
+            "technical": texts(skills.get("technical") or []),
+            "tools_and_technologies": texts(skills.get("tools_and_technologies") or []),
+            "nice_to_have": texts(requirements.get("nice_to_have") or []),
+        }
+        responsibilities = texts(description.get("responsibilities") or [])
+
+        # one vector space for everything compared in this job
+        resume_side = resume.skills + resume.bullets + resume.roles + resume.degrees
+        job_side = [r for items in sections.values() for r in items]
+        job_side += education_asks + responsibilities + texts([title])
+        index = {
+            text: i for i, text in enumerate(dict.fromkeys(resume_side + job_side))
+        }
+        vectors = tfidf([resume.tokens.get(text) or tokenize(text) for text in index])
+
+        def similarity(left: List[str], right: List[str]) -> np.ndarray:
+            if not left or not right:
+                return np.zeros((len(left), len(right)), dtype=np.float32)
+            a = vectors[[index[t] for t in left]]
+            b = vectors[[index[t] for t in right]]
+            return a @ b.T
+
+        scores, evidence = {}, {}
+
+        # requirements x resume items; each requirement is as covered as its
+        # best match on the resume
+        required = [r for items in sections.values() for r in items]
+        weights = np.array(
+            [REQUIREMENT_WEIGHTS[s] for s, items in sections.items() for _ in items]
+        )
+        tech_items = resume.skills + resume.bullets + resume.roles + resume.degrees
+        covered = coverage(similarity(tech_items, required).max(axis=0, initial=0))
+        scores["technical_skills_match"] = (
+            round(100 * float(covered @ weights / weights.sum())) if required else 0
+        )
+        matched = [r for r, c in zip(required, covered) if c >= 0.5]
+        evidence["technical_skills_match"] = {
+            "covered": len(matched),
+            "total": len(required),
+            "matched": [shorten(r) for r in matched],
+            "missing": [
+                shorten(r) for r, c in zip(sections["must_have"], covered) if c < 0.5
+            ],
+        }
+
+        # responsibilities (or the must-haves, if none are listed) x bullets
+        duties = responsibilities or sections["must_have"]
+        experience_items = resume.bullets + resume.roles
+        duty_coverage = coverage(
+            similarity(experience_items, duties).max(axis=0, initial=0)
+        )
+        depth = min(len(resume.bullets) / 4, 1)
+        scores["experience_alignment"] = (
+            round(100 * (0.7 * float(duty_coverage.mean()) + 0.3 * depth))
+            if duties
+            else round(60 * depth)
+        )
+        evidence["experience_alignment"] = {
+            "bullets": len(resume.bullets),
+            "covered": int((duty_coverage >= 0.5).sum()),
+            "total": len(duties),
+        }
+
+        # degree level, plus how well the degree matches what the job asks for
+        if resume.degrees:
+            level = max(
+                (
+                    bonus
+                    for pattern, bonus in DEGREE_LEVELS
+                    for d in resume.degrees
+                    if pattern.search(d)
+                ),
+                default=5,
+            )
+            target = education_asks or texts([title])
+            relevance = (
+                coverage(similarity(resume.degrees, target)).max(initial=0)
+                if target
+                else 0
+            )
+            scores["education_background"] = min(
+                100, round(55 + level + 25 * relevance)
+            )
+        else:
+            scores["education_background"] = 15
+        evidence["education_background"] = {"degrees": resume.degrees}
+
+        gpa, ratio = None, 0.0
+        honors = sorted(
+            {
+                m.group(1).lower()
+                for t in resume.everything
+                for m in HONORS_RE.finditer(t)
+            }
+        )
+        for text in resume.everything:
+            match = GPA_RE.search(text)
+            if match:
+                gpa = "/".join(g for g in match.groups() if g)
+                scale = float(match.group(2) or 4)
+                ratio = min(float(match.group(1)) / scale, 1) if scale else 0.0
+                break
+        base = max(30, round(100 * ratio)) if gpa else 40
+        scores["gpa_and_academics"] = min(100, base + 5 * len(honors))
+        evidence["gpa_and_academics"] = {"gpa": gpa, "honors": honors}
+
+        if resume.companies:
+            role_fit = (
+                coverage(similarity(resume.roles, texts([title]))).max(initial=0)
+                if resume.roles
+                else 0
+            )
+            scores["previous_company_experience"] = min(
+                100, round(35 + 15 * min(len(resume.companies), 3) + 20 * role_fit)
+            )
+        else:
+            scores["previous_company_experience"] = 10
+        evidence["previous_company_experience"] = {"companies": resume.companies}
+
+        leading = [
+            shorten(t) for t in resume.roles + resume.bullets if LEADERSHIP_RE.search(t)
+        ]
+        scores["leadership_and_involvement"] = (
+            min(100, 45 + 15 * len(leading)) if leading else 25
+        )
+        evidence["leadership_and_involvement"] = {"items": leading}
+
+        overall = round(sum(WEIGHTS[c] * scores[c] for c in CATEGORIES))
+        self.scored += 1
+        self.seconds += time.perf_counter() - start
+        return FitAssessment(scores, evidence, overall)
+
+    def score_many(self, jobs: List[dict], resume: dict) -> List[FitAssessment]:
+        """Score one resume against many jobs, tokenizing the resume once."""
+        features = ResumeFeatures.of(resume)
+        return [self.score(job, features) for job in jobs]
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "reasons": self.reasons,
+            "scored": self.scored,
+            "avg_ms": (
+                round(1000 * self.seconds / self.scored, 3) if self.scored else None
+            ),
+            "reason_failures": self.reason_failures,
+        }
@@ -0,0 +1,228 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict
+
+from app.services.pipeline import PipelineRun
+from app.services.scheduler import StageError
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+class QueueFull(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    id: str
+    status: str = "queued"  # queued -> running -> done | failed
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    stages: Dict[str, dict] = field(default_factory=dict)
+    result: Dict[str, Any] | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class MemoryJobStore:
+    """Every queued or running job, and the most recent `max_finished` others."""
+
+    blocking = False
+
+    def __init__(self, max_finished: int = 500):
+        self.max_finished = max_finished
+        self._jobs: Dict[str, Job] = {}
+        self._finished: OrderedDict[str, None] = OrderedDict()
+
+    def save(self, job: Job):
+        self._jobs[job.id] = job
+        if job.status in ("done", "failed"):
+            self._finished[job.id] = None
+            self._finished.move_to_end(job.id)
+            while len(self._finished) > self.max_finished:
+                job_id, _ = self._finished.popitem(last=False)
+                del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+
+class SQLiteJobStore:
+    """Keeps job records on disk so status and results outlive the worker process."""
+
+    blocking = True
+
+    def __init__(self, path: str = "jobs.sqlite3"):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, record TEXT NOT NULL)"
+        )
+        # anything still queued or running belonged to a previous process
+        for (record,) in self._conn.execute("SELECT record FROM jobs").fetchall():
+            job = Job(**json.loads(record))
+            if job.status in ("queued", "running"):
+                job.status = "failed"
+                job.error = "Interrupted by server restart"
+                self._write(job)
+        self._conn.commit()
+
+    def _write(self, job: Job):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO jobs VALUES (?, ?)",
+            (job.id, json.dumps(job.to_dict())),
+        )
+
+    def save(self, job: Job):
+        with self._lock:
+            self._write(job)
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return Job(**json.loads(row[0])) if row else None
+
+
+class JobQueue:
+    """
+    Bounded in-process queue of pipeline runs.
+
+    `concurrency` worker tasks pull graphs off an asyncio.Queue of at most
+    `max_depth` waiting jobs; submit raises QueueFull instead of growing
+    without bound so the route can answer 429.
+    """
+
+    def __init__(self, store, concurrency: int = 4, max_depth: int = 100):
+        self.store = store
+        self.concurrency = concurrency
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_depth)
+        self._workers: list[asyncio.Task] = []
+
+    @classmethod
+    def from_env(cls) -> "JobQueue":
+        """
+        Build the queue from JOB_CONCURRENCY, JOB_QUEUE_DEPTH, JOB_BACKEND
+        (memory or sqlite), JOB_DB_PATH and JOB_MAX_FINISHED (finished jobs
+        the memory backend keeps).
+        """
+        if os.getenv("JOB_BACKEND", "memory") == "sqlite":
+            store = SQLiteJobStore(os.getenv("JOB_DB_PATH", "jobs.sqlite3"))
+        else:
+            store = MemoryJobStore(int(os.getenv("JOB_MAX_FINISHED", "500")))
+        return cls(
+            store,
+            concurrency=int(os.getenv("JOB_CONCURRENCY", "4")),
+            max_depth=int(os.getenv("JOB_QUEUE_DEPTH", "100")),
+        )
+
+    async def _save(self, job: Job):
+        if self.store.blocking:
+            await asyncio.to_thread(self.store.save, job)
+        else:
+            self.store.save(job)
+
+    async def get(self, job_id: str) -> Job | None:
+        if self.store.blocking:
+            return await asyncio.to_thread(self.store.get, job_id)
+        return self.store.get(job_id)
+
+    async def submit(self, run: PipelineRun) -> Job:
+        """
+        Queue a pipeline run.
+
+        Args:
+            run (PipelineRun): The run to execute.
+
+        Returns:
+            Job: The queued job record.
+
+        Raises:
+            QueueFull: If `max_depth` jobs are already waiting.
+        """
+        if self._queue.full():
+            raise QueueFull(f"{self._queue.maxsize} pipeline jobs already queued")
+        job = Job(id=run.run_id)
+        job.stages = {name: {"status": "pending"} for name in run.graph.stages}
+        # saved before a worker can pick it up and save it as running
+        await self._save(job)
+        try:
+            self._queue.put_nowait((job, run))
+        except asyncio.QueueFull:
+            # filled up by another submit while this one was saving
+            job.status = "failed"
+            job.error = "Queue full"
+            job.finished_at = time.time()
+            await self._save(job)
+            raise QueueFull(f"{self._queue.maxsize} pipeline jobs already queued")
+        return job
+
+    async def _run(self, job: Job, run: PipelineRun):
+        job.status = "running"
+        job.started_at = time.time()
+        await self._save(job)
+
+        results = {}
+        try:
+            async for finished in run.stream():
+                results[finished.name] = finished.result
+                job.stages[finished.name] = {
+                    "status": "reused" if finished.reused else "done",
+                    "duration_ms": round(finished.duration * 1000),
+                }
+                if finished.error is not None:
+                    job.stages[finished.name].update(
+                        status="degraded", error=finished.error
+                    )
+                await self._save(job)
+            job.result = await run.finish(results)
+            job.status = "done"
+        except StageError as e:
+            job.stages[e.stage] = {"status": "failed"}
+            job.status = "failed"
+            job.error = str(e)
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        job.finished_at = time.time()
+        await self._save(job)
+
+    async def _worker(self):
+        while True:
+            job, run = await self._queue.get()
+            try:
+                await self._run(job, run)
+            finally:
+                self._queue.task_done()
+
+    def start(self):
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"pipeline-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "queued": self._queue.qsize(),
+            "max_depth": self._queue.maxsize,
+        }
@@ -0,0 +1,207 @@
+import contextvars
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Dict, List, Tuple
+
+# USD per 1M tokens (input, output). Rough list prices, for trend-watching only.
+MODEL_PRICES = {
+    "gpt-4": (30.0, 60.0),
+    "gpt-4.1": (2.0, 8.0),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
+# USD per Parallel request
+PARALLEL_PRICES = {
+    "search": 0.005,
+    "extract": 0.001,
+}
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+# Spans recorded for the current request, when the caller opted in
+current_trace: contextvars.ContextVar[List[dict] | None] = contextvars.ContextVar(
+    "current_trace", default=None
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(**labels) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels] + ([extra] if extra else [])
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1e6
+
+
+def start_trace() -> List[dict]:
+    """Start collecting spans for the current request and return the list."""
+    trace: List[dict] = []
+    current_trace.set(trace)
+    return trace
+
+
+def trace_event(**fields):
+    trace = current_trace.get()
+    if trace is not None:
+        trace.append(fields)
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class Span:
+    """Mutable record of one upstream call, filled in while it runs."""
+
+    def __init__(self, upstream: str, stage: str, model: str):
+        self.upstream = upstream
+        self.stage = stage
+        self.model = model
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self.cost = 0.0
+
+    def record_usage(self, usage):
+        if usage is None:
+            return
+        self.prompt_tokens = usage.prompt_tokens or 0
+        self.completion_tokens = usage.completion_tokens or 0
+        # prompt prefix the provider served from its cache
+        details = getattr(usage, "prompt_tokens_details", None)
+        self.cached_tokens = getattr(details, "cached_tokens", None) or 0
+        self.cost = estimate_cost(
+            self.model, self.prompt_tokens, self.completion_tokens
+        )
+
+
+class Metrics:
+    """
+    Process-wide counters and histograms for upstream calls and pipeline
+    stages, rendered in the Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = defaultdict(dict)
+        self.counters: Dict[str, Dict[Labels, float]] = defaultdict(
+            lambda: defaultdict(float)
+        )
+        self.help: Dict[str, str] = {}
+
+    def observe(self, name: str, value: float, help: str = "", **labels):
+        key = _labels(**labels)
+        series = self.histograms[name]
+        if key not in series:
+            series[key] = Histogram()
+        series[key].observe(value)
+        self.help.setdefault(name, help)
+
+    def inc(self, name: str, amount: float = 1, help: str = "", **labels):
+        self.counters[name][_labels(**labels)] += amount
+        self.help.setdefault(name, help)
+
+    @asynccontextmanager
+    async def span(self, upstream: str, stage: str, model: str):
+        """
+        Time one upstream call and record its tokens, cost, retries and
+        outcome, both in the process metrics and in the request trace.
+        """
+        span = Span(upstream, stage, model)
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield span
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            labels = {"upstream": upstream, "stage": stage, "model": model}
+            self.observe(
+                "hireme_upstream_request_seconds",
+                seconds,
+                "Latency of OpenAI / Parallel calls",
+                **labels,
+            )
+            self.inc(
+                "hireme_upstream_requests_total",
+                help="OpenAI / Parallel calls by outcome",
+                status=status,
+                **labels,
+            )
+            if span.retries:
+                self.inc(
+                    "hireme_upstream_retries_total",
+                    span.retries,
+                    "Retries of rate-limited or failed calls, by the client rate limiter",
+                    **labels,
+                )
+            for kind, tokens in (
+                ("prompt", span.prompt_tokens),
+                ("completion", span.completion_tokens),
+                ("cached", span.cached_tokens),
+            ):
+                if tokens:
+                    self.inc(
+                        "hireme_upstream_tokens_total",
+                        tokens,
+                        "LLM tokens used",
+                        kind=kind,
+                        **labels,
+                    )
+            if span.cost:
+                self.inc(
+                    "hireme_upstream_cost_usd_total",
+                    span.cost,
+                    "Estimated upstream spend in USD",
+                    **labels,
+                )
+            trace_event(
+                **labels,
+                status=status,
+                duration_ms=round(seconds * 1000),
+                prompt_tokens=span.prompt_tokens,
+                completion_tokens=span.completion_tokens,
+                cached_tokens=span.cached_tokens,
+                cost_usd=round(span.cost, 6),
+                retries=span.retries,
+            )
+
+    def render(self) -> str:
+        lines = []
+        for name, series in sorted(self.counters.items()):
+            lines.append(f"# HELP {name} {self.help.get(name, '')}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in sorted(series.items()):
+                lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        for name, series in sorted(self.histograms.items()):
+            lines.append(f"# HELP {name} {self.help.get(name, '')}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in sorted(series.items()):
+                for bound, count in zip(hist.buckets, hist.counts):
+                    le = _format_labels(labels, f'le="{bound:g}"')
+                    lines.append(f"{name}_bucket{le} {count}")
+                inf = _format_labels(labels, 'le="+Inf"')
+                lines.append(f"{name}_bucket{inf} {hist.count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {hist.sum:g}")
+                lines.append(f"{name}_count{_format_labels(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
@@ -1,10 +1,28 @@
-import json
-import os
-from concurrent.futures import ThreadPoolExecutor
-
+import asyncio
+import hashlib
+from typing import Dict, List
+
+from app.services.cache import (
+    StageCache,
+    cached_stage,
+    normalize_text,
+    normalize_url,
+)
+from app.services import schemas
+from app.services.clients import ClientRegistry
+from app.services.companies import (
+    normalize_company_name,
+    resolve_company_from_url,
+    same_company,
+)
+from app.services.company_index import CompanyIndex, ResearchPending
+from app.services.compaction import Compactor, minify
+from app.services.fit_scoring import FitScorer, ResumeFeatures
+from app.services.runs import RunRecord, SQLiteRunBackend
+from app.services.sessions import InterviewSession, Turn
+from app.services.singleflight import SingleFlight
+from app.services.structured import StructuredOutputError
 from dotenv import load_dotenv
-from openai import OpenAI
-from parallel import Parallel
 
 load_dotenv()
 
@@ -79,6 +97,20 @@ Scoring guidelines:
         Job Description: {job_description}
         User Data: {user_data}
         """
+    fit_score_reasons_prompt = """
+You are writing the reasons for a hiring fit score. The scores (0-100) were
+already computed by comparing a resume with a job description; do NOT change
+or restate them as numbers.
+
+For each category write 1-2 short, factual sentences explaining its score,
+using only the evidence given (matched and missing requirements, degrees,
+GPA, companies, leadership items). Do not add skills or experience that are
+not in the evidence. Return ONLY valid JSON with one string per category.
+
+Job title: {title}
+Scores: {scores}
+Evidence: {evidence}
+"""
     structure_job_prompt = """
         Convert the following messy job description text into a well-structured JSON object.
         Do not add or hallucinate data. Only reorganize and lightly normalize what is present
@@ -141,11 +173,83 @@ Scoring guidelines:
         Raw content:
         {raw_data[0]}
     """
+    # Lower priority fields are truncated first when a cheat sheet prompt is
+    # over its token budget
+    cheat_sheet_priorities = {
+        "company_name": 9,
+        "company_data": 6,
+        "fit_score": 5,
+        "profile_data": 4,
+        "job_data": 3,
+        "questions": 2,
+        "references": 1,
+    }
+    # The cheat sheet split into independent sections (CHEAT_SHEET_SPLIT):
+    # section -> (response model, what to write). Each is written from only the
+    # inputs it needs, so it can start as soon as those are ready.
+    cheat_sheet_sections = {
+        "company": (
+            schemas.CheatSheetCompany,
+            """- companyMustKnows: 3-5 bullets from the mission statement, core values,
+  engineering culture and interview process patterns of the company.
+- recentNews: recent news about the company, from company_data.recent_news
+  when present, otherwise derived from the job context.
+- leetcodeTopics: up to 10 leetcode topics likely to come up for this role,
+  starting from company_data.leetcode_topics when present.""",
+        ),
+        "fit_summary": (
+            schemas.CheatSheetFitSummary,
+            """- fitScoreSummary: the overall score from the fit score object, the
+  candidate's skill gaps, and specific, actionable recommendations to improve
+  on each gap.""",
+        ),
+        "speak_points": (
+            schemas.CheatSheetSpeakPoints,
+            """- speakPoints (8 max): conversational hooks based on the interviewer's
+  technical specialties and background, shared affiliations or alma maters,
+  skill gaps from the fit score and what the role asks for. Must be
+  actionable, not generic.""",
+        ),
+        "interviewer": (
+            schemas.CheatSheetInterviewer,
+            """- interviewerIntel: technical specialty areas inferred from the
+  interviewer's experience, affiliations (schools, orgs, shared connections)
+  and a 1-2 sentence background summary.""",
+        ),
+        "people": (
+            schemas.CheatSheetPeople,
+            """- peopleExperience: for people who have held similar roles at the
+  company, their name, role and an interview tip.""",
+        ),
+    }
 
-    def __init__(self):
-        self.client = Parallel(api_key=os.getenv("PARALLEL_API_KEY"))
-
-    def scrape_linkedin_profile(self, linkedIn_url: str):  # WORKS
+    def __init__(
+        self,
+        clients: ClientRegistry | None = None,
+        cache: StageCache | None = None,
+        flight: SingleFlight | None = None,
+        compactor: Compactor | None = None,
+        fit_scorer: FitScorer | None = None,
+        companies: CompanyIndex | None = None,
+    ):
+        self.clients = clients or ClientRegistry.from_env()
+        self.cache = cache
+        self.flight = flight
+        self.compactor = compactor or Compactor.from_env()
+        self.fit_scorer = fit_scorer or FitScorer.from_env()
+        self.companies = companies
+        self.client = self.clients.parallel
+        # resume hash -> its ResumeFeatures; a batch shares one service
+        # across its postings, so a resume is tokenized once per batch
+        self._resume_features: Dict[str, asyncio.Task] = {}
+
+    @cached_stage(
+        "scrape_linkedin_profile",
+        prompt_version="2",
+        model="gpt-4.1-nano",
+        key=normalize_url,
+    )
+    async def scrape_linkedin_profile(self, linkedIn_url: str):  # WORKS
         """
         Scrape a LinkedIn profile using the Parallel API.
 
@@ -156,7 +260,8 @@ Scoring guidelines:
             dict: The scraped profile data.
         """
 
-        extract = self.client.beta.search(
+        extract = await self.clients.search(
+            "scrape_linkedin_profile",
             search_queries=[
                 linkedIn_url,
                 f"linkedin profile for {linkedIn_url.strip().split('/')[-2]}",
@@ -166,11 +271,19 @@ Scoring guidelines:
             objective=self.linkedIn_prompt,
         )
         # HERE CALL STRUCTURE OUTPUT FUNCTION TO PARSE INTO DICT -- OPENAI CALL
-        structured_output = self.structure_linkedin(extract.results[0].excerpts)  # type: ignore
+        structured_output = await self.structure_linkedin(
+            extract.results[0].excerpts  # type: ignore
+        )
         return structured_output
         # return extract.results[0].excerpts  # type: ignore
 
-    def search_job_description(self, job_url: str) -> dict:  # WORKS
+    @cached_stage(
+        "search_job_description",
+        prompt_version="2",
+        model="gpt-4.1-nano",
+        key=normalize_url,
+    )
+    async def search_job_description(self, job_url: str) -> dict:  # WORKS
         """
         Search a job description using the Parallel API.
 
@@ -181,36 +294,86 @@ Scoring guidelines:
             dict: The job description data.
         """
 
-        extract = self.client.beta.extract(
+        extract = await self.clients.extract(
+            "search_job_description",
             urls=[job_url],
             objective=self.job_description_prompt,
             excerpts=True,
             full_content=False,
         )
-        return self.structure_job(extract.results[0].excerpts)  # type: ignore
+        return await self.structure_job(extract.results[0].excerpts)  # type: ignore
 
-    def extract_company_name(self, job_url: str) -> str:
+    async def resolve_company_name(self, job_url: str) -> str | None:
         """
-        Extract company information from a job URL using the Parallel API.
+        Normalized company name for a job posting, cheapest source first:
+        the job board URL slug, then `job_info.company` from the structured
+        job description (coalesced with the job_data stage's identical call,
+        so no extra round trip), then the careers-site URL guess, then an LLM
+        guess from the URL. The careers-site guess (careers.acme.com) is only
+        used if the job description names no company or the same one.
 
         Args:
             job_url (str): The URL of the job posting.
-        Returns:"""
-        Oclient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        response = Oclient.chat.completions.create(
+
+        Returns:
+            str | None: The company name.
+        """
+        company_name = resolve_company_from_url(job_url, careers_sites=False)
+        if company_name:
+            return company_name
+
+        guess = resolve_company_from_url(job_url)
+        job_data = await self.search_job_description(job_url)
+        company_name = normalize_company_name(
+            ((job_data or {}).get("job_info") or {}).get("company")
+        )
+        if company_name:
+            if guess and same_company(guess, company_name):
+                return guess
+            return company_name
+        if guess:
+            return guess
+
+        return await self.extract_company_name(job_url)
+
+    @cached_stage(
+        "extract_company_name",
+        prompt_version="2",
+        model="gpt-4.1-nano",
+        key=normalize_url,
+    )
+    async def extract_company_name(self, job_url: str) -> str | None:
+        """
+        Guess the company name from a job URL with an LLM.
+
+        Args:
+            job_url (str): The URL of the job posting.
+        Returns:
+            str | None: The normalized company name."""
+        response = await self.clients.chat(
+            "extract_company_name",
             model="gpt-4.1-nano",
             messages=[
                 {
                     "role": "user",
-                    "content": f"Extract the company NAME from this job URL: {job_url}",
+                    "content": (
+                        f"Extract the company NAME from this job URL: {job_url}\n"
+                        "Reply with the name only."
+                    ),
                 }
             ],
             temperature=0,
         )
         company_name = response.choices[0].message.content  # type: ignore
-        return company_name  # type: ignore
+        return normalize_company_name(company_name)
 
-    def company_research(self, company_name: str):
+    @cached_stage(
+        "company_research",
+        prompt_version="2",
+        model="gpt-4.1",
+        key=normalize_text,
+    )
+    async def company_research(self, company_name: str):
         """
         Research a company using the Parallel API.
 
@@ -221,7 +384,8 @@ Scoring guidelines:
             dict: The researched company data.
         """
 
-        extract = self.client.beta.search(
+        extract = await self.clients.search(
+            "company_research",
             # Make the objective clear, contextual, and retrieval-focused
             objective=(
                 f"Collect reliable public-web content about {company_name} that is highly relevant for a software engineer preparing for an interview. "
@@ -239,9 +403,112 @@ Scoring guidelines:
             excerpts={"max_chars_per_result": 10000},
             mode="one-shot",  # using default retrieval mode as per best practice for single-step queries
         )
-        return self.structure_research(extract.results)
+        return await self.structure_research(extract.results)
+
+    async def company_data(self, company_name: str) -> dict | None:
+        """
+        Company research from the company index, without researching on the
+        request path (see CompanyIndex).
+
+        Args:
+            company_name (str): The name of the company.
 
-    def generate_fit_score(self, job_description: dict, user_data: dict) -> dict | None:
+        Returns:
+            dict: company_info with its staleness, or None if there is no
+            company index.
+
+        Raises:
+            ResearchPending: If the company has not been researched yet, so
+                the stage degrades and a later run doesn't reuse the miss.
+        """
+        if self.companies is None:
+            return None
+        company_info = await self.companies.lookup(company_name)
+        if company_info is None:
+            raise ResearchPending(f"{company_name} has not been researched yet")
+        return company_info
+
+    async def generate_fit_score(self, job_description: dict, user_data: dict) -> dict | None:
+        """
+        Score how well a resume fits a job, per category and overall.
+
+        The scores are computed locally by the FitScorer; the LLM only writes
+        the reasons, unless FIT_SCORING=llm leaves the whole score to it.
+
+        Args:
+            job_description (dict): The structured job data.
+            user_data (dict): The structured resume.
+
+        Returns:
+            dict: overall_fit_score and a score and reason per category.
+        """
+        if self.fit_scorer.mode == "llm":
+            return await self.llm_fit_score(job_description, user_data)
+        features = await self.resume_features(user_data)
+        # the NumPy scoring would hold up the event loop
+        assessment = await asyncio.to_thread(
+            self.fit_scorer.score, job_description, features
+        )
+        reasons = None
+        if self.fit_scorer.reasons == "llm":
+            try:
+                job_info = (job_description or {}).get("job_info") or {}
+                reasons = await self.fit_score_reasons(
+                    assessment, job_info.get("title")
+                )
+            except Exception:
+                # the scores stand on their own; fall back to the local reasons
+                self.fit_scorer.reason_failures += 1
+        return assessment.to_dict(reasons)
+
+    async def resume_features(self, user_data: dict) -> ResumeFeatures:
+        """
+        The ResumeFeatures of a structured resume, built in a worker thread
+        the first time this service scores it.
+
+        Args:
+            user_data (dict): The structured resume.
+
+        Returns:
+            ResumeFeatures: Its tokenized skills, bullets, roles and degrees.
+        """
+        key = hashlib.sha256(minify(user_data).encode()).hexdigest()
+        task = self._resume_features.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                asyncio.to_thread(ResumeFeatures.of, user_data)
+            )
+            self._resume_features[key] = task
+        # a posting cancelled by its deadline must not cancel the others'
+        return await asyncio.shield(task)
+
+    async def fit_score_reasons(self, assessment, title: str | None) -> dict:
+        """
+        Args:
+            assessment (FitAssessment): Locally computed scores and evidence.
+            title (str): Job title, for context.
+
+        Returns:
+            dict: One reason per category.
+        """
+        return await self.clients.chat_json(
+            "fit_score_reasons",
+            schemas.FitReasons,
+            model="gpt-4.1-nano",
+            messages=[
+                {
+                    "role": "user",
+                    "content": self.fit_score_reasons_prompt.format(
+                        title=title or "unknown",
+                        scores=minify(assessment.scores),
+                        evidence=minify(assessment.evidence),
+                    ),
+                }
+            ],
+            temperature=0,
+        )
+
+    async def llm_fit_score(self, job_description: dict, user_data: dict) -> dict | None:
         """
         Generate a fit score based on company research.
 
@@ -252,23 +519,25 @@ Scoring guidelines:
         Returns:
             int: The fit score.
         """
-        Oclient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        response = Oclient.chat.completions.create(
+        compacted = self.compactor.compact(
+            "generate_fit_score",
+            {"job_description": job_description, "user_data": user_data},
+            priorities={"job_description": 1, "user_data": 2},
+        )
+        return await self.clients.chat_json(
+            "generate_fit_score",
+            schemas.FitScore,
             model="gpt-4.1-nano",
             messages=[
                 {
                     "role": "user",
-                    "content": self.generate_fit_score_prompt.format(
-                        job_description=job_description,
-                        user_data=user_data,
-                    ),
+                    "content": self.generate_fit_score_prompt.format(**compacted),
                 }
             ],
             temperature=0,
         )
-        return json.loads(response.choices[0].message.content)  # type: ignore
 
-    def structure_job(
+    async def structure_job(
         self,
         raw_data: list,
     ) -> dict | None:
@@ -329,8 +598,9 @@ Scoring guidelines:
         {raw_data[0]}
         """
 
-        Oclient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        response = Oclient.chat.completions.create(
+        return await self.clients.chat_json(
+            "structure_job",
+            schemas.JobData,
             model="gpt-4.1-nano",
             messages=[
                 {
@@ -340,9 +610,8 @@ Scoring guidelines:
             ],
             temperature=0,
         )
-        return json.loads(response.choices[0].message.content)  # type: ignore
 
-    def structure_linkedin(self, raw_data: list) -> dict | None:
+    async def structure_linkedin(self, raw_data: list) -> dict | None:
         prompt = f""" Convert the following LinkedIn-style search output into a well-structured JSON object.
                 Do not add or hallucinate data. Only reorganize what is present.
 
@@ -378,17 +647,43 @@ Scoring guidelines:
                     "description": ""
                     }}
                 ],
-                "organizations": [],
-                "languages": [],
-                "projects": [],
-                "activity": []
+                "organizations": [
+                    {{
+                    "title": "",
+                    "membership_type": "",
+                    "start_date": "",
+                    "end_date": ""
+                    }}
+                ],
+                "languages": [
+                    {{
+                    "title": "",
+                    "subtitle": ""
+                    }}
+                ],
+                "projects": [
+                    {{
+                    "title": "",
+                    "description": ""
+                    }}
+                ],
+                "activity": [
+                    {{
+                    "interaction": "",
+                    "link": "",
+                    "title": "",
+                    "img": "",
+                    "id": ""
+                    }}
+                ]
                 }}
 
                 Raw content:
                 {raw_data[0]}
                     """
-        Oclient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        response = Oclient.chat.completions.create(
+        return await self.clients.chat_json(
+            "structure_linkedin",
+            schemas.ProfileData,
             model="gpt-4.1-nano",
             messages=[
                 {
@@ -398,9 +693,8 @@ Scoring guidelines:
             ],
             temperature=0,
         )
-        return json.loads(response.choices[0].message.content)  # type: ignore
 
-    def structure_research(self, raw_data: list) -> dict | None:
+    async def structure_research(self, raw_data: list) -> dict | None:
         flattened = "\n\n".join("\n".join(item.excerpts or []) for item in raw_data)
         prompt = f""" Convert the following company research search output into a well-structured JSON object.
                 IF you do not find relevant information for a field, fill it in with data you find from your own knowledge base.
@@ -423,32 +717,30 @@ Scoring guidelines:
                 Raw content:
                 {flattened[:8000]}
                     """
-        Oclient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        response = Oclient.chat.completions.create(
-            model="gpt-4.1",
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt,
-                }
-            ],
-            temperature=0,
-        )
-        raw = response.choices[0].message.content
-
-        if not raw or raw.strip() == "":
-            print("Empty response from LLM:")
-            print(response)
-            return None
-
         try:
-            return json.loads(raw)
-        except json.JSONDecodeError:
-            print("Invalid JSON output:")
-            print(raw)
+            return await self.clients.chat_json(
+                "structure_research",
+                schemas.CompanyData,
+                model="gpt-4.1",
+                messages=[
+                    {
+                        "role": "user",
+                        "content": prompt,
+                    }
+                ],
+                temperature=0,
+            )
+        except StructuredOutputError:
+            # already counted and traced by chat_json
             return None
 
-    def find_references(self, company_name: str) -> list:
+    @cached_stage(
+        "find_references",
+        prompt_version="2",
+        model="gpt-4.1-nano",
+        key=normalize_text,
+    )
+    async def find_references(self, company_name: str) -> list:
         """
         Find references for a company using the Parallel API.
 
@@ -459,7 +751,8 @@ Scoring guidelines:
             dict: The references data.
         """
 
-        extract = self.client.beta.search(
+        extract = await self.clients.search(
+            "find_references",
             search_queries=[
                 f"find all user profiles that have worked at {company_name} and hold or held in the past the position described in the following job description: software engineer intern.",
             ],
@@ -467,11 +760,10 @@ Scoring guidelines:
             max_chars_per_result=10000,
             objective="Find user profiles that have worked at the specified company and held the position described in the job description. Provide name and linkedIn profile URL for each user.",
         )
-        # print(extract.results)
-        final = self.structure_references(extract.results)
+        final = await self.structure_references(extract.results)
         return final  # type: ignore
 
-    def structure_references(self, raw_data: list) -> dict | None:
+    async def structure_references(self, raw_data: list) -> dict | None:
         # func here to turn raw_data into string
         flattened = "\n\n".join("\n".join(item.excerpts or []) for item in raw_data)
         prompt = f""" Convert the following references search output into a well-structured JSON object.
@@ -496,8 +788,9 @@ Scoring guidelines:
                 Raw content:
                 {flattened}
                     """
-        Oclient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        response = Oclient.chat.completions.create(
+        return await self.clients.chat_json(
+            "structure_references",
+            schemas.References,
             model="gpt-4.1-nano",
             messages=[
                 {
@@ -507,9 +800,8 @@ Scoring guidelines:
             ],
             temperature=0,
         )
-        return json.loads(response.choices[0].message.content)  # type: ignore
 
-    def get_leetcode(self, company_data: dict, company_name: str) -> dict:
+    async def get_leetcode(self, company_data: dict, company_name: str) -> list:
         topics = company_data.get("leetcode_topics", [])
         prompt = f"""search the best 3 leetcode problems that are frequently asked by {
             company_name
@@ -523,12 +815,14 @@ Scoring guidelines:
         """
         prompt += """Return ONLY valid JSON.
         Format:
-        [
         {
+        "problems": [
+            {
             "problem_name": "",
             "url": ""
-        }
+            }
         ]
+        }
         """
 
         """
@@ -540,8 +834,9 @@ Scoring guidelines:
         Returns:
             dict: The LeetCode problems data.
         """
-        Oclient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        response = Oclient.chat.completions.create(
+        leetcode = await self.clients.chat_json(
+            "get_leetcode",
+            schemas.LeetcodeProblems,
             model="gpt-4.1-nano",
             messages=[
                 {
@@ -551,49 +846,169 @@ Scoring guidelines:
             ],
             temperature=0,
         )
+        return leetcode["problems"]  # type: ignore
 
-        return json.loads(response.choices[0].message.content)  # type: ignore
-
-    def create_interview_questions(
+    async def create_interview_questions(
         self, job_data: dict, user_data: dict
     ) -> dict | None:
         """):
         Create practice questions based on job and user data.
         """
-        Oclient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        response = Oclient.chat.completions.create(
+        compacted = self.compactor.compact(
+            "create_interview_questions",
+            {"job_data": job_data, "user_data": user_data},
+            priorities={"job_data": 1, "user_data": 2},
+        )
+        return await self.clients.chat_json(
+            "create_interview_questions",
+            schemas.InterviewQuestions,
             model="gpt-4.1-nano",
             messages=[
                 {
                     "role": "user",
-                    "content": f"Create 5 practice interview questions based on the following job description and users resume. Ask something an interviewer would ask from that company for a Intern Level Software Engineer. Provide questions in JSON format. Job Description: {job_data} User Data: {user_data}",
+                    "content": f"Create 5 practice interview questions based on the following job description and users resume. Ask something an interviewer would ask from that company for a Intern Level Software Engineer. Provide questions in JSON format. Job Description: {compacted['job_data']} User Data: {compacted['user_data']}",
                 }
             ],
             temperature=0,
         )
-        return json.loads(response.choices[0].message.content)  # type: ignore
 
-    def interview_dialogue(self, question: str, answer: str) -> dict | None:
+    @staticmethod
+    def interview_messages(question: str, answer: str) -> list:
+        return [
+            {
+                "role": "user",
+                "content": f"Given the interview question: {question} and the user's answer: {answer}, Generate feedback on the answer, including strengths and areas for improvement.",
+            }
+        ]
+
+    async def interview_dialogue(self, question: str, answer: str) -> dict | None:
         """
         Generate interview dialogue based on a question and answer.
         """
-        Oclient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        response = Oclient.chat.completions.create(
+        response = await self.clients.chat(
+            "interview_dialogue",
+            model="gpt-4.1-nano",
+            messages=self.interview_messages(question, answer),
+            temperature=0,
+        )
+        return response.choices[0].message.content  # type: ignore
+
+    def interview_dialogue_stream(self, question: str, answer: str):
+        """
+        interview_dialogue, streamed: an async iterator over the feedback's
+        text deltas as the model writes them.
+        """
+        return self.clients.chat_stream(
+            "interview_dialogue",
+            model="gpt-4.1-nano",
+            messages=self.interview_messages(question, answer),
+            temperature=0,
+        )
+
+    def interview_session_context(
+        self, job_data: dict | None, user_data: dict | None, questions: list
+    ) -> str:
+        """
+        The fixed system prompt of an interview session: instructions, then
+        the job, resume and question list, compacted once. It is the same on
+        every turn, so it stays a cacheable prompt prefix.
+        """
+        compacted = self.compactor.compact(
+            "interview_session",
+            {"job_data": job_data, "user_data": user_data},
+            priorities={"job_data": 2, "user_data": 1},
+        )
+        numbered = "\n".join(f"{i}. {q}" for i, q in enumerate(questions, 1))
+        return f"""You are the interviewer in a mock interview for an Intern Level Software Engineer role.
+After each answer, give feedback on it, including strengths and areas for improvement.
+Build on the candidate's earlier answers where relevant: point out progress or
+repeated weaknesses. Keep the feedback short enough to be read aloud.
+
+Job Description: {compacted['job_data']}
+Candidate Resume: {compacted['user_data']}
+Interview Questions:
+{numbered}
+"""
+
+    @staticmethod
+    def interview_session_messages(
+        session: InterviewSession, question: str, answer: str
+    ) -> list:
+        """
+        Stable prefix first (context, then the summary, which only changes
+        every few turns), then the recent turns verbatim, then this answer.
+        """
+        messages = [{"role": "system", "content": session.context}]
+        if session.summary:
+            messages.append(
+                {
+                    "role": "system",
+                    "content": f"Summary of the interview so far: {session.summary}",
+                }
+            )
+        for turn in session.turns:
+            messages += [
+                {
+                    "role": "user",
+                    "content": f"Question: {turn.question}\nAnswer: {turn.answer}",
+                },
+                {"role": "assistant", "content": turn.feedback},
+            ]
+        messages.append(
+            {"role": "user", "content": f"Question: {question}\nAnswer: {answer}"}
+        )
+        return messages
+
+    async def interview_session_turn(
+        self, session: InterviewSession, question: str, answer: str
+    ):
+        """
+        Feedback on one answer within a session.
+
+        Returns:
+            ChatCompletion: The completion, for its text and usage.
+        """
+        return await self.clients.chat(
+            "interview_session_turn",
+            model="gpt-4.1-nano",
+            messages=self.interview_session_messages(session, question, answer),
+            temperature=0,
+        )
+
+    async def summarize_interview(self, summary: str, turns: List[Turn]) -> str:
+        """Fold `turns` into the session's running summary."""
+        transcript = "\n\n".join(
+            f"Question: {t.question}\nAnswer: {t.answer}\nFeedback: {t.feedback}"
+            for t in turns
+        )
+        response = await self.clients.chat(
+            "summarize_interview",
             model="gpt-4.1-nano",
             messages=[
                 {
                     "role": "user",
-                    "content": f"Given the interview question: {question} and the user's answer: {answer}, Generate feedback on the answer, including strengths and areas for improvement.",
+                    "content": f"""Update the running summary of a mock interview with the new turns below.
+Keep it under 120 words: the topics covered, the candidate's strengths and
+their recurring weaknesses. Return only the summary.
+
+Current summary: {summary or "(none yet)"}
+
+New turns:
+{transcript}""",
                 }
             ],
             temperature=0,
+            max_tokens=250,
         )
-        return response.choices[0].message.content  # type: ignore
+        return response.choices[0].message.content or summary
 
-    def cheat_sheet(self, data: dict) -> dict | None:
+    async def cheat_sheet(self, data: dict) -> dict | None:
         """
         Create a cheat sheet based on job and user data.
         """
+        payload = self.compactor.compact_object(
+            "cheat_sheet", data, priorities=self.cheat_sheet_priorities
+        )
         prompt = f"""You are an expert interview-analysis engine. 
 
 Given a deeply structured JSON payload describing:
@@ -670,7 +1085,7 @@ HOW TO GENERATE THESE FIELDS:
    Should be 3–5 bullets.
 
 3. **recentNews**
-    derive from job context.
+    From company_data.recent_news when present, otherwise derive from job context.
 
 4. **peopleExperience**
    Use:
@@ -697,14 +1112,15 @@ HOW TO GENERATE THESE FIELDS:
 
 Now generate the JSON output using the following data:
 
-{data}
+{payload}
 
 ------------------------------------------
 REMINDER:
 Only return valid JSON. No commentary, no markdown, no explanations.
         """
-        Oclient = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        response = Oclient.chat.completions.create(
+        return await self.clients.chat_json(
+            "cheat_sheet",
+            schemas.CheatSheet,
             model="gpt-4.1-nano",
             messages=[
                 {
@@ -714,40 +1130,66 @@ Only return valid JSON. No commentary, no markdown, no explanations.
             ],
             temperature=0,
         )
-        return json.loads(response.choices[0].message.content)  # type: ignore
 
+    async def cheat_sheet_section(self, section: str, data: dict) -> dict | None:
+        """
+        Write one section of the cheat sheet (see cheat_sheet_sections).
 
-def run_all():
-    ps = ParallelService()  # type: ignore
-    url = "https://careers.salesforce.com/en/jobs/jr308796/summer-2026-intern-software-engineer/"
-    company_name = ps.extract_company_name(url)
-    job_data = ps.search_job_description(url)
+        Args:
+            section (str): Section name, e.g. "company" or "fit_summary".
+            data (dict): The pipeline results that section is written from.
+        Returns:
+            dict: The section's cheat sheet fields.
+        """
+        schema, instructions = self.cheat_sheet_sections[section]
+        payload = self.compactor.compact_object(
+            "cheat_sheet", data, priorities=self.cheat_sheet_priorities
+        )
+        prompt = f"""You are an expert interview-analysis engine. 
 
-    profile_data = ps.scrape_linkedin_profile(
-        "https://www.linkedin.com/in/dariel-gutierrez/"
-    )
+From the JSON payload below, write part of an interview-preparation cheat
+sheet. Return a SINGLE JSON object with only these fields:
 
-    with ThreadPoolExecutor() as executor:
-        # Run all 3 functions at the same time
-        future_company_data = executor.submit(ps.company_research, company_name)
+{instructions}
 
-        future_fit_score = executor.submit(
-            ps.generate_fit_score,
-            job_data,
-            profile_data,  # type: ignore
-        )  # type: ignore
-        future_references = executor.submit(ps.find_references, company_name)
+Summaries must be short, actionable, and conversationally useful.
+Only return valid pure JSON. No HTML, no markdown, no commentary.
 
-        company_data = future_company_data.result()
+Data:
 
-        leetcode_problems = executor.submit(ps.get_leetcode, company_data)  # type: ignore
-        # Wait for each to finish and get results
+{payload}
+"""
+        return await self.clients.chat_json(
+            f"cheat_sheet_{section}",
+            schema,
+            model="gpt-4.1-nano",
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt,
+                }
+            ],
+            temperature=0,
+        )
+
+
+async def run_all():
+    ps = ParallelService()  # type: ignore
+    url = "https://careers.salesforce.com/en/jobs/jr308796/summer-2026-intern-software-engineer/"
+    company_name, job_data, profile_data = await asyncio.gather(
+        ps.resolve_company_name(url),
+        ps.search_job_description(url),
+        ps.scrape_linkedin_profile("https://www.linkedin.com/in/dariel-gutierrez/"),
+    )
 
-        fit_score = future_fit_score.result()
-        references = future_references.result()
-        leetcode_problems = leetcode_problems.result()
+    # Run all 3 functions at the same time
+    company_data, fit_score, references = await asyncio.gather(
+        ps.company_research(company_name),
+        ps.generate_fit_score(job_data, profile_data),  # type: ignore
+        ps.find_references(company_name),
+    )
+    leetcode_problems = await ps.get_leetcode(company_data, company_name)  # type: ignore
 
-    # references = ps.find_references(company_name)
     run_output = {
         "company_name": company_name,
         "job_data": job_data,
@@ -758,28 +1200,28 @@ def run_all():
         "leetcode_problems": leetcode_problems,
     }
 
-    save_run(run_output)
+    save_run(run_output, {"job_url": url})
 
 
-def test_run_all():
+async def test_run_all():
     ps = ParallelService()  # type: ignore
     url = "https://careers.salesforce.com/en/jobs/jr308796/summer-2026-intern-software-engineer/"
-    company_name = ps.extract_company_name(url)
-    job_data = ps.search_job_description(url)
+    company_name = await ps.resolve_company_name(url)
+    job_data = await ps.search_job_description(url)
 
-    profile_data = ps.scrape_linkedin_profile(
+    profile_data = await ps.scrape_linkedin_profile(
         "https://www.linkedin.com/in/dariel-gutierrez/"
     )
 
-    company_data = ps.company_research(company_name)
+    company_data = await ps.company_research(company_name)
 
-    fit_score = ps.generate_fit_score(
+    fit_score = await ps.generate_fit_score(
         job_data,
         profile_data,  # type: ignore
     )  # type: ignore
 
-    references = ps.find_references(company_name)
-    cheat_sheet = ps.cheat_sheet(
+    references = await ps.find_references(company_name)
+    cheat_sheet = await ps.cheat_sheet(
         {
             "company_name": company_name,
             "job_data": job_data,
@@ -788,8 +1230,8 @@ def test_run_all():
             "references": references,
         }
     )
-    interview_questions = ps.create_interview_questions(job_data, profile_data)  # type: ignore
-    leetcode_problems = ps.get_leetcode(company_data, company_name)  # type: ignore
+    interview_questions = await ps.create_interview_questions(job_data, profile_data)  # type: ignore
+    leetcode_problems = await ps.get_leetcode(company_data, company_name)  # type: ignore
 
     run_output = {
         "company_name": company_name,
@@ -803,27 +1245,24 @@ def test_run_all():
         "questions": interview_questions,
     }
 
-    save_run(run_output, filename="test_runs.json")
-
-
-def save_run(run_output, filename="runs.json"):
-    # Load existing file or start fresh
-    if os.path.exists(filename):
-        with open(filename, "r") as f:
-            try:
-                data = json.load(f)
-            except json.JSONDecodeError:
-                data = []
-    else:
-        data = []
+    save_run(run_output, {"job_url": url}, path="test_runs.sqlite3")
 
-    # append new run
-    data.append(run_output)
 
-    # write back out
-    with open(filename, "w") as f:
-        json.dump(data, f, indent=4)
+def save_run(run_output, inputs=None, path="runs.sqlite3"):
+    """
+    Append a run to the SQLite run store at `path` (the store the server
+    records to with RUN_RECORDS_BACKEND=sqlite), readable via /runs and as
+    bench fixtures.
+    """
+    company = run_output.get("company_name")
+    SQLiteRunBackend(path).save(
+        RunRecord(
+            outputs=run_output,
+            inputs=inputs or {},
+            company=normalize_text(company) if company else None,
+        )
+    )
 
 
 if __name__ == "__main__":
-    test_run_all()
+    asyncio.run(test_run_all())
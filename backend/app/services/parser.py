@@ -1,54 +1,172 @@
-import json
+import asyncio
+import hashlib
 import os
-from typing import List
+import tempfile
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Tuple
 
-import fitz  # PyMuPDF
+from app.services import schemas
+from app.services.clients import ClientRegistry
+from app.services.metrics import trace_event
+from app.services.pdf_pages import Line, Page, count_pages, extract_pages
+from app.services.resume_extractor import ResumeExtractor
 from dotenv import load_dotenv
-from openai import OpenAI
+from fastapi import UploadFile
 
 load_dotenv()
 
+SPOOL_CHUNK = 1 << 20  # bytes read from the upload at a time
+
+# Bump when the structuring prompt or local extractor rules change, so stored
+# structured resumes are recomputed
+STRUCTURE_VERSION = "3"
+STRUCTURE_MODEL = "gpt-4"
+
+
+class PDFTooLarge(ValueError):
+    pass
+
+
+@dataclass
+class PDFLimits:
+    max_bytes: int = 10 * 2**20
+    max_pages: int = 40
+    # documents with at least this many pages are extracted in worker processes
+    parallel_pages: int = 12
+    pages_per_task: int = 4
+    workers: int = min(4, os.cpu_count() or 1)
+
+    @classmethod
+    def from_env(cls) -> "PDFLimits":
+        return cls(
+            max_bytes=int(os.getenv("PDF_MAX_BYTES", str(cls.max_bytes))),
+            max_pages=int(os.getenv("PDF_MAX_PAGES", str(cls.max_pages))),
+            parallel_pages=int(
+                os.getenv("PDF_PARALLEL_PAGES", str(cls.parallel_pages))
+            ),
+            pages_per_task=int(
+                os.getenv("PDF_PAGES_PER_TASK", str(cls.pages_per_task))
+            ),
+            workers=int(os.getenv("PDF_WORKERS", str(cls.workers))),
+        )
+
 
 class PDFParser:
-    def __init__(self):
-        # self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        pass
+    def __init__(
+        self,
+        clients: ClientRegistry | None = None,
+        limits: PDFLimits | None = None,
+        pool: Executor | None = None,
+        extractor: ResumeExtractor | None = None,
+    ):
+        self.clients = clients
+        self.limits = limits or PDFLimits()
+        self.pool = pool
+        self.extractor = extractor
 
-    def parse_bytes(self, pdf_bytes: bytes) -> List[str]:
+    async def spool(self, file: UploadFile) -> Tuple[str, str]:
         """
-        Parse a PDF provided as raw bytes and return a list of page texts.
+        Copy an upload to a temporary file in fixed-size chunks, so the
+        whole PDF is never held in memory, hashing it on the way.
 
         Args:
-            pdf_bytes (bytes): The PDF file contents.
+            file (UploadFile): The uploaded PDF.
 
         Returns:
-            List[str]: A list with the extracted text from each page.
+            Tuple[str, str]: Path of the temporary file (the caller removes
+            it) and the SHA-256 hex digest of the PDF bytes.
+
+        Raises:
+            PDFTooLarge: As soon as the upload exceeds `max_bytes`.
         """
-        if not pdf_bytes:
+        if file.size is not None and file.size > self.limits.max_bytes:
+            raise PDFTooLarge(f"PDF is larger than {self.limits.max_bytes} bytes")
+
+        fd, path = tempfile.mkstemp(suffix=".pdf")
+        size = 0
+        digest = hashlib.sha256()
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while chunk := await file.read(SPOOL_CHUNK):
+                    size += len(chunk)
+                    if size > self.limits.max_bytes:
+                        raise PDFTooLarge(
+                            f"PDF is larger than {self.limits.max_bytes} bytes"
+                        )
+                    digest.update(chunk)
+                    await asyncio.to_thread(out.write, chunk)
+        except BaseException:
+            os.unlink(path)
+            raise
+        if not size:
+            os.unlink(path)
             raise ValueError("Empty PDF bytes provided")
+        return path, digest.hexdigest()
 
-        text_pages = []
-        # PyMuPDF can open from a byte stream using the `stream` parameter
-        # and specifying the filetype 'pdf' implicitly.
-        with fitz.open(stream=pdf_bytes, filetype="pdf") as pdf_document:
-            for page_num in range(len(pdf_document)):
-                page = pdf_document.load_page(page_num)
-                text = page.get_text()
-                text_pages.append(text)
+    async def aiter_pages(self, path: str) -> AsyncIterator[Page]:
+        """
+        Yield the text and layout lines of each page of the PDF at `path`, in order.
 
-        return text_pages
+        Small documents are read page range by page range in a thread; large
+        ones are split into `pages_per_task` slices extracted concurrently in
+        the process pool, and pages are yielded as soon as their slice and
+        every slice before it are done.
 
-    def structure_output(self, resume_text: List[str]) -> List[dict] | None:
+        Raises:
+            PDFTooLarge: If the document has more than `max_pages` pages.
+        """
+        pages = await asyncio.to_thread(count_pages, path)
+        if pages > self.limits.max_pages:
+            raise PDFTooLarge(f"PDF has more than {self.limits.max_pages} pages")
+
+        step = self.limits.pages_per_task
+        ranges = [(start, min(start + step, pages)) for start in range(0, pages, step)]
+
+        if self.pool is None or pages < self.limits.parallel_pages:
+            for start, stop in ranges:
+                for page in await asyncio.to_thread(extract_pages, path, start, stop):
+                    yield page
+            return
+
+        loop = asyncio.get_running_loop()
+        tasks = [
+            loop.run_in_executor(self.pool, extract_pages, path, start, stop)
+            for start, stop in ranges
+        ]
+        try:
+            for task in tasks:
+                for page in await task:
+                    yield page
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def structure_output(
+        self, resume_text: List[str], resume_lines: List[Line] | None = None
+    ) -> List[dict] | None:
         """
         Structure the extracted page texts into a list of dictionaries.
 
+        When layout lines are available the local extractor is tried first;
+        the LLM is only called if its confidence is below the threshold.
+
         Args:
             resume_text (List[str]): List of texts extracted from each page.
+            resume_lines (List[Line]): Layout lines of every page, if known.
 
         Returns:
             List[dict]: A list of dictionaries with page number and text.
         """
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        if self.extractor is not None and resume_lines:
+            data, confidence = self.extractor.extract(resume_lines)
+            local = confidence >= self.extractor.min_confidence
+            self.extractor.record("local" if local else "llm", confidence)
+            trace_event(stage="structure_output", local=local, confidence=confidence)
+            if local:
+                return data
+
+        clients = self.clients or ClientRegistry.from_env()
 
         prompt = f"""
         Extract structured data from the following resume.
@@ -64,9 +182,10 @@ class PDFParser:
         Resume text:
 {resume_text}
 """
-        response = client.chat.completions.create(
-            model="gpt-4",
+        return await clients.chat_json(
+            "structure_output",
+            schemas.ResumeData,
+            model=STRUCTURE_MODEL,
             messages=[{"role": "user", "content": prompt}],
             temperature=0,
         )
-        return json.loads(response.choices[0].message.content)  # type: ignore
@@ -0,0 +1,79 @@
+"""
+Page extraction run inside the PDF worker processes.
+
+Kept free of app imports so a freshly spawned worker only has to load
+PyMuPDF, not the OpenAI / FastAPI stack.
+"""
+
+import re
+from typing import List, NamedTuple
+
+import fitz  # PyMuPDF
+
+BOLD_FLAG = 16  # PyMuPDF span flag bit for bold text
+GAP_RE = re.compile(r"\s{2,}")
+
+
+class Line(NamedTuple):
+    text: str
+    size: float  # largest font size on the line
+    bold: bool  # every span on the line is bold
+
+
+class Page(NamedTuple):
+    text: str
+    lines: List[Line]
+
+
+def count_pages(path: str) -> int:
+    with fitz.open(path) as pdf_document:
+        return len(pdf_document)
+
+
+def _line_text(spans: List[dict]) -> str:
+    """
+    Join a line's spans, keeping wide gaps (tab stops, right-aligned dates)
+    as a three-space run so they can still be told apart from word spacing.
+    """
+    text = spans[0]["text"]
+    for prev, span in zip(spans, spans[1:]):
+        gap = span["bbox"][0] - prev["bbox"][2]
+        text += ("   " if gap > span["size"] else "") + span["text"]
+    return GAP_RE.sub("   ", text.replace("\t", "   ")).strip()
+
+
+def page_lines(page: fitz.Page) -> List[Line]:
+    """Visual lines of a page with the font info used to spot headings."""
+    lines = []
+    for block in page.get_text("dict")["blocks"]:
+        for line in block.get("lines", []):
+            spans = [span for span in line["spans"] if span["text"].strip()]
+            if not spans:
+                continue
+            lines.append(
+                Line(
+                    text=_line_text(spans),
+                    size=round(max(s["size"] for s in spans), 1),
+                    bold=all(
+                        s["flags"] & BOLD_FLAG or "bold" in s["font"].lower()
+                        for s in spans
+                    ),
+                )
+            )
+    return lines
+
+
+def extract_pages(path: str, start: int, stop: int) -> List[Page]:
+    """
+    Extract the text and layout lines of pages [start, stop) of the PDF at
+    `path`.
+
+    PyMuPDF only reads the pages it loads, so each task touches just its
+    own slice of the file.
+    """
+    with fitz.open(path) as pdf_document:
+        pages = []
+        for i in range(start, stop):
+            page = pdf_document.load_page(i)
+            pages.append(Page(page.get_text(), page_lines(page)))
+        return pages
@@ -0,0 +1,358 @@
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict
+
+from app.services import schemas
+from app.services.cache import normalize_text
+from app.services.metrics import Metrics
+from app.services.parallel_service import ParallelService
+from app.services.parser import PDFParser
+from app.services.ratelimit import current_tenant
+from app.services.resumes import ResumeStore
+from app.services.runs import RunRecord, RunRecordStore
+from app.services.scheduler import Stage, StageGraph, StageResult
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Graph inputs supplied by the caller of StageGraph.run
+PIPELINE_INPUTS = ("job_url", "linkedin", "resume_id")
+
+# Stages whose results are returned to the client, in response order
+RESULT_KEYS = (
+    "company_name",
+    "job_data",
+    "profile_data",
+    "fit_score",
+    "references",
+    "company_data",
+    "questions",
+    "cheat_sheet",
+)
+
+# Split cheat sheet (CHEAT_SHEET_SPLIT): section -> the results it is written
+# from. Each section stage starts as soon as its own inputs are ready.
+CHEAT_SHEET_SECTIONS = {
+    "company": ("company_name", "company_data", "job_data"),
+    "fit_summary": ("fit_score",),
+    "speak_points": ("job_data", "profile_data", "fit_score"),
+    "interviewer": ("profile_data",),
+    "people": ("company_name", "references"),
+}
+
+
+@dataclass
+class PipelineLimits:
+    """
+    Time budget of one pipeline run.
+
+    Args:
+        deadline (float): Seconds the whole run may take; None for no limit.
+        timeouts (dict): Stage name -> seconds that stage may run once its
+            inputs are ready. Optional stages get a default so a slow search
+            leaves the rest of the deadline to the cheat sheet.
+        split_cheat_sheet (bool): Write the cheat sheet as concurrent section
+            calls that start as their inputs land, instead of one call once
+            every other stage is done.
+    """
+
+    deadline: float | None = 90.0
+    timeouts: Dict[str, float] = field(
+        default_factory=lambda: {"profile_data": 30.0, "references": 30.0}
+    )
+    split_cheat_sheet: bool = False
+
+    @classmethod
+    def from_env(cls) -> "PipelineLimits":
+        """
+        Reads PIPELINE_DEADLINE_S and STAGE_TIMEOUT_<STAGE> variables (`0`
+        disables a limit) and CHEAT_SHEET_SPLIT.
+        """
+        limits = cls()
+        deadline = float(os.getenv("PIPELINE_DEADLINE_S", str(limits.deadline)))
+        limits.deadline = deadline if deadline > 0 else None
+        limits.split_cheat_sheet = os.getenv("CHEAT_SHEET_SPLIT", "0") == "1"
+        sections = tuple(f"cheat_sheet_{name}" for name in CHEAT_SHEET_SECTIONS)
+        for stage in ("user_data",) + RESULT_KEYS + sections:
+            value = os.getenv(f"STAGE_TIMEOUT_{stage.upper()}")
+            if value is not None and float(value) > 0:
+                limits.timeouts[stage] = float(value)
+            elif value is not None:
+                limits.timeouts.pop(stage, None)
+        return limits
+
+
+def build_pipeline(
+    parallel: ParallelService,
+    parser: PDFParser,
+    resumes: ResumeStore,
+    limits: PipelineLimits | None = None,
+) -> StageGraph:
+    """
+    Build the /pipeline dependency graph.
+
+    company name -> references / company data, job data + resume -> fit score
+    / questions, everything -> cheat sheet. The interviewer profile and resume structuring
+    depend only on the request inputs, so they start immediately. The company
+    name usually comes straight from the job URL; otherwise it shares the job
+    data stage's extraction call rather than making its own. The interviewer
+    profile and references are optional: if they fail or time out the cheat
+    sheet is built without them. Company data is served from the company
+    index and never researched on the request path, so it is instant (or
+    None for a company that has not been indexed yet).
+
+    With `limits.split_cheat_sheet` the cheat sheet is instead merged from
+    optional section stages (CHEAT_SHEET_SECTIONS), so e.g. the company
+    must-knows are written while the fit score is still running, and a
+    section that fails or misses the deadline just comes back empty.
+
+    Args:
+        parallel (ParallelService): Service used for the search and LLM stages.
+        parser (PDFParser): Parser used to structure the resume text.
+        resumes (ResumeStore): Store the `resume_id` input is looked up in.
+        limits (PipelineLimits): Per-stage timeouts and the cheat sheet mode.
+
+    Returns:
+        StageGraph: The graph, ready to run with PIPELINE_INPUTS.
+    """
+    timeouts = limits.timeouts if limits is not None else {}
+    split = limits is not None and limits.split_cheat_sheet
+
+    async def user_data(resume_id):
+        # stored per PDF content hash, so repeat uploads skip structuring
+        return await resumes.structured(resume_id, parser)
+
+    async def cheat_sheet(
+        company_name,
+        company_data,
+        job_data,
+        profile_data,
+        fit_score,
+        references,
+        questions,
+    ):
+        temp_data = {
+            "company_name": company_name,
+            "company_data": company_data,
+            "job_data": job_data,
+            "profile_data": profile_data,
+            "fit_score": fit_score,
+            "references": references,
+            "questions": questions,
+        }
+        return await parallel.cheat_sheet(temp_data)
+
+    def section_stage(section: str, deps: tuple) -> Stage:
+        async def write(*args):
+            return await parallel.cheat_sheet_section(section, dict(zip(deps, args)))
+
+        return Stage(f"cheat_sheet_{section}", write, deps, version="1", critical=False)
+
+    async def merge_cheat_sheet(*sections):
+        merged = {}
+        for fields in sections:
+            merged.update(fields or {})
+        return schemas.CheatSheet.model_validate(merged).model_dump()
+
+    if split:
+        cheat_sheet_stages = [
+            section_stage(section, deps)
+            for section, deps in CHEAT_SHEET_SECTIONS.items()
+        ] + [
+            Stage(
+                "cheat_sheet",
+                merge_cheat_sheet,
+                tuple(f"cheat_sheet_{section}" for section in CHEAT_SHEET_SECTIONS),
+                version="1",
+            )
+        ]
+    else:
+        cheat_sheet_stages = [
+            Stage(
+                "cheat_sheet",
+                cheat_sheet,
+                (
+                    "company_name",
+                    "company_data",
+                    "job_data",
+                    "profile_data",
+                    "fit_score",
+                    "references",
+                    "questions",
+                ),
+                version="4",
+            )
+        ]
+
+    graph = StageGraph(
+        [
+            Stage("user_data", user_data, ("resume_id",), version="4"),
+            Stage(
+                "company_name", parallel.resolve_company_name, ("job_url",), version="2"
+            ),
+            Stage(
+                "job_data", parallel.search_job_description, ("job_url",), version="2"
+            ),
+            Stage(
+                "profile_data",
+                parallel.scrape_linkedin_profile,
+                ("linkedin",),
+                version="2",
+                critical=False,
+            ),
+            Stage(
+                "references",
+                parallel.find_references,
+                ("company_name",),
+                version="2",
+                critical=False,
+            ),
+            Stage(
+                "company_data",
+                parallel.company_data,
+                ("company_name",),
+                version="1",
+                critical=False,
+            ),
+            Stage(
+                "fit_score",
+                parallel.generate_fit_score,
+                ("job_data", "user_data"),
+                version="3",
+            ),
+            Stage(
+                "questions",
+                parallel.create_interview_questions,
+                ("job_data", "user_data"),
+                version="3",
+            ),
+            *cheat_sheet_stages,
+        ]
+    )
+    for stage in graph.stages.values():
+        stage.timeout = timeouts.get(stage.name)
+    return graph
+
+
+class PipelineRun:
+    """
+    One execution of the pipeline graph, reusing every stage of a previous run
+    whose input fingerprint is unchanged (e.g. a new resume against the same
+    job re-runs user_data, fit_score, questions and cheat_sheet only).
+
+    Args:
+        graph (StageGraph): The pipeline graph.
+        inputs (dict): The graph's root inputs.
+        runs (RunRecordStore): Where finished runs are recorded.
+        previous_run_id (str): Run to reuse unchanged stages from, if any.
+        metrics (Metrics): Receives per-stage duration histograms.
+        deadline (float): Seconds the run may take once it starts, if bounded.
+    """
+
+    def __init__(
+        self,
+        graph: StageGraph,
+        inputs: Dict[str, Any],
+        runs: RunRecordStore,
+        previous_run_id: str | None = None,
+        metrics: Metrics | None = None,
+        deadline: float | None = None,
+    ):
+        self.graph = graph
+        self.inputs = inputs
+        self.runs = runs
+        self.previous_run_id = previous_run_id
+        self.metrics = metrics
+        self.deadline = deadline
+        self.record = RunRecord(
+            fingerprints=graph.fingerprints(inputs), inputs=dict(inputs)
+        )
+        self.reuse: Dict[str, Any] = {}
+        # optional stage name -> why it came back empty
+        self.errors: Dict[str, str] = {}
+        # stage name -> seconds, from this run's own results (a batch shares
+        # one graph between concurrent runs)
+        self.durations: Dict[str, float] = {}
+        self.started: float | None = None
+
+    @property
+    def run_id(self) -> str:
+        return self.record.run_id
+
+    async def _load_previous(self):
+        if not self.previous_run_id:
+            return
+        previous = await self.runs.get(self.previous_run_id)
+        if previous is not None:
+            self.reuse = {
+                name: previous.outputs[name]
+                for name, fingerprint in self.record.fingerprints.items()
+                if previous.fingerprints.get(name) == fingerprint
+                and name in previous.outputs
+            }
+
+    async def stream(self) -> AsyncIterator[StageResult]:
+        # upstream calls queue fairly per run (see AdaptiveLimiter)
+        current_tenant.set(self.run_id)
+        self.started = time.perf_counter()
+        await self._load_previous()
+        async for finished in self.graph.stream(self.inputs, self.reuse, self.deadline):
+            self.durations[finished.name] = finished.duration
+            if finished.error is not None:
+                self.errors[finished.name] = finished.error
+            if self.metrics is not None and not finished.reused:
+                self.metrics.observe(
+                    "hireme_stage_seconds",
+                    finished.duration,
+                    "Pipeline stage duration once its inputs were ready",
+                    stage=finished.name,
+                )
+                if finished.error is not None:
+                    self.metrics.inc(
+                        "hireme_stage_degraded_total",
+                        help="Optional stages that failed or timed out",
+                        stage=finished.name,
+                    )
+            yield finished
+
+    async def run(self) -> Dict[str, Any]:
+        results = {}
+        async for finished in self.stream():
+            results[finished.name] = finished.result
+        return await self.finish(results)
+
+    def timings(self) -> Dict[str, Any]:
+        """Per-stage durations in ms, for the opt-in timing breakdown."""
+        return {name: round(seconds * 1000) for name, seconds in self.durations.items()}
+
+    async def finish(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Record the finished run and build the client response.
+
+        Args:
+            results (dict): Stage name -> result for every stage.
+
+        Returns:
+            dict: RESULT_KEYS plus run_id, reused_stages and `errors` for
+            optional stages that came back empty.
+        """
+        # a degraded result, and anything built from it, isn't worth reusing
+        degraded = self.graph.downstream(self.errors)
+        self.record.outputs = {
+            name: result for name, result in results.items() if name not in degraded
+        }
+        company_name = results.get("company_name")
+        if isinstance(company_name, str) and company_name:
+            self.record.company = normalize_text(company_name)
+        self.record.timings = self.timings()
+        self.record.errors = dict(self.errors)
+        if self.started is not None:
+            self.record.duration_ms = round((time.perf_counter() - self.started) * 1000)
+        await self.runs.save(self.record)
+        return {
+            **{key: results[key] for key in RESULT_KEYS},
+            "run_id": self.run_id,
+            "reused_stages": sorted(self.reuse),
+            "errors": self.errors,
+        }
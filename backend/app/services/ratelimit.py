@@ -0,0 +1,332 @@
+import asyncio
+import contextvars
+import os
+import random
+import re
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Deque, Dict, Mapping, Tuple
+
+import openai
+import parallel
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Who is asking, for fair queueing: the pipeline run id, or None for one-off
+# calls (/interview, /resume). Set by PipelineRun.
+current_tenant: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "current_tenant", default=None
+)
+
+CONNECTION_ERRORS = (openai.APIConnectionError, parallel.APIConnectionError)
+RETRY_STATUSES = {408, 409, 429}
+DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def parse_duration(value: str | None) -> float | None:
+    """
+    Seconds in a rate-limit header: plain seconds ("2", retry-after) or
+    OpenAI's reset format ("1s", "6m0s", "20ms").
+    """
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = DURATION_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(n) * DURATION_UNITS[unit] for n, unit in parts)
+
+
+def retry_after(headers: Mapping[str, str]) -> float | None:
+    """How long the upstream asked us to wait, if it said."""
+    ms = headers.get("retry-after-ms")
+    if ms:
+        try:
+            return float(ms) / 1000
+        except ValueError:
+            pass
+    return parse_duration(headers.get("retry-after"))
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """The errors the SDKs would retry themselves: 408/409/429, 5xx, network."""
+    if isinstance(exc, CONNECTION_ERRORS):
+        return True
+    status = getattr(exc, "status_code", None)
+    return status is not None and (status in RETRY_STATUSES or status >= 500)
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    return getattr(exc, "status_code", None) == 429
+
+
+class TokenBucket:
+    """
+    Request pacing. Reservations may drive the balance negative; each caller
+    then sleeps until its own token has been refilled, so a burst is spread
+    out instead of released all at once.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before using it."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return max(-self.tokens / self.rate, 0.0)
+
+
+@dataclass
+class LimiterSettings:
+    initial: float = 32  # concurrent calls before any feedback
+    min_limit: float = 1
+    max_limit: float = 256
+    decrease: float = 0.5  # multiplicative decrease on 429
+    rpm: float | None = None  # static requests/minute, else learned from headers
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit plus request pacing for one upstream / model.
+
+    Successful calls raise the limit by about one per window of calls; a 429
+    halves it (once per wave: 429s from calls started before the last cut
+    don't cut again). Waiters are served round-robin per tenant, so one big
+    batch can't starve a single interactive pipeline. Rate-limit headers
+    set the pacing rate and, when the upstream reports nothing left, pause
+    every caller until the reset.
+    """
+
+    def __init__(self, name: str, settings: LimiterSettings | None = None):
+        self.name = name
+        self.settings = settings or LimiterSettings()
+        self.limit = self.settings.initial
+        self.in_flight = 0
+        self.bucket = (
+            TokenBucket(self.settings.rpm / 60, max(self.settings.rpm / 60, 1))
+            if self.settings.rpm
+            else None
+        )
+        self.paused_until = 0.0
+        self._decreased_at = 0.0
+        self._waiters: Dict[str | None, Deque[asyncio.Future]] = {}
+        self._turns: Deque[str | None] = deque()
+        self.calls = 0
+        self.rate_limited = 0
+        self.max_queued = 0
+
+    @property
+    def queued(self) -> int:
+        return sum(len(q) for q in self._waiters.values())
+
+    async def acquire(self) -> float:
+        """Wait for a concurrency slot and pacing; returns the start time."""
+        if self.in_flight >= int(self.limit) or self.queued:
+            tenant = current_tenant.get()
+            future = asyncio.get_running_loop().create_future()
+            if tenant not in self._waiters:
+                self._waiters[tenant] = deque()
+                self._turns.append(tenant)
+            self._waiters[tenant].append(future)
+            self.max_queued = max(self.max_queued, self.queued)
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # the slot was handed over just as we were cancelled
+                    self.in_flight -= 1
+                    self._wake()
+                else:
+                    self._forget(tenant, future)
+                raise
+        else:
+            self.in_flight += 1
+
+        try:
+            delay = max(self.paused_until - time.monotonic(), 0.0)
+            if self.bucket is not None:
+                delay = max(delay, self.bucket.reserve())
+            if delay:
+                await asyncio.sleep(delay)
+        except BaseException:
+            self.release()
+            raise
+        return time.monotonic()
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._turns and self.in_flight < int(self.limit):
+            tenant = self._turns.popleft()
+            queue = self._waiters[tenant]
+            future = queue.popleft()
+            if queue:
+                self._turns.append(tenant)
+            else:
+                del self._waiters[tenant]
+            if not future.done():
+                self.in_flight += 1
+                future.set_result(None)
+
+    def _forget(self, tenant: str | None, future: asyncio.Future):
+        queue = self._waiters.get(tenant)
+        if queue is None or future not in queue:
+            return
+        queue.remove(future)
+        if not queue:
+            del self._waiters[tenant]
+            self._turns.remove(tenant)
+
+    def paused_for(self) -> float:
+        return max(self.paused_until - time.monotonic(), 0.0)
+
+    def on_success(self, headers: Mapping[str, str]):
+        self.calls += 1
+        self.limit = min(self.settings.max_limit, self.limit + 1 / self.limit)
+        self._observe(headers)
+        self._wake()
+
+    def on_rate_limited(self, started: float, headers: Mapping[str, str]):
+        self.calls += 1
+        self.rate_limited += 1
+        if started >= self._decreased_at:
+            self.limit = max(
+                self.settings.min_limit, self.limit * self.settings.decrease
+            )
+            self._decreased_at = time.monotonic()
+        wait = retry_after(headers)
+        if wait:
+            self.paused_until = max(self.paused_until, time.monotonic() + wait)
+        self._observe(headers)
+
+    def _observe(self, headers: Mapping[str, str]):
+        """Follow OpenAI-style x-ratelimit-* headers, if the upstream sends them."""
+        now = time.monotonic()
+        for kind in ("requests", "tokens"):
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+            if remaining is not None and reset and int(remaining) <= 0:
+                self.paused_until = max(self.paused_until, now + reset)
+
+        limit = headers.get("x-ratelimit-limit-requests")
+        if limit and not self.settings.rpm:
+            rate = int(limit) / 60
+            if self.bucket is None:
+                self.bucket = TokenBucket(rate, max(rate, 1))
+            else:
+                self.bucket.rate, self.bucket.burst = rate, max(rate, 1)
+
+    def stats(self) -> dict:
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "requests_per_second": (
+                round(self.bucket.rate, 2) if self.bucket is not None else None
+            ),
+            "calls": self.calls,
+            "rate_limited": self.rate_limited,
+        }
+
+
+class Governor:
+    """
+    Process-wide AdaptiveLimiters, one per (upstream, model or endpoint),
+    plus the jittered exponential backoff used between retries.
+    """
+
+    def __init__(
+        self,
+        settings: Dict[str, LimiterSettings] | None = None,
+        retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 20.0,
+    ):
+        self.settings = settings or {}
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.limiters: Dict[Tuple[str, str], AdaptiveLimiter] = {}
+        self.retried = 0
+
+    @classmethod
+    def from_env(cls) -> "Governor":
+        """
+        Reads RATE_LIMIT_RETRIES, RATE_LIMIT_BACKOFF_BASE, RATE_LIMIT_BACKOFF_CAP,
+        and per key (OPENAI_GPT_4_1_NANO, PARALLEL_SEARCH, ...) the
+        RATE_LIMIT_CONCURRENCY_<KEY>, RATE_LIMIT_MAX_CONCURRENCY_<KEY> and
+        RATE_LIMIT_RPM_<KEY> variables.
+        """
+        return cls(
+            retries=int(os.getenv("RATE_LIMIT_RETRIES", "4")),
+            backoff_base=float(os.getenv("RATE_LIMIT_BACKOFF_BASE", "0.5")),
+            backoff_cap=float(os.getenv("RATE_LIMIT_BACKOFF_CAP", "20")),
+        )
+
+    @staticmethod
+    def env_key(upstream: str, name: str) -> str:
+        return re.sub(r"[^A-Z0-9]+", "_", f"{upstream}_{name}".upper())
+
+    def _settings(self, upstream: str, name: str) -> LimiterSettings:
+        key = self.env_key(upstream, name)
+        if key in self.settings:
+            return self.settings[key]
+        defaults = LimiterSettings()
+        rpm = os.getenv(f"RATE_LIMIT_RPM_{key}")
+        return LimiterSettings(
+            initial=float(os.getenv(f"RATE_LIMIT_CONCURRENCY_{key}", defaults.initial)),
+            max_limit=float(
+                os.getenv(f"RATE_LIMIT_MAX_CONCURRENCY_{key}", defaults.max_limit)
+            ),
+            rpm=float(rpm) if rpm else None,
+        )
+
+    def limiter(self, upstream: str, name: str) -> AdaptiveLimiter:
+        key = (upstream, name)
+        if key not in self.limiters:
+            self.limiters[key] = AdaptiveLimiter(
+                f"{upstream}:{name}", self._settings(upstream, name)
+            )
+        return self.limiters[key]
+
+    def backoff(self, attempt: int, wait: float | None = None) -> float:
+        """
+        Full-jitter exponential backoff, never shorter than the upstream's
+        retry-after, so retries after a 429 burst are spread out instead of
+        arriving together.
+        """
+        ceiling = min(self.backoff_cap, self.backoff_base * 2**attempt)
+        return max(wait or 0.0, random.uniform(0, ceiling))
+
+    @asynccontextmanager
+    async def slot(self, upstream: str, name: str):
+        limiter = self.limiter(upstream, name)
+        started = await limiter.acquire()
+        try:
+            yield limiter, started
+        finally:
+            limiter.release()
+
+    def stats(self) -> dict:
+        return {
+            "retries": self.retried,
+            "limiters": {
+                limiter.name: limiter.stats() for limiter in self.limiters.values()
+            },
+        }
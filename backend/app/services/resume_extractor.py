@@ -0,0 +1,358 @@
+import os
+import re
+from collections import Counter, defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+from app.services.pdf_pages import Line
+from dotenv import load_dotenv
+
+load_dotenv()
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+PHONE_RE = re.compile(r"(?:\+?1[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}\b")
+LINKEDIN_RE = re.compile(
+    r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/in/[\w%-]+/?", re.IGNORECASE
+)
+URL_RE = re.compile(r"(?:https?://|www\.)\S+|\S+\.(?:com|io|dev|org)\S*", re.I)
+
+MONTH = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?"
+DATE = rf"(?:{MONTH}\s+(?:19|20)\d{{2}}|\d{{1,2}}/(?:19|20)\d{{2}}|(?:19|20)\d{{2}})"
+DATE_RANGE_RE = re.compile(
+    rf"(?:(?:Expected|Anticipated)\s+)?{DATE}"
+    rf"(?:\s*(?:-|–|—|to)\s*(?:{DATE}|Present|Current|Now))?",
+    re.IGNORECASE,
+)
+END_DATE_RE = re.compile(rf"(?:(?:Expected|Anticipated)\s+)?{DATE}$", re.I)
+
+BULLET_RE = re.compile(r"^[•●▪◦‣∙·\-\*–]\s*")
+SEPARATOR_RE = re.compile(r"\s+[|—–-]\s+|\s{3,}")
+# "Software Engineer Intern at Acme Corp"; not used for school names
+AT_RE = re.compile(r"\s+at\s+")
+GPA_RE = re.compile(r",?\s*GPA[:\s]*[\d.]+(?:\s*/\s*[\d.]+)?", re.IGNORECASE)
+LOCATION_RE = re.compile(r"^(?:[A-Z][\w .'-]+,\s*[A-Z]{2}|Remote|Hybrid)$")
+SCHOOL_RE = re.compile(
+    r"\b(?:University|College|Institute|School|Academy|Polytechnic)\b|\bUC [A-Z]"
+)
+DEGREE_RE = re.compile(
+    r"\b(?:Bachelor|Master|Doctor|Associate|Diploma|Ph\.?D|MBA|B\.?S\.?|B\.?A\.?"
+    r"|M\.?S\.?|M\.?A\.?|B\.?Eng|M\.?Eng|B\.?Sc|M\.?Sc)\b"
+)
+ROLE_RE = re.compile(
+    r"\b(?:Engineer|Developer|Intern|Analyst|Manager|Assistant|Researcher"
+    r"|Scientist|Designer|Consultant|Lead|Associate|Fellow|Tutor|Specialist"
+    r"|Coordinator|Director|Officer|Architect|Administrator|Technician"
+    r"|President|Founder|Co-Founder|Instructor|Programmer|Contractor)\b",
+    re.IGNORECASE,
+)
+SKILL_LABEL_RE = re.compile(r"^[A-Za-z][A-Za-z &/]{1,30}:\s*")
+SKILL_SPLIT_RE = re.compile(r"\s*[,;|•·]\s*")
+
+# normalized heading -> section; "other" closes the previous section
+SECTION_HEADINGS = {
+    "education": "education",
+    "academic background": "education",
+    "experience": "experience",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "relevant experience": "experience",
+    "employment": "experience",
+    "employment history": "experience",
+    "work history": "experience",
+    "internships": "experience",
+    "skills": "skills",
+    "technical skills": "skills",
+    "skills & interests": "skills",
+    "skills and interests": "skills",
+    "technologies": "skills",
+    "languages & technologies": "skills",
+    "core competencies": "skills",
+    "projects": "other",
+    "personal projects": "other",
+    "academic projects": "other",
+    "leadership": "other",
+    "leadership & activities": "other",
+    "activities": "other",
+    "extracurriculars": "other",
+    "awards": "other",
+    "honors & awards": "other",
+    "certifications": "other",
+    "publications": "other",
+    "summary": "other",
+    "objective": "other",
+    "profile": "other",
+    "interests": "other",
+    "volunteer": "other",
+    "volunteering": "other",
+    "coursework": "other",
+    "relevant coursework": "other",
+}
+
+# Used to pick skills out of the full text when there is no skills section
+KNOWN_SKILLS = [
+    "Python", "Java", "C++", "C#", "C", "JavaScript", "TypeScript", "Go",
+    "Rust", "Ruby", "PHP", "Swift", "Kotlin", "Scala", "R", "MATLAB", "SQL",
+    "HTML", "CSS", "Bash", "React", "Angular", "Vue", "Next.js", "Node.js",
+    "Express", "Django", "Flask", "FastAPI", "Spring", "Rails", ".NET",
+    "PostgreSQL", "MySQL", "SQLite", "MongoDB", "Redis", "GraphQL", "Kafka",
+    "Spark", "Hadoop", "Airflow", "AWS", "GCP", "Azure", "Docker",
+    "Kubernetes", "Terraform", "Git", "Linux", "CI/CD", "PyTorch",
+    "TensorFlow", "scikit-learn", "pandas", "NumPy", "Tableau", "Excel",
+    "Figma", "Jira",
+]  # fmt: skip
+KNOWN_SKILL_RE = re.compile(
+    r"(?<![\w+#.])("
+    + "|".join(re.escape(s) for s in sorted(KNOWN_SKILLS, key=len, reverse=True))
+    + r")(?![\w+#])"
+)
+
+# Field weights of the confidence score, summing to 1
+WEIGHTS = {
+    "name": 0.15,
+    "email": 0.15,
+    "contact": 0.05,
+    "education": 0.2,
+    "experience": 0.3,
+    "skills": 0.15,
+}
+
+
+def _normalize_heading(text: str) -> str:
+    return " ".join(re.sub(r"[^a-z& ]", " ", text.lower()).split())
+
+
+def _body_size(lines: Sequence[Line]) -> float:
+    sizes = Counter()
+    for text, size, _ in lines:
+        sizes[size] += len(text)
+    return sizes.most_common(1)[0][0] if sizes else 0.0
+
+
+def _pieces(text: str, split_at: bool = False) -> List[str]:
+    pieces = SEPARATOR_RE.split(GPA_RE.sub("", text))
+    if split_at:
+        pieces = [part for piece in pieces for part in AT_RE.split(piece)]
+    return [p.strip(" ,|") for p in pieces if p.strip(" ,|")]
+
+
+def _take_dates(text: str) -> Tuple[str, str]:
+    """Split the first date range out of `text`; returns (rest, dates)."""
+    match = DATE_RANGE_RE.search(text)
+    if not match:
+        return text, ""
+    rest = (text[: match.start()] + "   " + text[match.end() :]).strip()
+    return rest, " ".join(match.group(0).split())
+
+
+class ResumeExtractor:
+    """
+    Rule-based resume structuring from PyMuPDF layout lines.
+
+    Section headings are found by name plus font size / weight, contact
+    details by regex, and entries by bullet markers and date ranges. The
+    result has the same schema as the LLM structuring prompt, along with a
+    0-1 confidence score; callers fall back to the LLM below `min_confidence`.
+    """
+
+    def __init__(self, min_confidence: float = 0.75):
+        self.min_confidence = min_confidence
+        self.counts: Dict[str, int] = defaultdict(int)
+        self.confidence_sum = 0.0
+
+    @classmethod
+    def from_env(cls) -> "ResumeExtractor":
+        """RESUME_LOCAL_MIN_CONFIDENCE above 1 always uses the LLM."""
+        return cls(float(os.getenv("RESUME_LOCAL_MIN_CONFIDENCE", "0.75")))
+
+    def _is_heading(self, line: Line, body_size: float) -> str | None:
+        text, size, bold = line
+        words = text.split()
+        if not words or len(words) > 5:
+            return None
+        section = SECTION_HEADINGS.get(_normalize_heading(text))
+        emphasized = bold or size > body_size + 0.5 or text.isupper()
+        if section:
+            return section if emphasized or text.rstrip().endswith(":") else None
+        if text.isupper() and (bold or size > body_size + 0.5) and len(words) <= 4:
+            return "other"
+        return None
+
+    def _sections(self, lines: Sequence[Line]) -> Tuple[List[Line], Dict]:
+        body_size = _body_size(lines)
+        header: List[Line] = []
+        sections: Dict[str, List[Line]] = defaultdict(list)
+        current = None
+        for line in lines:
+            heading = self._is_heading(line, body_size)
+            if heading:
+                current = heading
+                continue
+            if current is None:
+                header.append(line)
+            else:
+                sections[current].append(line)
+        return header, sections
+
+    def _user_info(self, header: List[Line], full_text: str) -> dict:
+        name = ""
+        candidates = [
+            (text, size)
+            for text, size, _ in header
+            if not EMAIL_RE.search(text)
+            and not PHONE_RE.search(text)
+            and not URL_RE.search(text)
+            and not any(c.isdigit() for c in text)
+            and 2 <= len(text.split()) <= 5
+        ]
+        if candidates:
+            largest = max(size for _, size in candidates)
+            name = next(text for text, size in candidates if size == largest)
+
+        email = EMAIL_RE.search(full_text)
+        phone = PHONE_RE.search(full_text)
+        linkedin = LINKEDIN_RE.search(full_text)
+        return {
+            "name": name,
+            "email": email.group(0) if email else "",
+            "phone": phone.group(0).strip() if phone else "",
+            "linkedin": linkedin.group(0) if linkedin else "",
+        }
+
+    def _education(self, lines: List[Line]) -> List[dict]:
+        entries: List[dict] = []
+        for text, _, _ in lines:
+            if BULLET_RE.match(text):
+                continue
+            rest, dates = _take_dates(text)
+            pieces = _pieces(rest)
+            school = next((p for p in pieces if SCHOOL_RE.search(p)), None)
+            if school or not entries:
+                entries.append(
+                    {"school": school or "", "degree": "", "graduation_date": ""}
+                )
+            entry = entries[-1]
+            degree = next((p for p in pieces if DEGREE_RE.search(p)), None)
+            if degree and not entry["degree"]:
+                entry["degree"] = degree
+            if dates and not entry["graduation_date"]:
+                end = re.split(r"\s*(?:-|–|—|to)\s*", dates)[-1]
+                entry["graduation_date"] = end if END_DATE_RE.search(end) else dates
+        return [e for e in entries if e["school"] or e["degree"]]
+
+    def _experience(self, lines: List[Line], body_size: float) -> List[dict]:
+        entries: List[dict] = []
+        headers: List[List[str]] = []
+        for text, size, bold in lines:
+            entry = entries[-1] if entries else None
+            if BULLET_RE.match(text):
+                if entry is None:
+                    continue
+                entry["bullets"].append(BULLET_RE.sub("", text, count=1))
+                continue
+            rest, dates = _take_dates(text)
+            continuation = (
+                entry is not None
+                and entry["bullets"]
+                and not bold
+                and not dates
+                and size <= body_size + 0.5
+            )
+            if continuation:
+                entry["bullets"][-1] += " " + text
+                continue
+            if entry is None or entry["bullets"] or (dates and entry["dates"]):
+                entry = {"company": "", "role": "", "dates": "", "bullets": []}
+                entries.append(entry)
+                headers.append([])
+            if dates and not entry["dates"]:
+                entry["dates"] = dates
+            headers[-1].extend(
+                p for p in _pieces(rest, split_at=True) if not LOCATION_RE.match(p)
+            )
+
+        for entry, pieces in zip(entries, headers):
+            roles = [p for p in pieces if ROLE_RE.search(p)]
+            others = [p for p in pieces if p not in roles]
+            entry["role"] = (
+                roles[0] if roles else (others[1] if len(others) > 1 else "")
+            )
+            entry["company"] = others[0] if others else ""
+            if not others and len(roles) > 1:
+                entry["company"] = roles[1]
+        return [e for e in entries if e["company"] or e["role"]]
+
+    def _skills(self, lines: List[Line], full_text: str) -> Tuple[List[str], bool]:
+        skills: List[str] = []
+        for text, _, _ in lines:
+            text = BULLET_RE.sub("", text, count=1)
+            text = SKILL_LABEL_RE.sub("", text)
+            for item in SKILL_SPLIT_RE.split(text):
+                item = item.strip(" .")
+                if item and len(item) <= 40 and item not in skills:
+                    skills.append(item)
+        if len(skills) >= 3:
+            return skills, True
+        found = []
+        for match in KNOWN_SKILL_RE.finditer(full_text):
+            if match.group(1) not in found:
+                found.append(match.group(1))
+        return found, False
+
+    def extract(self, lines: Sequence[Line]) -> Tuple[dict, float]:
+        """
+        Structure a resume from its layout lines.
+
+        Args:
+            lines (Sequence[Line]): (text, font size, bold) for every line, in
+                reading order across all pages.
+
+        Returns:
+            Tuple[dict, float]: The structured resume (user_info, education,
+            experience, skills) and the confidence score.
+        """
+        lines = [Line(*line) for line in lines]
+        full_text = "\n".join(line.text for line in lines)
+        header, sections = self._sections(lines)
+
+        user_info = self._user_info(header or lines[:8], full_text)
+        education = self._education(sections["education"])
+        experience = self._experience(sections["experience"], _body_size(lines))
+        skills, from_section = self._skills(sections["skills"], full_text)
+
+        score = 0.0
+        if user_info["name"]:
+            score += WEIGHTS["name"]
+        if user_info["email"]:
+            score += WEIGHTS["email"]
+        if user_info["phone"] or user_info["linkedin"]:
+            score += WEIGHTS["contact"]
+        if education:
+            complete = [e for e in education if e["school"] and e["degree"]]
+            score += WEIGHTS["education"] * len(complete) / len(education)
+        if experience:
+            complete = [
+                e for e in experience if e["company"] and e["role"] and e["dates"]
+            ]
+            score += WEIGHTS["experience"] * len(complete) / len(experience)
+        if len(skills) >= 3:
+            score += WEIGHTS["skills"] * (1 if from_section else 0.5)
+
+        data = {
+            "user_info": user_info,
+            "education": education,
+            "experience": experience,
+            "skills": skills,
+        }
+        return data, round(score, 3)
+
+    def record(self, path: str, confidence: float):
+        self.counts[path] += 1
+        self.confidence_sum += confidence
+
+    def stats(self) -> dict:
+        total = sum(self.counts.values())
+        return {
+            "min_confidence": self.min_confidence,
+            "local": self.counts["local"],
+            "llm_fallback": self.counts["llm"],
+            "avg_confidence": round(self.confidence_sum / total, 3) if total else None,
+        }
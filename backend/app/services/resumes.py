@@ -0,0 +1,151 @@
+import asyncio
+import json
+import os
+import time
+from collections import defaultdict
+from typing import Any, Dict
+
+from app.services.cache import DAY, MemoryBackend, SQLiteBackend
+from app.services.parser import STRUCTURE_MODEL, STRUCTURE_VERSION, PDFParser
+from app.services.singleflight import SingleFlight
+from dotenv import load_dotenv
+from fastapi import UploadFile
+
+load_dotenv()
+
+
+class UnknownResume(KeyError):
+    pass
+
+
+class ResumeStore:
+    """
+    Parsed and structured resumes keyed by the SHA-256 of the PDF bytes.
+
+    Re-uploading an identical PDF skips text extraction, and the structured
+    resume is stored per (content hash, STRUCTURE_VERSION, model), so the
+    expensive structuring call runs once per resume rather than once per
+    pipeline. Uses the same memory / SQLite backends as the stage cache.
+    """
+
+    def __init__(
+        self, backend, ttl: float = 30 * DAY, flight: SingleFlight | None = None
+    ):
+        self.backend = backend
+        self.ttl = ttl
+        self.flight = flight
+        self.counts: Dict[str, int] = defaultdict(int)
+
+    @classmethod
+    def from_env(cls, flight: SingleFlight | None = None) -> "ResumeStore":
+        """
+        Build the store from RESUME_STORE_BACKEND (memory or sqlite),
+        RESUME_STORE_PATH, RESUME_STORE_MAX_ENTRIES and RESUME_STORE_TTL.
+        """
+        kind = os.getenv("RESUME_STORE_BACKEND", "memory")
+        max_entries = int(os.getenv("RESUME_STORE_MAX_ENTRIES", "1000"))
+        if kind == "sqlite":
+            backend = SQLiteBackend(
+                os.getenv("RESUME_STORE_PATH", "resumes.sqlite3"), max_entries
+            )
+        elif kind == "memory":
+            backend = MemoryBackend(max_entries)
+        else:
+            raise ValueError(f"Unknown RESUME_STORE_BACKEND '{kind}'")
+        return cls(backend, float(os.getenv("RESUME_STORE_TTL", 30 * DAY)), flight)
+
+    async def _call(self, method, *args):
+        if self.backend.blocking:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def _get(self, key: str) -> Any:
+        value = await self._call(self.backend.get, key)
+        return None if value is None else json.loads(value)
+
+    async def _set(self, key: str, value: Any):
+        await self._call(self.backend.set, key, json.dumps(value), self.ttl)
+
+    async def get(self, resume_id: str) -> dict | None:
+        """The extracted text and layout lines of a stored resume, if any."""
+        return await self._get(f"resume:{resume_id}")
+
+    async def ingest(self, file: UploadFile, parser: PDFParser) -> str:
+        """
+        Store an uploaded PDF's extracted text, unless an identical PDF is
+        already stored.
+
+        Args:
+            file (UploadFile): The uploaded PDF.
+            parser (PDFParser): Parser used to spool and extract it.
+
+        Returns:
+            str: The resume ID (SHA-256 of the PDF bytes).
+        """
+        path, resume_id = await parser.spool(file)
+        try:
+            if await self.get(resume_id) is not None:
+                self.counts["duplicate_uploads"] += 1
+                return resume_id
+            pages = [page async for page in parser.aiter_pages(path)]
+        finally:
+            os.unlink(path)
+
+        self.counts["uploads"] += 1
+        await self._set(
+            f"resume:{resume_id}",
+            {
+                # Combine all pages into single text
+                "resume_text": " ".join(page.text for page in pages),
+                # font size / weight per line, for the local resume structurer
+                "resume_lines": [line for page in pages for line in page.lines],
+                "pages": len(pages),
+                "created_at": time.time(),
+            },
+        )
+        return resume_id
+
+    async def structured(self, resume_id: str, parser: PDFParser) -> dict:
+        """
+        The structured resume (user_info, education, experience, skills),
+        computed with `parser` on first use and stored afterwards.
+
+        Raises:
+            UnknownResume: If `resume_id` is not (or no longer) stored.
+        """
+        key = f"user_data:{resume_id}:{STRUCTURE_VERSION}:{STRUCTURE_MODEL}"
+
+        async def compute():
+            data = await self._get(key)
+            if data is not None:
+                self.counts["structured_hits"] += 1
+                return data
+            resume = await self.get(resume_id)
+            if resume is None:
+                raise UnknownResume(resume_id)
+            self.counts["structured_misses"] += 1
+            data = await parser.structure_output(
+                resume["resume_text"], resume["resume_lines"]
+            )
+            if data is not None:
+                await self._set(key, data)
+            return data
+
+        if self.flight is None:
+            return await compute()
+        return await self.flight.do(key, compute)
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            **{
+                name: self.counts[name]
+                for name in (
+                    "uploads",
+                    "duplicate_uploads",
+                    "structured_hits",
+                    "structured_misses",
+                )
+            },
+        }
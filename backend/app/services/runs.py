@@ -0,0 +1,317 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from app.services.cache import DAY, normalize_text
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+@dataclass
+class RunRecord:
+    """
+    A finished pipeline run: the fingerprint of every stage's inputs and the
+    outputs they produced (what a later run needs to partially reuse it),
+    plus the request inputs, company, stage timings and degraded stages it
+    is looked up and replayed by.
+    """
+
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    fingerprints: Dict[str, str] = field(default_factory=dict)
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    inputs: Dict[str, Any] = field(default_factory=dict)
+    company: str | None = None  # normalize_text(company_name)
+    timings: Dict[str, int] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    duration_ms: int | None = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def summary(self) -> dict:
+        """The record without its stage outputs, for listings."""
+        fit_score = self.outputs.get("fit_score") or {}
+        return {
+            "run_id": self.run_id,
+            "created_at": self.created_at,
+            "company": self.company,
+            "job_url": self.inputs.get("job_url"),
+            "overall_fit_score": fit_score.get("overall_fit_score"),
+            "duration_ms": self.duration_ms,
+            "errors": self.errors,
+        }
+
+
+# (created_at, run_id) of the last record of a page; the next page starts
+# strictly after it, newest first
+Cursor = Tuple[float, str]
+
+
+def encode_cursor(summary: dict) -> str:
+    return f"{summary['created_at']!r}_{summary['run_id']}"
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    """
+    Raises:
+        ValueError: If `cursor` was not produced by encode_cursor.
+    """
+    created_at, _, run_id = cursor.partition("_")
+    if not run_id:
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    return float(created_at), run_id
+
+
+class MemoryRunBackend:
+    """Recent runs only: an LRU bounded by count."""
+
+    blocking = False
+
+    def __init__(self, max_runs: int = 500):
+        self.max_runs = max_runs
+        self._runs: OrderedDict[str, RunRecord] = OrderedDict()
+
+    def get(self, run_id: str) -> RunRecord | None:
+        record = self._runs.get(run_id)
+        if record is not None:
+            self._runs.move_to_end(run_id)
+        return record
+
+    def save(self, record: RunRecord):
+        self._runs[record.run_id] = record
+        self._runs.move_to_end(record.run_id)
+        while len(self._runs) > self.max_runs:
+            self._runs.popitem(last=False)
+
+    def list(
+        self, company: str | None, job_url: str | None, limit: int, after: Cursor | None
+    ) -> List[dict]:
+        records = sorted(
+            self._runs.values(), key=lambda r: (r.created_at, r.run_id), reverse=True
+        )
+        return [
+            r.summary()
+            for r in records
+            if (company is None or r.company == company)
+            and (job_url is None or r.inputs.get("job_url") == job_url)
+            and (after is None or (r.created_at, r.run_id) < after)
+        ][:limit]
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+
+class SQLiteRunBackend:
+    """
+    Every run on disk, appended to a WAL-mode table indexed by company and
+    time, so several workers can record runs concurrently and history
+    survives restarts. Rows older than `retention` seconds are pruned.
+    Listings read only each row's summary, not its stage outputs.
+    """
+
+    blocking = True
+    PRUNE_EVERY = 100  # saves between retention sweeps
+
+    def __init__(self, path: str = "runs.sqlite3", retention: float = 30 * DAY):
+        self.retention = retention
+        self._saves = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS runs (
+                run_id TEXT PRIMARY KEY,
+                created_at REAL NOT NULL,
+                company TEXT,
+                job_url TEXT,
+                record TEXT NOT NULL,
+                summary TEXT
+            )"""
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(runs)")}
+        if "summary" not in columns:
+            # files written before listings had their own column
+            self._conn.execute("ALTER TABLE runs ADD COLUMN summary TEXT")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS runs_created ON runs (created_at, run_id)"
+        )
+        self._conn.execute(
+            """CREATE INDEX IF NOT EXISTS runs_company
+            ON runs (company, created_at, run_id)"""
+        )
+        self._conn.execute(
+            """CREATE INDEX IF NOT EXISTS runs_job_url
+            ON runs (job_url, created_at, run_id)"""
+        )
+        self._conn.commit()
+
+    def get(self, run_id: str) -> RunRecord | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT record FROM runs WHERE run_id = ?", (run_id,)
+            ).fetchone()
+        return RunRecord(**json.loads(row[0])) if row else None
+
+    def save(self, record: RunRecord):
+        with self._lock:
+            self._conn.execute(
+                """INSERT OR REPLACE INTO runs
+                (run_id, created_at, company, job_url, record, summary)
+                VALUES (?, ?, ?, ?, ?, ?)""",
+                (
+                    record.run_id,
+                    record.created_at,
+                    record.company,
+                    record.inputs.get("job_url"),
+                    json.dumps(record.to_dict(), default=str),
+                    json.dumps(record.summary(), default=str),
+                ),
+            )
+            self._saves += 1
+            if self._saves % self.PRUNE_EVERY == 0:
+                self._conn.execute(
+                    "DELETE FROM runs WHERE created_at < ?",
+                    (time.time() - self.retention,),
+                )
+            self._conn.commit()
+
+    def list(
+        self, company: str | None, job_url: str | None, limit: int, after: Cursor | None
+    ) -> List[dict]:
+        clauses, params = [], []
+        if company is not None:
+            clauses.append("company = ?")
+            params.append(company)
+        if job_url is not None:
+            clauses.append("job_url = ?")
+            params.append(job_url)
+        if after is not None:
+            clauses.append("(created_at, run_id) < (?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                # the stage outputs are only read for rows without a summary
+                f"""SELECT summary, CASE WHEN summary IS NULL THEN record END
+                FROM runs {where}
+                ORDER BY created_at DESC, run_id DESC LIMIT ?""",
+                (*params, limit),
+            ).fetchall()
+        return [
+            (
+                json.loads(summary)
+                if summary
+                else RunRecord(**json.loads(record)).summary()
+            )
+            for summary, record in rows
+        ]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+
+class RunRecordStore:
+    """
+    Pipeline runs, for partial reuse (`previous_run_id`), interview sessions
+    and the /runs history. Reuse only looks `ttl` seconds back; the history
+    keeps whatever the backend retains.
+    """
+
+    def __init__(self, max_runs: int = 500, ttl: float = DAY, backend=None):
+        self.max_runs = max_runs
+        self.ttl = ttl
+        self.backend = backend if backend is not None else MemoryRunBackend(max_runs)
+
+    @classmethod
+    def from_env(cls) -> "RunRecordStore":
+        """
+        Build the store from RUN_RECORDS_BACKEND (sqlite, or memory for
+        tests and benches), RUN_RECORDS_PATH, RUN_RECORDS_RETENTION,
+        RUN_RECORDS_MAX (memory) and RUN_RECORDS_TTL.
+        """
+        max_runs = int(os.getenv("RUN_RECORDS_MAX", "500"))
+        kind = os.getenv("RUN_RECORDS_BACKEND", "sqlite")
+        if kind == "sqlite":
+            backend = SQLiteRunBackend(
+                os.getenv("RUN_RECORDS_PATH", "runs.sqlite3"),
+                float(os.getenv("RUN_RECORDS_RETENTION", 30 * DAY)),
+            )
+        elif kind == "memory":
+            backend = MemoryRunBackend(max_runs)
+        else:
+            raise ValueError(f"Unknown RUN_RECORDS_BACKEND '{kind}'")
+        return cls(
+            max_runs=max_runs,
+            ttl=float(os.getenv("RUN_RECORDS_TTL", DAY)),
+            backend=backend,
+        )
+
+    async def _call(self, method, *args):
+        if self.backend.blocking:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def get(self, run_id: str) -> RunRecord | None:
+        """A run recent enough (within `ttl`) to be reused."""
+        record = await self._call(self.backend.get, run_id)
+        if record is None or record.created_at + self.ttl < time.time():
+            return None
+        return record
+
+    async def lookup(self, run_id: str) -> RunRecord | None:
+        """A run from the history, however old."""
+        return await self._call(self.backend.get, run_id)
+
+    async def save(self, record: RunRecord):
+        await self._call(self.backend.save, record)
+
+    async def list(
+        self,
+        company: str | None = None,
+        job_url: str | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> Tuple[List[dict], str | None]:
+        """
+        Run summaries (RunRecord.summary), newest first.
+
+        Args:
+            company (str): Only runs for this company (any casing/spacing).
+            job_url (str): Only runs for this exact job URL.
+            limit (int): Page size.
+            cursor (str): `next_cursor` of the previous page.
+
+        Returns:
+            tuple: The page of summaries and the cursor of the next page, or
+            None on the last page.
+
+        Raises:
+            ValueError: If `cursor` is malformed.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        company = normalize_text(company) if company else None
+        # one extra row tells whether there is a next page
+        summaries = await self._call(
+            self.backend.list, company, job_url, limit + 1, after
+        )
+        if len(summaries) > limit:
+            return summaries[:limit], encode_cursor(summaries[limit - 1])
+        return summaries, None
+
+    async def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "runs": await self._call(len, self.backend),
+            "ttl": self.ttl,
+        }
@@ -0,0 +1,274 @@
+import asyncio
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Set, Tuple
+
+
+@dataclass
+class Stage:
+    """
+    A single node in a StageGraph.
+
+    Args:
+        name (str): The key the stage's result is stored under.
+        fn (Callable): Async callable receiving one positional argument per dependency.
+        deps (tuple): Names of stages or graph inputs this stage needs.
+        version (str): Bump when the stage's prompt or logic changes, so
+            fingerprints (and therefore reuse across runs) are invalidated.
+        timeout (float): Seconds the stage may run once its deps are ready,
+            on top of the graph's deadline. None for no per-stage limit.
+        critical (bool): If False, a failure or timeout gives the stage a
+            None result and an error marker instead of failing the graph.
+    """
+
+    name: str
+    fn: Callable[..., Awaitable[Any]]
+    deps: Tuple[str, ...] = field(default_factory=tuple)
+    version: str = "1"
+    timeout: float | None = None
+    critical: bool = True
+
+
+@dataclass
+class StageResult:
+    """
+    A finished stage, as yielded by StageGraph.stream.
+
+    Args:
+        name (str): The stage name.
+        result: The stage's return value.
+        duration (float): Seconds the stage itself ran, once its deps were ready.
+        elapsed (float): Seconds since the graph started running.
+        reused (bool): True if the result came from a previous run.
+        error (str): Why a non-critical stage has no result, if it failed.
+    """
+
+    name: str
+    result: Any
+    duration: float
+    elapsed: float
+    reused: bool = False
+    error: str | None = None
+
+
+class StageError(Exception):
+    def __init__(self, stage: str, error: BaseException):
+        super().__init__(f"Stage '{stage}' failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class StageTimeout(TimeoutError):
+    def __init__(self, stage: str, seconds: float):
+        super().__init__(f"timed out after {seconds:.1f}s")
+        self.stage = stage
+        self.seconds = seconds
+
+
+class StageGraph:
+    """
+    A small dependency-graph scheduler.
+
+    Every stage is started as an asyncio task up front and awaits exactly the
+    dependencies it declared, so each stage begins the moment its inputs are
+    ready instead of waiting for an unrelated sibling to finish.
+    """
+
+    def __init__(self, stages: Iterable[Stage] = ()):
+        self.stages: Dict[str, Stage] = {}
+        for stage in stages:
+            self.add(stage)
+
+    def add(self, stage: Stage) -> "StageGraph":
+        if stage.name in self.stages:
+            raise ValueError(f"Duplicate stage '{stage.name}'")
+        self.stages[stage.name] = stage
+        return self
+
+    def validate(self, inputs: Iterable[str]) -> None:
+        known = set(inputs) | set(self.stages)
+        for stage in self.stages.values():
+            missing = [dep for dep in stage.deps if dep not in known]
+            if missing:
+                raise ValueError(f"Stage '{stage.name}' has unknown deps {missing}")
+
+        visiting, done = set(), set()
+
+        def visit(name: str):
+            if name in done or name not in self.stages:
+                return
+            if name in visiting:
+                raise ValueError(f"Cycle detected at stage '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def fingerprints(self, inputs: Dict[str, Any]) -> Dict[str, str]:
+        """
+        Hash every stage's inputs without running anything.
+
+        A stage's fingerprint covers its name, version and the fingerprints of
+        its deps, so changing one input changes exactly the fingerprints of the
+        stages downstream of it.
+
+        Args:
+            inputs (dict): Values for the graph's root inputs.
+
+        Returns:
+            dict: Stage name -> hex digest.
+        """
+        self.validate(inputs)
+        prints = {
+            name: hashlib.sha256(
+                json.dumps(value, sort_keys=True, default=str).encode()
+            ).hexdigest()
+            for name, value in inputs.items()
+        }
+
+        def visit(name: str) -> str:
+            if name not in prints:
+                stage = self.stages[name]
+                payload = [stage.name, stage.version, [visit(d) for d in stage.deps]]
+                digest = hashlib.sha256(json.dumps(payload).encode())
+                prints[name] = digest.hexdigest()
+            return prints[name]
+
+        return {name: visit(name) for name in self.stages}
+
+    def downstream(self, names: Iterable[str]) -> Set[str]:
+        """`names` plus every stage that depends on one of them, transitively."""
+        found = set(names)
+        changed = True
+        while changed:
+            changed = False
+            for stage in self.stages.values():
+                if stage.name not in found and found.intersection(stage.deps):
+                    found.add(stage.name)
+                    changed = True
+        return found
+
+    async def run(
+        self,
+        inputs: Dict[str, Any],
+        reuse: Dict[str, Any] | None = None,
+        deadline: float | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Run every stage and return a dict of stage name -> result.
+
+        Args:
+            inputs (dict): Values for the graph's root inputs (e.g. job_url).
+            reuse (dict): Stage results to take as-is instead of recomputing.
+            deadline (float): Seconds the whole graph may take, if bounded.
+
+        Returns:
+            dict: The results of all stages, keyed by stage name.
+
+        Raises:
+            StageError: If any stage raises; the remaining stages are cancelled.
+        """
+        results = {}
+        async for finished in self.stream(inputs, reuse, deadline):
+            results[finished.name] = finished.result
+        return results
+
+    async def stream(
+        self,
+        inputs: Dict[str, Any],
+        reuse: Dict[str, Any] | None = None,
+        deadline: float | None = None,
+    ) -> AsyncIterator[StageResult]:
+        """
+        Run every stage, yielding each StageResult the moment it finishes.
+
+        Every stage runs under the smaller of its own timeout and the time
+        left before `deadline`, so the graph never outlives the deadline.
+
+        Args:
+            inputs (dict): Values for the graph's root inputs (e.g. job_url).
+            reuse (dict): Stage results to take as-is instead of recomputing.
+            deadline (float): Seconds the whole graph may take, if bounded.
+
+        Yields:
+            StageResult: Finished stages in completion order.
+
+        Raises:
+            StageError: If a critical stage raises or times out; the remaining
+                stages are cancelled.
+        """
+        self.validate(inputs)
+        reuse = reuse or {}
+        tasks: Dict[str, asyncio.Task] = {}
+        started = time.perf_counter()
+
+        def time_limit(stage: Stage) -> float | None:
+            limits = [stage.timeout] if stage.timeout is not None else []
+            if deadline is not None:
+                limits.append(max(deadline - (time.perf_counter() - started), 0))
+            return min(limits) if limits else None
+
+        async def resolve(dep: str):
+            if dep in tasks:
+                return (await tasks[dep]).result
+            return inputs[dep]
+
+        async def run_stage(stage: Stage) -> StageResult:
+            if stage.name in reuse:
+                return StageResult(
+                    stage.name,
+                    reuse[stage.name],
+                    0.0,
+                    time.perf_counter() - started,
+                    reused=True,
+                )
+            args = [await resolve(dep) for dep in stage.deps]
+            stage_start = time.perf_counter()
+            limit = time_limit(stage)
+            scope = asyncio.timeout(limit)
+            try:
+                async with scope:
+                    result = await stage.fn(*args)
+            except StageError:
+                raise
+            except Exception as e:
+                if scope.expired():
+                    e = StageTimeout(stage.name, limit or 0.0)
+                if stage.critical:
+                    raise StageError(stage.name, e) from e
+                # degrade: dependents run with None in place of this result
+                now = time.perf_counter()
+                return StageResult(
+                    stage.name,
+                    None,
+                    now - stage_start,
+                    now - started,
+                    error=str(e) or type(e).__name__,
+                )
+            now = time.perf_counter()
+            return StageResult(stage.name, result, now - stage_start, now - started)
+
+        for stage in self.stages.values():
+            tasks[stage.name] = asyncio.create_task(
+                run_stage(stage), name=f"stage:{stage.name}"
+            )
+
+        pending = set(tasks.values())
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    yield task.result()
+        finally:
+            # a failed stage or a consumer that stopped listening cancels the rest
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
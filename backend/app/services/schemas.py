@@ -0,0 +1,303 @@
+from typing import List
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+# Response models for every LLM stage. They describe the same JSON the prompts
+# ask for and are sent as the JSON schema for structured outputs, so fields are
+# nullable / default to empty instead of being optional: strict mode requires
+# every key, while the local repair path tolerates models that omit some.
+
+
+class Schema(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
+
+# structure_job
+
+
+class JobInfo(Schema):
+    title: str | None = None
+    company: str | None = None
+    location: str | None = None
+    seniority_level: str | None = None
+    department_or_team: str | None = None
+    job_url: str | None = None
+
+
+class JobRequirements(Schema):
+    must_have: List[str] = Field(default_factory=list)
+    nice_to_have: List[str] = Field(default_factory=list)
+
+
+class JobSkills(Schema):
+    technical: List[str] = Field(default_factory=list)
+    soft: List[str] = Field(default_factory=list)
+    tools_and_technologies: List[str] = Field(default_factory=list)
+
+
+class Compensation(Schema):
+    salary_range: str | None = None
+    equity: str | None = None
+    bonus: str | None = None
+    benefits: List[str] = Field(default_factory=list)
+
+
+class JobDescription(Schema):
+    summary: str | None = None
+    responsibilities: List[str] = Field(default_factory=list)
+    requirements: JobRequirements = Field(default_factory=JobRequirements)
+    skills: JobSkills = Field(default_factory=JobSkills)
+    compensation_and_benefits: Compensation = Field(default_factory=Compensation)
+
+
+class JobData(Schema):
+    job_info: JobInfo = Field(default_factory=JobInfo)
+    description: JobDescription = Field(default_factory=JobDescription)
+
+
+# structure_linkedin
+
+
+class ProfileInfo(Schema):
+    name: str | None = None
+    headline: str | None = None
+    location: str | None = None
+    connections: int | str | None = None
+    avatar: str | None = None
+    linkedin_url: str | None = None
+
+
+class ProfileExperience(Schema):
+    title: str | None = None
+    company: str | None = None
+    location: str | None = None
+    start_date: str | None = None
+    end_date: str | None = None
+    description: str | None = None
+
+
+class ProfileEducation(Schema):
+    school: str | None = None
+    degree: str | None = None
+    field: str | None = None
+    start_year: str | int | None = None
+    end_year: str | int | None = None
+    description: str | None = None
+    logo: str | None = None
+    url: str | None = None
+
+
+class ProfileOrganization(Schema):
+    title: str | None = None
+    membership_type: str | None = None
+    start_date: str | None = None
+    end_date: str | None = None
+
+
+class ProfileLanguage(Schema):
+    title: str | None = None
+    subtitle: str | None = None
+
+
+class ProfileProject(Schema):
+    title: str | None = None
+    description: str | None = None
+
+
+class ProfileActivity(Schema):
+    interaction: str | None = None
+    link: str | None = None
+    title: str | None = None
+    img: str | None = None
+    id: str | None = None
+
+
+class ProfileData(Schema):
+    user_info: ProfileInfo = Field(default_factory=ProfileInfo)
+    experience: List[ProfileExperience] = Field(default_factory=list)
+    education: List[ProfileEducation] = Field(default_factory=list)
+    organizations: List[ProfileOrganization] = Field(default_factory=list)
+    languages: List[ProfileLanguage] = Field(default_factory=list)
+    projects: List[ProfileProject] = Field(default_factory=list)
+    activity: List[ProfileActivity] = Field(default_factory=list)
+
+
+# structure_research
+
+
+class CompanyInfo(Schema):
+    mission_statement: str | None = None
+    core_values: str | List[str] | None = None
+    engineering_culture: str | None = None
+    interview_process: str | None = None
+    common_interview_questions: List[str] = Field(default_factory=list)
+    leetcode_topics: List[str] = Field(default_factory=list)
+    recent_news: List[str] = Field(default_factory=list)
+
+
+class CompanyData(Schema):
+    company_info: CompanyInfo = Field(default_factory=CompanyInfo)
+
+
+# structure_references
+
+
+class Reference(Schema):
+    name: str | None = None
+    linkedin_url: str | None = None
+    email: str | None = None
+
+
+class References(Schema):
+    references: List[Reference] = Field(default_factory=list)
+
+
+# generate_fit_score
+
+
+class CategoryScore(Schema):
+    score: int | None = None
+    reason: str | None = None
+
+
+class FitCategories(Schema):
+    technical_skills_match: CategoryScore = Field(default_factory=CategoryScore)
+    experience_alignment: CategoryScore = Field(default_factory=CategoryScore)
+    education_background: CategoryScore = Field(default_factory=CategoryScore)
+    gpa_and_academics: CategoryScore = Field(default_factory=CategoryScore)
+    previous_company_experience: CategoryScore = Field(default_factory=CategoryScore)
+    leadership_and_involvement: CategoryScore = Field(default_factory=CategoryScore)
+
+
+class FitScore(Schema):
+    overall_fit_score: int | None = None
+    categories: FitCategories = Field(default_factory=FitCategories)
+
+
+# fit_score_reasons (the scores themselves are computed locally by FitScorer)
+
+
+class FitReasons(Schema):
+    technical_skills_match: str | None = None
+    experience_alignment: str | None = None
+    education_background: str | None = None
+    gpa_and_academics: str | None = None
+    previous_company_experience: str | None = None
+    leadership_and_involvement: str | None = None
+
+
+# get_leetcode (structured outputs need an object at the root, so the list of
+# problems is wrapped here and unwrapped again by the stage)
+
+
+class LeetcodeProblem(Schema):
+    problem_name: str | None = None
+    url: str | None = None
+
+
+class LeetcodeProblems(Schema):
+    problems: List[LeetcodeProblem] = Field(default_factory=list)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _wrap_list(cls, data):
+        # replies written against the old prompt are a bare list
+        return {"problems": data} if isinstance(data, list) else data
+
+
+# create_interview_questions
+
+
+class InterviewQuestion(Schema):
+    question: str | None = None
+
+
+class InterviewQuestions(Schema):
+    questions: List[InterviewQuestion] = Field(default_factory=list)
+
+
+# cheat_sheet
+
+
+class PersonExperience(Schema):
+    name: str | None = None
+    role: str | None = None
+    interviewTip: str | None = None
+
+
+class InterviewerIntel(Schema):
+    technicalSpecialties: List[str] = Field(default_factory=list)
+    affiliations: List[str] = Field(default_factory=list)
+    backgroundSummary: str | None = None
+
+
+class FitScoreSummary(Schema):
+    overall: int | float | None = None
+    skillsGaps: List[str] = Field(default_factory=list)
+    recommendedImprovements: List[str] = Field(default_factory=list)
+
+
+class CheatSheet(Schema):
+    speakPoints: List[str] = Field(default_factory=list)
+    companyMustKnows: List[str] = Field(default_factory=list)
+    recentNews: List[str] = Field(default_factory=list)
+    peopleExperience: List[PersonExperience] = Field(default_factory=list)
+    leetcodeTopics: List[str] = Field(default_factory=list)
+    interviewerIntel: InterviewerIntel = Field(default_factory=InterviewerIntel)
+    fitScoreSummary: FitScoreSummary = Field(default_factory=FitScoreSummary)
+
+
+# cheat_sheet split into sections (CHEAT_SHEET_SPLIT): each covers some of the
+# CheatSheet fields and is merged back into that shape
+
+
+class CheatSheetCompany(Schema):
+    companyMustKnows: List[str] = Field(default_factory=list)
+    recentNews: List[str] = Field(default_factory=list)
+    leetcodeTopics: List[str] = Field(default_factory=list)
+
+
+class CheatSheetFitSummary(Schema):
+    fitScoreSummary: FitScoreSummary = Field(default_factory=FitScoreSummary)
+
+
+class CheatSheetSpeakPoints(Schema):
+    speakPoints: List[str] = Field(default_factory=list)
+
+
+class CheatSheetInterviewer(Schema):
+    interviewerIntel: InterviewerIntel = Field(default_factory=InterviewerIntel)
+
+
+class CheatSheetPeople(Schema):
+    peopleExperience: List[PersonExperience] = Field(default_factory=list)
+
+
+# structure_output (resume)
+
+
+class ResumeInfo(Schema):
+    name: str | None = None
+    email: str | None = None
+    phone: str | None = None
+    linkedin: str | None = None
+
+
+class ResumeEducation(Schema):
+    school: str | None = None
+    degree: str | None = None
+    graduation_date: str | None = None
+
+
+class ResumeExperience(Schema):
+    company: str | None = None
+    role: str | None = None
+    dates: str | None = None
+    bullets: List[str] = Field(default_factory=list)
+
+
+class ResumeData(Schema):
+    user_info: ResumeInfo = Field(default_factory=ResumeInfo)
+    education: List[ResumeEducation] = Field(default_factory=list)
+    experience: List[ResumeExperience] = Field(default_factory=list)
+    skills: List[str] = Field(default_factory=list)
@@ -0,0 +1,67 @@
+import re
+from typing import List
+
+# End of a sentence: . ! or ? (plus closing quotes / brackets), whitespace and
+# the start of the next word, or a line break (feedback often comes as a list)
+SENTENCE_END_RE = re.compile(r"([.!?][\"')\]]*)\s+(?=(\S))|\s*\n+\s*")
+# Words whose trailing period doesn't end the sentence
+ABBREVIATIONS = {
+    "e.g.",
+    "i.e.",
+    "etc.",
+    "vs.",
+    "mr.",
+    "mrs.",
+    "ms.",
+    "dr.",
+    "jr.",
+    "sr.",
+}
+# "1." / "a." list markers and initials ("J. Smith")
+MARKER_RE = re.compile(r"(?:^|\s)(?:\d+|[A-Za-z])\.$")
+
+
+class SentenceSegmenter:
+    """
+    Incremental sentence splitter for streamed LLM text. Feed it deltas as
+    they arrive; each sentence is returned as soon as the next one has
+    started, so text-to-speech can begin on the first one while the rest is
+    still generating.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """
+        Args:
+            text (str): The next delta of the reply.
+
+        Returns:
+            list: Sentences completed by this delta, possibly none.
+        """
+        self.buffer += text
+        sentences = []
+        start = 0
+        for match in SENTENCE_END_RE.finditer(self.buffer):
+            end = match.end(1) if match.group(1) else match.start()
+            sentence = self.buffer[start:end].strip()
+            if match.group(1) and self._continues(sentence, match.group(2)):
+                continue
+            if sentence:
+                sentences.append(sentence)
+            start = match.end()
+        self.buffer = self.buffer[start:]
+        return sentences
+
+    def flush(self) -> str | None:
+        """The unterminated rest of the reply, once the stream has ended."""
+        rest, self.buffer = self.buffer.strip(), ""
+        return rest or None
+
+    @staticmethod
+    def _continues(sentence: str, following: str) -> bool:
+        if following.islower():
+            return True
+        last = sentence.rsplit(None, 1)[-1].lower() if sentence else ""
+        return last in ABBREVIATIONS or bool(MARKER_RE.search(sentence))
@@ -0,0 +1,172 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, List, Set
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+@dataclass
+class Turn:
+    question: str
+    answer: str
+    feedback: str
+
+
+@dataclass
+class InterviewSession:
+    """
+    Server-side state of one mock interview. `context` (job data, resume and
+    question list) is rendered once when the session starts and sent as the
+    same leading system message on every turn, so providers that cache
+    prompt prefixes can reuse it. Older turns are folded into `summary`; only
+    the last few are replayed verbatim.
+    """
+
+    context: str
+    questions: List[str]
+    session_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    summary: str = ""
+    turns: List[Turn] = field(default_factory=list)
+    turn_count: int = 0
+    created_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+    # one turn at a time, so replies build on each other in order
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False)
+    summarizing: bool = False
+
+    def next_question(self) -> str | None:
+        if self.turn_count < len(self.questions):
+            return self.questions[self.turn_count]
+        return None
+
+
+# Folds turns into the running summary: (summary, turns) -> new summary
+Summarizer = Callable[[str, List[Turn]], Awaitable[str]]
+
+
+class SessionStore:
+    """
+    In-memory LRU of interview sessions, bounded by count and evicted after
+    `ttl` seconds without a turn.
+
+    Prompts stay bounded by folding old turns into the session summary in
+    the background, off the turn's path. Folding happens in batches: once
+    2 * `recent_turns` turns are kept verbatim, all but the last
+    `recent_turns` are summarized. In between, each prompt extends the
+    previous one, so the provider's prompt cache covers everything but the
+    newest turn; summarizing after every turn would change the prompt
+    right after the context each time.
+    """
+
+    def __init__(
+        self, max_sessions: int = 1000, ttl: float = 60 * 60, recent_turns: int = 4
+    ):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.recent_turns = recent_turns
+        self._sessions: OrderedDict[str, InterviewSession] = OrderedDict()
+        self._tasks: Set[asyncio.Task] = set()
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+        self.summaries = 0
+        self.summary_failures = 0
+
+    @classmethod
+    def from_env(cls) -> "SessionStore":
+        return cls(
+            max_sessions=int(os.getenv("INTERVIEW_SESSIONS_MAX", "1000")),
+            ttl=float(os.getenv("INTERVIEW_SESSION_TTL", 60 * 60)),
+            recent_turns=int(os.getenv("INTERVIEW_RECENT_TURNS", "4")),
+        )
+
+    def _expire(self):
+        # least recently used first, so expired sessions are all at the front
+        now = time.time()
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.last_used + self.ttl >= now:
+                break
+            self._sessions.popitem(last=False)
+            self.expired += 1
+
+    def create(self, context: str, questions: List[str]) -> InterviewSession:
+        self._expire()
+        session = InterviewSession(context, questions)
+        self._sessions[session.session_id] = session
+        self.created += 1
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+        return session
+
+    def get(self, session_id: str) -> InterviewSession | None:
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        if session.last_used + self.ttl < time.time():
+            del self._sessions[session_id]
+            self.expired += 1
+            return None
+        session.last_used = time.time()
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def delete(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id, None) is not None
+
+    def record_turn(self, session: InterviewSession, turn: Turn, summarize: Summarizer):
+        """
+        Append a finished turn and, once 2 * `recent_turns` are kept verbatim,
+        fold the oldest into the summary in the background.
+        """
+        session.turns.append(turn)
+        session.turn_count += 1
+        if self._overflowing(session) and not session.summarizing:
+            session.summarizing = True
+            task = asyncio.create_task(self._summarize(session, summarize))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _summarize(self, session: InterviewSession, summarize: Summarizer):
+        try:
+            while self._overflowing(session):
+                # turns are only ever appended meanwhile, so the oldest ones
+                # are still at the front when the summary comes back
+                folded = session.turns[: len(session.turns) - self.recent_turns]
+                session.summary = await summarize(session.summary, folded)
+                del session.turns[: len(folded)]
+                self.summaries += 1
+        except Exception:
+            # keep the turns verbatim; the next turn tries again
+            self.summary_failures += 1
+        finally:
+            session.summarizing = False
+
+    def _overflowing(self, session: InterviewSession) -> bool:
+        return len(session.turns) >= max(2 * self.recent_turns, 1)
+
+    async def aclose(self):
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "active": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "ttl": self.ttl,
+            "recent_turns": self.recent_turns,
+            "created": self.created,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "summaries": self.summaries,
+            "summary_failures": self.summary_failures,
+        }
@@ -0,0 +1,75 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical calls: the first caller for a key runs the
+    upstream request, everyone who arrives while it is in flight waits for
+    and shares that same result (or exception). Every upstream call in the
+    service is async, so this only coalesces coroutines on the event loop.
+    """
+
+    def __init__(self):
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            self.calls += 1
+            # run as its own task so a cancelled caller doesn't cancel the
+            # request the other waiters are sharing
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every waiter went away
+
+    def stats(self) -> dict:
+        return {
+            "upstream_calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._tasks),
+        }
+
+
+class BatchFlight:
+    """
+    Coalescing that also remembers finished results, for the lifetime of one
+    batch request: postings from the same company share company-level stages
+    even when their calls don't overlap in time. First calls go through
+    `parent` so they still coalesce with other requests. Failures are
+    forgotten so a later posting can retry.
+    """
+
+    def __init__(self, parent: SingleFlight | None = None):
+        self.parent = parent
+        self._tasks: dict[str, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is None:
+            self.calls += 1
+            call = fn() if self.parent is None else self.parent.do(key, fn)
+            task = asyncio.ensure_future(call)
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task):
+        if task.cancelled() or task.exception() is not None:
+            if self._tasks.get(key) is task:
+                del self._tasks[key]
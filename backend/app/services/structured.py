@@ -0,0 +1,95 @@
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Type
+
+from dotenv import load_dotenv
+from openai.lib._parsing import type_to_response_format_param
+from pydantic import BaseModel
+
+load_dotenv()
+
+# Model families that accept `response_format={"type": "json_schema", ...}`;
+# everything else (plain gpt-4) gets the prompt-only path plus local repair.
+STRUCTURED_OUTPUT_PREFIXES = ("gpt-4o", "gpt-4.1", "gpt-5", "o1", "o3", "o4")
+
+FENCE_RE = re.compile(r"^\s*```[\w-]*\s*\n?|\n?\s*```\s*$")
+TRAILING_COMMA_RE = re.compile(r",\s*(?=[}\]])")
+
+
+class StructuredOutputError(ValueError):
+    """An LLM stage still had no schema-valid JSON after its retries."""
+
+    def __init__(self, stage: str, reason: str, attempts: int):
+        super().__init__(
+            f"{stage}: no valid structured output after {attempts} attempt(s) ({reason})"
+        )
+        self.stage = stage
+        self.reason = reason
+        self.attempts = attempts
+
+
+def supports_structured_outputs(model: str) -> bool:
+    return model.startswith(STRUCTURED_OUTPUT_PREFIXES)
+
+
+@lru_cache(maxsize=None)
+def response_format(schema: Type[BaseModel]) -> dict:
+    """Strict `json_schema` response_format for a response model."""
+    return type_to_response_format_param(schema)  # type: ignore
+
+
+def repair_json(text: str | None):
+    """
+    Best-effort decode of a JSON reply that didn't come through structured
+    outputs: strips markdown fences and prose around the first object or
+    array, and drops trailing commas.
+
+    Raises:
+        json.JSONDecodeError: If nothing decodable is left.
+    """
+    text = FENCE_RE.sub("", (text or "").strip())
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        raise json.JSONDecodeError("No JSON object in reply", text, 0)
+    text = TRAILING_COMMA_RE.sub("", text[min(starts) :])
+    # raw_decode ignores whatever follows the first complete value
+    value, _ = json.JSONDecoder().raw_decode(text)
+    return value
+
+
+def parse_reply(text: str | None, schema: Type[BaseModel]) -> BaseModel:
+    """Repair and validate a free-form reply against `schema`."""
+    return schema.model_validate(repair_json(text))
+
+
+@dataclass
+class ParseRetryPolicy:
+    """
+    How many extra attempts each stage gets when its reply doesn't parse or
+    validate. Structured outputs make failures rare, so the default is one
+    retry; long, expensive prompts can be capped lower.
+    """
+
+    default: int = 1
+    stages: Dict[str, int] = field(default_factory=lambda: {"cheat_sheet": 0})
+
+    @classmethod
+    def from_env(cls) -> "ParseRetryPolicy":
+        # LLM_PARSE_RETRIES_STAGES="cheat_sheet=0,structure_output=2"
+        policy = cls(default=int(os.getenv("LLM_PARSE_RETRIES", cls.default)))
+        for item in os.getenv("LLM_PARSE_RETRIES_STAGES", "").split(","):
+            stage, _, retries = item.partition("=")
+            if stage.strip() and retries.strip():
+                policy.stages[stage.strip()] = int(retries)
+        return policy
+
+    def retries(self, stage: str) -> int:
+        return max(self.stages.get(stage, self.default), 0)
@@ -0,0 +1,352 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List
+
+from app.services.cache import DAY, StageCache, normalize_text, normalize_url
+from app.services.clients import ClientRegistry
+from app.services.companies import resolve_company_from_url
+from app.services.company_index import CompanyIndex, Research
+from app.services.parallel_service import ParallelService
+from app.services.ratelimit import TokenBucket, current_tenant
+from app.services.runs import RunRecordStore
+from app.services.singleflight import SingleFlight
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# stage cache entries a warm-up fills, whose hit rate it reports afterwards
+CACHE_STAGES = ("search_job_description", "extract_company_name", "find_references")
+OUTCOMES = ("cached", "warmed", "failed")
+MAX_SCAN = 5000  # run records read when mining the run history
+
+
+class WarmupError(Exception):
+    pass
+
+
+class CacheWarmer:
+    """
+    Precomputes the pipeline stages that only depend on the posting, ahead
+    of a traffic spike on a few job URLs: job data and company name per URL
+    into the stage cache, references per company into the stage cache and
+    company research into the company index. Everything else depends on the
+    candidate's resume or LinkedIn profile and cannot be warmed.
+
+    At most `concurrency` postings are warmed at once and at most `rate` of
+    them start per second (0 for no limit). Upstream calls still go through
+    the client rate limiters, queued as a single tenant so live pipeline
+    runs keep their share.
+    """
+
+    def __init__(
+        self,
+        cache: StageCache | None,
+        companies: CompanyIndex,
+        concurrency: int = 4,
+        rate: float = 1.0,
+        max_urls: int = 50,
+        window: float = 7 * DAY,
+        token: str | None = None,
+    ):
+        self.cache = cache
+        self.companies = companies
+        self.concurrency = concurrency
+        self.rate = rate
+        self.max_urls = max_urls
+        self.window = window
+        self.token = token
+        self.running = False
+        self.warmups = 0
+        self.last: dict | None = None
+        self._baseline: Dict[str, tuple] = {}
+
+    @classmethod
+    def from_env(
+        cls, cache: StageCache | None, companies: CompanyIndex
+    ) -> "CacheWarmer":
+        """
+        Build the warmer from WARMUP_CONCURRENCY, WARMUP_RATE (postings per
+        second), WARMUP_MAX_URLS, WARMUP_WINDOW (seconds of run history mined
+        for top URLs) and WARMUP_TOKEN (the X-Admin-Token POST /admin/warmup
+        requires; the endpoint is off without it).
+        """
+        return cls(
+            cache,
+            companies,
+            concurrency=int(os.getenv("WARMUP_CONCURRENCY", "4")),
+            rate=float(os.getenv("WARMUP_RATE", "1")),
+            max_urls=int(os.getenv("WARMUP_MAX_URLS", "50")),
+            window=float(os.getenv("WARMUP_WINDOW", 7 * DAY)),
+            token=os.getenv("WARMUP_TOKEN") or None,
+        )
+
+    async def top_urls(
+        self, runs: RunRecordStore, limit: int | None = None
+    ) -> List[str]:
+        """
+        The most requested job URLs in the last `window` seconds of run
+        history, most requested first.
+
+        Args:
+            runs (RunRecordStore): Run history to mine.
+            limit (int): How many URLs, at most `max_urls` (the default).
+
+        Returns:
+            list: Job URLs as first requested.
+        """
+        limit = min(limit or self.max_urls, self.max_urls)
+        cutoff = time.time() - self.window
+        counts: Counter = Counter()
+        spelling: Dict[str, str] = {}
+        cursor, scanned = None, 0
+        while scanned < MAX_SCAN:
+            summaries, cursor = await runs.list(limit=100, cursor=cursor)
+            for summary in summaries:
+                if summary["created_at"] < cutoff:
+                    cursor = None
+                    break
+                job_url = summary["job_url"]
+                if job_url:
+                    key = normalize_url(job_url)
+                    counts[key] += 1
+                    spelling.setdefault(key, job_url)
+            scanned += len(summaries)
+            if cursor is None:
+                break
+        return [spelling[key] for key, _ in counts.most_common(limit)]
+
+    async def _cached(self, method, *args) -> bool:
+        """Whether a cached_stage method's entry exists, without a lookup count."""
+        return await self.cache.get(method.cache_key(*args)) is not None
+
+    def _snapshot(self) -> Dict[str, tuple]:
+        snapshot = {
+            stage: (self.cache.hits[stage], self.cache.misses[stage])
+            for stage in CACHE_STAGES
+        }
+        companies = self.companies
+        snapshot["company_index"] = (
+            companies.hits + companies.stale_hits,
+            companies.misses,
+        )
+        return snapshot
+
+    async def warm(
+        self,
+        job_urls: List[str],
+        parallel: ParallelService,
+        research: Research | None = None,
+    ) -> dict:
+        """
+        Warm the stage cache and company index for some job URLs.
+
+        Args:
+            job_urls (list): Postings to warm; duplicates (after URL
+                normalization) are dropped and at most `max_urls` are kept.
+            parallel (ParallelService): Service sharing the server's stage
+                cache and company index.
+            research (Callable): Company research for the index; defaults to
+                the index's own refresher.
+
+        Returns:
+            dict: Per-stage `cached` (already warm), `warmed` and `failed`
+            counts with their coverage, overall coverage, and the failures.
+
+        Raises:
+            WarmupError: If the stage cache is off or a warm-up is running.
+        """
+        if self.cache is None:
+            raise WarmupError("The stage cache is off (CACHE_BACKEND=off)")
+        if self.running:
+            raise WarmupError("A warm-up is already running")
+        self.running = True
+        tenant = current_tenant.set("warmup")
+        try:
+            report = await self._warm(job_urls, parallel, research)
+        finally:
+            current_tenant.reset(tenant)
+            self.running = False
+        self.warmups += 1
+        self.last = report
+        self._baseline = self._snapshot()
+        return report
+
+    async def _warm(
+        self,
+        job_urls: List[str],
+        parallel: ParallelService,
+        research: Research | None,
+    ) -> dict:
+        started = time.perf_counter()
+        urls = list({normalize_url(url): url for url in job_urls}.values())
+        urls = urls[: self.max_urls]
+        semaphore = asyncio.Semaphore(self.concurrency)
+        bucket = TokenBucket(self.rate, self.concurrency) if self.rate > 0 else None
+        outcomes: Dict[str, Counter] = defaultdict(Counter)
+        failures: List[dict] = []
+        companies: set = set()
+
+        async def stage(name: str, subject: str, cached: bool, call):
+            try:
+                result = await call
+                error = None if result is not None else "no result"
+            except Exception as e:
+                result, error = None, str(e)
+            if error is not None:
+                failures.append({"stage": name, "subject": subject, "error": error})
+            outcomes[name]["failed" if error else "cached" if cached else "warmed"] += 1
+            return result
+
+        async def company_data(company_name: str):
+            try:
+                outcome = await self.companies.warm(company_name, research)
+            except Exception as e:
+                outcome = "failed"
+                failures.append(
+                    {"stage": "company_data", "subject": company_name, "error": str(e)}
+                )
+            outcomes["company_data"][outcome] += 1
+
+        async def one(job_url: str):
+            job_cached = await self._cached(parallel.search_job_description, job_url)
+            # the company name comes from the job board URL or the job data
+            # when it can
+            name_cached = job_cached or bool(
+                resolve_company_from_url(job_url, careers_sites=False)
+            )
+            _, company_name = await asyncio.gather(
+                stage(
+                    "job_data",
+                    job_url,
+                    job_cached,
+                    parallel.search_job_description(job_url),
+                ),
+                stage(
+                    "company_name",
+                    job_url,
+                    name_cached,
+                    parallel.resolve_company_name(job_url),
+                ),
+            )
+            if not company_name or normalize_text(company_name) in companies:
+                return
+            companies.add(normalize_text(company_name))
+            references_cached = await self._cached(
+                parallel.find_references, company_name
+            )
+            await asyncio.gather(
+                stage(
+                    "references",
+                    company_name,
+                    references_cached,
+                    parallel.find_references(company_name),
+                ),
+                company_data(company_name),
+            )
+
+        async def paced(job_url: str):
+            async with semaphore:
+                if bucket is not None:
+                    await asyncio.sleep(bucket.reserve())
+                await one(job_url)
+
+        await asyncio.gather(*(paced(url) for url in urls))
+
+        stages = {}
+        for name in ("job_data", "company_name", "references", "company_data"):
+            counts = {outcome: outcomes[name][outcome] for outcome in OUTCOMES}
+            total = sum(counts.values())
+            covered = counts["cached"] + counts["warmed"]
+            counts["coverage"] = round(covered / total, 3) if total else None
+            stages[name] = counts
+        total = sum(sum(outcomes[name].values()) for name in stages)
+        failed = sum(outcomes[name]["failed"] for name in stages)
+        return {
+            "job_urls": len(urls),
+            "companies": len(companies),
+            "duration_ms": round((time.perf_counter() - started) * 1000),
+            "coverage": round((total - failed) / total, 3) if total else None,
+            "stages": stages,
+            "failures": failures,
+            "finished_at": time.time(),
+        }
+
+    def stats(self) -> dict:
+        """Settings, the last warm-up and the hit rate of warmed stages since."""
+        since = {}
+        if self.cache is not None and self._baseline:
+            for name, (hits, misses) in self._snapshot().items():
+                base_hits, base_misses = self._baseline[name]
+                hits, misses = hits - base_hits, misses - base_misses
+                since[name] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": (
+                        round(hits / (hits + misses), 3) if hits + misses else None
+                    ),
+                }
+        last = self.last
+        return {
+            "concurrency": self.concurrency,
+            "rate": self.rate,
+            "running": self.running,
+            "warmups": self.warmups,
+            "last": (
+                {key: value for key, value in last.items() if key != "failures"}
+                if last
+                else None
+            ),
+            "hit_rate_since_last": since,
+        }
+
+
+async def cli(args) -> dict:
+    cache = StageCache.from_env()
+    companies = CompanyIndex.from_env()
+    # a warm-up in this process only helps the server through shared files
+    if cache is None or not cache.backend.blocking:
+        sys.exit("The CLI warms a shared cache: set CACHE_BACKEND=sqlite")
+    if not getattr(companies.store, "blocking", False):
+        sys.exit("The CLI warms a shared index: set COMPANY_INDEX_BACKEND=sqlite")
+
+    warmer = CacheWarmer.from_env(cache, companies)
+    warmer.concurrency = args.concurrency or warmer.concurrency
+    warmer.rate = warmer.rate if args.rate is None else args.rate
+    job_urls = args.job_urls or await warmer.top_urls(
+        RunRecordStore.from_env(), args.top
+    )
+    if not job_urls:
+        sys.exit("No job URLs given and none in the run history")
+
+    clients = ClientRegistry.from_env()
+    flight = SingleFlight()
+    parallel = ParallelService(clients, cache, flight, companies=companies)
+    # as the server's index refresher: no stage cache, always upstream
+    research = ParallelService(clients, None, flight).company_research
+    try:
+        return await warmer.warm(job_urls, parallel, research)
+    finally:
+        await clients.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Warm the stage cache and company index for job URLs."
+    )
+    parser.add_argument(
+        "job_urls", nargs="*", help="Defaults to the top URLs in the run history"
+    )
+    parser.add_argument("--top", type=int, help="How many URLs to mine")
+    parser.add_argument("--concurrency", type=int)
+    parser.add_argument("--rate", type=float, help="Postings per second, 0 for any")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(cli(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+/pipeline with company research served from the company index vs researched
+inline on the request path.
+
+Runs the same sequence of /pipeline requests against the local stand-in
+twice, with the stage cache off so every other stage costs the same in both:
+`index` reads company_data from the CompanyIndex (the first request misses
+and queues the company for background research), `inline` runs
+company_research as a regular stage, as the old create_pipeline did. Reports
+end-to-end latency, the company_data stage's own time, how many responses
+had company_data, and the index stats.
+
+    uv run python -m bench.company_index --requests 10
+    uv run python -m bench.company_index --search-latency 4 --per-query 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+
+import httpx
+
+from bench.pipeline import JOB_URL, LINKEDIN_URL, percentile, sample_resume_pdf
+from bench.upstream import LatencyConfig, UpstreamServer, create_upstream
+
+
+async def run_mode(app, mode: str, args) -> dict:
+    from app.services.parallel_service import ParallelService
+
+    original = ParallelService.company_data
+    if mode == "inline":
+
+        async def company_data(self, company_name):
+            return await self.company_research(company_name)
+
+        ParallelService.company_data = company_data
+
+    resume = sample_resume_pdf()
+    totals, stage, served = [], [], 0
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench", timeout=None
+            ) as client:
+                for _ in range(args.requests):
+                    response = await client.post(
+                        "/pipeline",
+                        data={"jobUrl": JOB_URL, "linkedin": LINKEDIN_URL},
+                        files={"file": ("resume.pdf", resume, "application/pdf")},
+                        headers={"X-Include-Timings": "true"},
+                    )
+                    response.raise_for_status()
+                    output = response.json()
+                    totals.append(output["timings"]["total_ms"])
+                    stage.append(output["timings"]["stages_ms"]["company_data"])
+                    served += output["company_data"] is not None
+                    # time between requests, in which the refresher runs
+                    await asyncio.sleep(args.gap)
+            index = app.state.companies.stats()
+    finally:
+        ParallelService.company_data = original
+
+    return {
+        "latency_ms": {
+            "p50": round(percentile(totals, 50)),
+            "p95": round(percentile(totals, 95)),
+        },
+        "company_data_stage_ms": {
+            "p50": round(percentile(stage, 50), 1),
+            "max": round(max(stage), 1),
+        },
+        "responses_with_company_data": f"{served}/{args.requests}",
+        "company_index": index if mode == "index" else None,
+    }
+
+
+async def run(args) -> dict:
+    latency = LatencyConfig(
+        args.openai_latency,
+        1.0,
+        args.jitter,
+        search=args.search_latency,
+        per_query=args.per_query,
+    )
+    upstream = create_upstream(latency)
+    with UpstreamServer(upstream) as server:
+        os.environ["OPENAI_BASE_URL"] = f"{server.url}/v1"
+        os.environ["PARALLEL_BASE_URL"] = server.url
+        os.environ.setdefault("OPENAI_API_KEY", "bench")
+        os.environ.setdefault("PARALLEL_API_KEY", "bench")
+        os.environ["CACHE_BACKEND"] = "off"
+        os.environ["COMPANY_INDEX_BACKEND"] = "memory"
+        os.environ["RUN_RECORDS_BACKEND"] = "memory"
+
+        from app.main import app
+
+        return {mode: await run_mode(app, mode, args) for mode in ("index", "inline")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--openai-latency", type=float, default=0.5)
+    parser.add_argument("--search-latency", type=float, default=2.0)
+    parser.add_argument(
+        "--per-query",
+        type=float,
+        default=1.0,
+        help="Extra search seconds per query; company research sends five",
+    )
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument(
+        "--gap", type=float, default=0.5, help="Seconds between requests"
+    )
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
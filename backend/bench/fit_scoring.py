@@ -0,0 +1,179 @@
+"""
+Local fit scoring vs the LLM fit score, one resume against many jobs.
+
+Generates a seeded set of job postings whose technical requirements overlap
+the bench resume by a known fraction, then scores the resume against all of
+them three ways: the whole score from the LLM (FIT_SCORING=llm, the old
+path), local scores with LLM-written reasons, and fully local. The LLM is the
+bench.upstream stand-in, so its latency is simulated. Also reports whether
+local scores are deterministic and how well the technical score tracks the
+planted overlap (Spearman).
+
+    uv run python -m bench.fit_scoring --jobs 50
+    uv run python -m bench.fit_scoring --jobs 200 --openai-latency 1.5
+"""
+
+import argparse
+import asyncio
+import copy
+import json
+import os
+import random
+import time
+
+import numpy as np
+
+from bench.pipeline import percentile
+from bench.upstream import (
+    RESUME,
+    LatencyConfig,
+    UpstreamServer,
+    create_upstream,
+    load_fixtures,
+)
+
+TITLES = [
+    "Software Engineer Intern",
+    "Backend Engineer",
+    "Data Engineer",
+    "Frontend Developer",
+    "Machine Learning Engineer Intern",
+]
+OTHER_SKILLS = [
+    "Kotlin",
+    "Swift",
+    "Rust",
+    "Scala",
+    "Terraform",
+    "Kubernetes",
+    "GraphQL",
+    "Figma",
+    "Tableau",
+    "Spark",
+    "Elixir",
+    "Haskell",
+]
+
+
+def make_jobs(count: int, seed: int) -> list:
+    """(relevance, job) pairs: the share of listed skills the resume has."""
+    rng = random.Random(seed)
+    base = load_fixtures()["job_data"]
+    jobs = []
+    for _ in range(count):
+        relevance = rng.random()
+        skills = [
+            (
+                rng.choice(RESUME["skills"])
+                if rng.random() < relevance
+                else rng.choice(OTHER_SKILLS)
+            )
+            for _ in range(8)
+        ]
+        job = copy.deepcopy(base)
+        job["job_info"]["title"] = rng.choice(TITLES)
+        description = job["description"]
+        description["skills"]["technical"] = skills[:5]
+        description["skills"]["tools_and_technologies"] = skills[5:]
+        description["requirements"]["must_have"] = [
+            f"Experience with {skills[0]} and {skills[1]}",
+            "Enrolled in a BS/MS in Computer Science or related field.",
+        ]
+        jobs.append((relevance, job))
+    return jobs
+
+
+def spearman(a: list, b: list) -> float:
+    ranks = [np.argsort(np.argsort(x)) for x in (a, b)]
+    return float(np.corrcoef(*ranks)[0, 1])
+
+
+async def score_all(parallel, jobs: list, concurrency: int) -> tuple:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(job: dict) -> dict:
+        async with semaphore:
+            start = time.perf_counter()
+            result = await parallel.generate_fit_score(job, RESUME)
+            latencies.append(time.perf_counter() - start)
+            return result
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(job) for _, job in jobs))
+    return results, time.perf_counter() - start, latencies
+
+
+async def run(args) -> dict:
+    jobs = make_jobs(args.jobs, args.seed)
+    upstream = create_upstream(LatencyConfig(args.openai_latency, 0, args.jitter))
+    with UpstreamServer(upstream) as server:
+        os.environ["OPENAI_BASE_URL"] = f"{server.url}/v1"
+        os.environ.setdefault("OPENAI_API_KEY", "bench")
+        os.environ.setdefault("PARALLEL_API_KEY", "bench")
+
+        from app.services.clients import ClientRegistry
+        from app.services.fit_scoring import FitScorer
+        from app.services.parallel_service import ParallelService
+
+        clients = ClientRegistry.from_env()
+        report = {"jobs": args.jobs, "concurrency": args.concurrency}
+        for mode, scorer in (
+            ("llm", FitScorer(mode="llm")),
+            ("local_llm_reasons", FitScorer(reasons="llm")),
+            ("local", FitScorer(reasons="local")),
+        ):
+            parallel = ParallelService(clients, fit_scorer=scorer)
+            before = upstream.state.calls["openai"]
+            results, wall, latencies = await score_all(parallel, jobs, args.concurrency)
+            report[mode] = {
+                "wall_ms": round(wall * 1000, 1),
+                "per_job_ms": {
+                    "p50": round(percentile(latencies, 50) * 1000, 2),
+                    "p95": round(percentile(latencies, 95) * 1000, 2),
+                },
+                "llm_calls": upstream.state.calls["openai"] - before,
+            }
+            if mode == "local":
+                technical = [
+                    r["categories"]["technical_skills_match"]["score"] for r in results
+                ]
+                report[mode]["technical_vs_overlap_spearman"] = round(
+                    spearman([relevance for relevance, _ in jobs], technical), 3
+                )
+                report[mode]["overall_range"] = [
+                    min(r["overall_fit_score"] for r in results),
+                    max(r["overall_fit_score"] for r in results),
+                ]
+
+        # vectorized batch path: the resume is tokenized once
+        scorer = FitScorer(reasons="local")
+        start = time.perf_counter()
+        first = scorer.score_many([job for _, job in jobs], RESUME)
+        report["local_score_many_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        second = scorer.score_many([job for _, job in jobs], RESUME)
+        report["local_deterministic"] = all(
+            a.scores == b.scores for a, b in zip(first, second)
+        )
+        await clients.aclose()
+
+    report["speedup_vs_llm"] = {
+        mode: round(report["llm"]["wall_ms"] / max(report[mode]["wall_ms"], 1e-3), 1)
+        for mode in ("local_llm_reasons", "local")
+    }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--openai-latency", type=float, default=1.0)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
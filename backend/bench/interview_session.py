@@ -0,0 +1,147 @@
+"""
+Per-turn cost of a long /interview/session against the local stand-in.
+
+Runs one /pipeline to get a run_id, then the same N-turn interview twice:
+with the session's rolling summary (only the last INTERVIEW_RECENT_TURNS
+turns replayed verbatim), and with every past turn replayed, as a client
+resending its history would. Reports latency, prompt tokens and the prompt
+prefix served from the stand-in's prompt cache, by turn.
+
+    uv run python -m bench.interview_session --turns 30
+    uv run python -m bench.interview_session --turns 30 --per-prompt-token 0.0002
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import httpx
+
+from bench.pipeline import JOB_URL, LINKEDIN_URL, sample_resume_pdf
+from bench.upstream import LatencyConfig, UpstreamServer, create_upstream
+
+ANSWER = (
+    "In my last internship I owned a service that {i} other teams depended on. "
+    "I profiled the slow endpoints, added a cache in front of the database and "
+    "wrote load tests so we could see the effect before shipping. Latency went "
+    "down and we had fewer incidents, and I documented the trade-offs we made."
+)
+
+
+async def run_interview(client: httpx.AsyncClient, run_id: str, args) -> list:
+    questions = [f"Question {i}: walk me through a project." for i in range(args.turns)]
+    response = await client.post(
+        "/interview/session", data={"run_id": run_id, "questions": questions}
+    )
+    session_id = response.json()["session_id"]
+
+    turns = []
+    for i in range(args.turns):
+        start = time.perf_counter()
+        response = await client.post(
+            f"/interview/session/{session_id}/turn",
+            data={"answer": ANSWER.format(i=i)},
+        )
+        elapsed = time.perf_counter() - start
+        response.raise_for_status()
+        usage = response.json()["usage"]
+        turns.append(
+            {
+                "turn": i + 1,
+                "latency_ms": round(elapsed * 1000, 1),
+                "prompt_tokens": usage["prompt_tokens"],
+                "cached_tokens": usage["cached_tokens"],
+            }
+        )
+        # the candidate talking; background summaries catch up meanwhile
+        await asyncio.sleep(args.think_time)
+    return turns
+
+
+def summarize(turns: list) -> dict:
+    def avg(rows, key):
+        return round(sum(r[key] for r in rows) / len(rows), 1)
+
+    head, tail = turns[:5], turns[-5:]
+    return {
+        "first_5": {
+            k: avg(head, k) for k in ("latency_ms", "prompt_tokens", "cached_tokens")
+        },
+        "last_5": {
+            k: avg(tail, k) for k in ("latency_ms", "prompt_tokens", "cached_tokens")
+        },
+    }
+
+
+async def run(args) -> dict:
+    latency = LatencyConfig(
+        args.openai_latency,
+        0.05,
+        args.jitter,
+        per_token=args.per_token,
+        per_prompt_token=args.per_prompt_token,
+    )
+    upstream = create_upstream(latency)
+    with UpstreamServer(upstream) as server:
+        os.environ["OPENAI_BASE_URL"] = f"{server.url}/v1"
+        os.environ["PARALLEL_BASE_URL"] = server.url
+        os.environ.setdefault("OPENAI_API_KEY", "bench")
+        os.environ.setdefault("PARALLEL_API_KEY", "bench")
+        os.environ["RUN_RECORDS_BACKEND"] = "memory"
+
+        from app.main import app
+
+        report = {}
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench", timeout=None
+            ) as client:
+                response = await client.post(
+                    "/pipeline",
+                    data={"jobUrl": JOB_URL, "linkedin": LINKEDIN_URL},
+                    files={
+                        "file": ("resume.pdf", sample_resume_pdf(), "application/pdf")
+                    },
+                )
+                run_id = response.json()["run_id"]
+
+                for mode, recent in (
+                    ("rolling_summary", args.recent_turns),
+                    ("full_history", 10**6),
+                ):
+                    app.state.sessions.recent_turns = recent
+                    turns = await run_interview(client, run_id, args)
+                    report[mode] = {**summarize(turns), "turns": turns}
+                report["sessions"] = app.state.sessions.stats()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--recent-turns", type=int, default=4)
+    parser.add_argument("--openai-latency", type=float, default=0.2)
+    parser.add_argument("--per-token", type=float, default=0.0, help="Decode s/token")
+    parser.add_argument(
+        "--per-prompt-token",
+        type=float,
+        default=0.0001,
+        help="Prefill seconds per uncached prompt token",
+    )
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--think-time", type=float, default=0.2)
+    parser.add_argument("--verbose", action="store_true", help="Print every turn")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if not args.verbose:
+        for mode in ("rolling_summary", "full_history"):
+            report[mode].pop("turns")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+Offline end-to-end benchmark for /pipeline, /interview and /interview/stream.
+
+Replays recorded upstream responses through bench.upstream with injected
+latency, drives the real FastAPI app in-process at several concurrency
+levels, and writes throughput, latency percentiles and memory as JSON.
+
+    uv run python -m bench.pipeline --concurrency 1 4 16 --requests 32
+    uv run python -m bench.pipeline --compare bench/results/<old>.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import subprocess
+import time
+import tracemalloc
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import fitz  # PyMuPDF
+import httpx
+import uvicorn
+
+from bench.upstream import LatencyConfig, UpstreamServer, create_upstream
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+JOB_URL = "https://careers.salesforce.com/en/jobs/jr308796/summer-2026-intern-software-engineer/"
+LINKEDIN_URL = "https://www.linkedin.com/in/dariel-gutierrez/"
+
+
+def sample_resume_pdf() -> bytes:
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text(
+        (72, 72),
+        "Jane Doe\njane.doe@example.com\n\nEXPERIENCE\nAcme Corp - Software "
+        "Engineer Intern\n\nSKILLS\nPython, Java, React, SQL",
+    )
+    return doc.tobytes()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def endpoint_requests(endpoint: str, resume: bytes):
+    """Return a factory producing the kwargs for one request to `endpoint`."""
+    if endpoint == "/pipeline":
+        return lambda: {
+            "data": {"jobUrl": JOB_URL, "linkedin": LINKEDIN_URL},
+            "files": {"file": ("resume.pdf", resume, "application/pdf")},
+        }
+    if endpoint in ("/interview", "/interview/stream"):
+        return lambda: {
+            "data": {
+                "question": "Tell me about a project you're proud of.",
+                "answer": "I built a caching layer that cut latency by 40%.",
+            }
+        }
+    raise ValueError(f"Unknown endpoint {endpoint}")
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    endpoint: str,
+    concurrency: int,
+    total: int,
+    make,
+    trace_memory: bool = False,
+) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    first_sentences: list[float] = []
+    errors = degraded = 0
+
+    async def stream(start: float) -> bool:
+        """Read an SSE response, noting when the first sentence arrived."""
+        first = True
+        async with client.stream("POST", endpoint, **make()) as response:
+            async for line in response.aiter_lines():
+                if line == "event: error":
+                    return False
+                if line == "event: sentence" and first:
+                    first = False
+                    first_sentences.append(time.perf_counter() - start)
+            return response.status_code == 200
+
+    async def one():
+        nonlocal errors, degraded
+        async with semaphore:
+            start = time.perf_counter()
+            if endpoint.endswith("/stream"):
+                ok = await stream(start)
+                latencies.append(time.perf_counter() - start)
+                errors += not ok
+                return
+            response = await client.post(endpoint, **make())
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+            elif endpoint == "/pipeline" and response.json().get("errors"):
+                # served, but without an optional stage
+                degraded += 1
+
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    wall = time.perf_counter() - started
+    peak = 0
+    if trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    result = {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": total,
+        "errors": errors,
+        "degraded": degraded,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(total / wall, 3),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 1),
+            "p95": round(percentile(latencies, 95) * 1000, 1),
+            "p99": round(percentile(latencies, 99) * 1000, 1),
+            "mean": round(sum(latencies) / len(latencies) * 1000, 1),
+        },
+        "peak_alloc_mb": round(peak / 2**20, 2),
+        "max_rss_mb": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+        ),
+    }
+    if first_sentences:
+        # what a voice UI waits before it can start speaking
+        result["first_sentence_ms"] = {
+            "p50": round(percentile(first_sentences, 50) * 1000, 1),
+            "p95": round(percentile(first_sentences, 95) * 1000, 1),
+        }
+    return result
+
+
+@asynccontextmanager
+async def served(app):
+    """
+    Serve `app` on a local port from the current event loop, without running
+    its lifespan again. httpx.ASGITransport buffers whole responses, so
+    streamed endpoints are measured over a real socket instead.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app, host="127.0.0.1", port=port, lifespan="off", log_level="warning"
+        )
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", timeout=None
+        ) as client:
+            yield client
+    finally:
+        server.should_exit = True
+        await task
+
+
+async def run_benchmark(args) -> dict:
+    latency = LatencyConfig(
+        args.openai_latency,
+        args.parallel_latency,
+        args.jitter,
+        args.search_latency,
+        args.openai_token_latency,
+    )
+    upstream = create_upstream(latency, malformed_rate=args.malformed_rate)
+
+    with UpstreamServer(upstream) as server:
+        # must be set before the app's lifespan builds its clients
+        os.environ["OPENAI_BASE_URL"] = f"{server.url}/v1"
+        os.environ["PARALLEL_BASE_URL"] = server.url
+        os.environ.setdefault("OPENAI_API_KEY", "bench")
+        os.environ.setdefault("PARALLEL_API_KEY", "bench")
+        os.environ["CACHE_BACKEND"] = "memory" if args.cache else "off"
+        os.environ["RUN_RECORDS_BACKEND"] = "memory"
+        os.environ["CHEAT_SHEET_SPLIT"] = "1" if args.cheat_sheet_split else "0"
+
+        from app.main import app
+
+        resume = sample_resume_pdf()
+        results = []
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench", timeout=None
+            ) as client, served(app) as socket_client:
+                for endpoint in args.endpoints:
+                    make = endpoint_requests(endpoint, resume)
+                    for concurrency in args.concurrency:
+                        result = await run_level(
+                            socket_client if endpoint.endswith("/stream") else client,
+                            endpoint,
+                            concurrency,
+                            args.requests,
+                            make,
+                            args.trace_memory,
+                        )
+                        print(json.dumps(result))
+                        results.append(result)
+
+        upstream_calls = dict(upstream.state.calls)
+
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": {
+            "openai_latency": args.openai_latency,
+            "parallel_latency": args.parallel_latency,
+            "jitter": args.jitter,
+            "search_latency": args.search_latency,
+            "openai_token_latency": args.openai_token_latency,
+            "malformed_rate": args.malformed_rate,
+            "cache": args.cache,
+            "cheat_sheet_split": args.cheat_sheet_split,
+            "requests_per_level": args.requests,
+        },
+        "upstream_calls": upstream_calls,
+        "results": results,
+    }
+
+
+def compare(old: dict, new: dict):
+    """Print p50/p95 latency and throughput deltas between two result files."""
+    before = {(r["endpoint"], r["concurrency"]): r for r in old["results"]}
+    print(f"{old['commit']} -> {new['commit']}")
+    for result in new["results"]:
+        prev = before.get((result["endpoint"], result["concurrency"]))
+        if prev is None:
+            continue
+        row = [f"{result['endpoint']} c={result['concurrency']}"]
+        for label, a, b in (
+            ("p50", prev["latency_ms"]["p50"], result["latency_ms"]["p50"]),
+            ("p95", prev["latency_ms"]["p95"], result["latency_ms"]["p95"]),
+            ("rps", prev["throughput_rps"], result["throughput_rps"]),
+        ):
+            change = (b - a) / a * 100 if a else 0.0
+            row.append(f"{label} {a} -> {b} ({change:+.1f}%)")
+        print("  ".join(row))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--endpoints", nargs="+", default=["/pipeline", "/interview"]
+    )
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=16)
+    parser.add_argument("--openai-latency", type=float, default=0.5)
+    parser.add_argument("--parallel-latency", type=float, default=1.0)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument(
+        "--search-latency",
+        type=float,
+        help="Latency of Parallel search calls (LinkedIn profile, references), "
+        "to simulate one slow upstream; defaults to --parallel-latency",
+    )
+    parser.add_argument(
+        "--openai-token-latency",
+        type=float,
+        default=0.0,
+        help="Extra OpenAI latency per completion token, so long replies are "
+        "slower than short ones (e.g. 0.005 for ~200 tokens/s)",
+    )
+    parser.add_argument(
+        "--malformed-rate",
+        type=float,
+        default=0.0,
+        help="Share of free-form (non json_schema) JSON replies to malform",
+    )
+    parser.add_argument(
+        "--cache", action="store_true", help="Enable the stage cache while measuring"
+    )
+    parser.add_argument(
+        "--cheat-sheet-split",
+        action="store_true",
+        help="Write the cheat sheet as concurrent section calls (CHEAT_SHEET_SPLIT)",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Record peak Python allocations with tracemalloc (slows requests)",
+    )
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path, help="Previous results to diff against")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args))
+
+    output = args.output or RESULTS_DIR / f"{report['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"wrote {output}")
+
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), report)
+
+
+if __name__ == "__main__":
+    main()
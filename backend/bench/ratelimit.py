@@ -0,0 +1,109 @@
+"""
+Rate-limit governor vs plain SDK retries against a 429-ing upstream.
+
+Starts bench.upstream with a requests-per-minute limit per model, fires a
+burst of chat completions through ClientRegistry at a fixed client-side
+concurrency and reports achieved throughput (as a share of the limit), 429s,
+retries, failures and latency. `--mode sdk` turns the governor off and lets
+the OpenAI SDK retry on its own, as the services did before.
+
+    uv run python -m bench.ratelimit --rpm 600 --calls 300 --concurrency 64
+    uv run python -m bench.ratelimit --mode sdk
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from bench.pipeline import percentile
+from bench.upstream import LatencyConfig, UpstreamServer, create_upstream
+
+MODEL = "gpt-4.1-nano"
+
+
+async def run(args) -> dict:
+    upstream = create_upstream(
+        LatencyConfig(args.latency, 0, args.jitter), rpm=args.rpm
+    )
+    with UpstreamServer(upstream) as server:
+        os.environ["OPENAI_BASE_URL"] = f"{server.url}/v1"
+        os.environ.setdefault("OPENAI_API_KEY", "bench")
+        os.environ.setdefault("PARALLEL_API_KEY", "bench")
+
+        from app.services.clients import ClientRegistry
+        from app.services.ratelimit import Governor, LimiterSettings
+
+        clients = ClientRegistry.from_env()
+        if args.mode == "sdk":
+            # no client-side limit; the SDK retries 429s with its own backoff
+            unlimited = LimiterSettings(initial=10**6, max_limit=10**6)
+            key = Governor.env_key("openai", MODEL)
+            clients.governor = Governor({key: unlimited}, retries=0)
+            clients.openai = clients.openai.with_options(max_retries=args.retries)
+        else:
+            clients.governor.retries = args.retries
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies, failures = [], 0
+
+        async def one(i: int):
+            nonlocal failures
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    await clients.chat(
+                        "bench",
+                        model=MODEL,
+                        messages=[{"role": "user", "content": f"call {i}"}],
+                    )
+                    latencies.append(time.perf_counter() - start)
+                except Exception:
+                    failures += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.calls)))
+        wall = time.perf_counter() - started
+        stats = clients.governor.stats()
+        await clients.aclose()
+
+    ok = len(latencies)
+    return {
+        "mode": args.mode,
+        "rpm_limit": args.rpm,
+        "calls": args.calls,
+        "concurrency": args.concurrency,
+        "succeeded": ok,
+        "failed": failures,
+        "upstream_requests": upstream.state.calls["openai"],
+        "rate_limited": upstream.state.calls["rate_limited"],
+        "wall_seconds": round(wall, 2),
+        "throughput_rps": round(ok / wall, 2),
+        "limit_utilization": round(ok / wall / (args.rpm / 60), 3),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000),
+            "p95": round(percentile(latencies, 95) * 1000),
+            "max": round(max(latencies, default=0) * 1000),
+        },
+        "governor": stats if args.mode == "governor" else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mode", choices=["governor", "sdk"], default="governor")
+    parser.add_argument("--rpm", type=float, default=600)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    parser.add_argument(
+        "--retries", type=int, default=4, help="Retries per call in either mode"
+    )
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Recording pipeline runs: the old runs.json rewrite vs the SQLite run store.
+
+The old `save_run` loaded the whole JSON file, appended one run and wrote it
+all back, so each write costs O(runs) and concurrent writers overwrite each
+other. This appends `--runs` recorded pipeline runs (the bench fixture, spread
+over `--companies` companies) both ways, first from one writer and then from
+`--writers` processes at once, and reports per-write latency at the start
+and end of the file, total time and how many runs were actually kept. It then
+times one page of `GET /runs?company=...` against the run store, next to
+loading and filtering the JSON file.
+
+    uv run python -m bench.run_store --runs 300
+    uv run python -m bench.run_store --runs 1000 --writers 8
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from bench.pipeline import percentile
+from bench.upstream import load_fixtures
+
+OUTPUT_KEYS = (
+    "company_name",
+    "job_data",
+    "profile_data",
+    "fit_score",
+    "references",
+    "company_data",
+    "cheat_sheet",
+)
+
+
+@lru_cache
+def fixtures() -> dict:
+    return load_fixtures()
+
+
+def make_run(i: int, companies: int) -> dict:
+    run = {key: fixtures().get(key) for key in OUTPUT_KEYS}
+    run["company_name"] = f"Company {i % companies}"
+    return run
+
+
+def json_save_run(run_output, filename):
+    """save_run as it was: read everything, append, write everything."""
+    if os.path.exists(filename):
+        with open(filename, "r") as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError:
+                data = []
+    else:
+        data = []
+    data.append(run_output)
+    with open(filename, "w") as f:
+        json.dump(data, f, indent=4)
+
+
+BACKENDS: dict = {}
+
+
+def sqlite_save_run(run_output, filename):
+    from app.services.cache import normalize_text
+    from app.services.runs import RunRecord, SQLiteRunBackend
+
+    if filename not in BACKENDS:
+        # one connection per writer process, as each server worker has
+        BACKENDS[filename] = SQLiteRunBackend(filename)
+    BACKENDS[filename].save(
+        RunRecord(
+            outputs=run_output,
+            company=normalize_text(run_output["company_name"]),
+            inputs={
+                "job_url": f"https://jobs.example.com/{run_output['company_name']}"
+            },
+        )
+    )
+
+
+SAVERS = {"json": json_save_run, "sqlite": sqlite_save_run}
+
+
+def write(mode: str, filename: str, indexes: list, companies: int) -> list:
+    save = SAVERS[mode]
+    latencies = []
+    for i in indexes:
+        run = make_run(i, companies)
+        start = time.perf_counter()
+        save(run, filename)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def kept(mode: str, filename: str) -> int:
+    if mode == "json":
+        try:
+            return len(json.loads(Path(filename).read_text()))
+        except json.JSONDecodeError:
+            return 0
+    from app.services.runs import SQLiteRunBackend
+
+    return len(SQLiteRunBackend(filename))
+
+
+def ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+def run_sequential(mode: str, filename: str, args) -> dict:
+    start = time.perf_counter()
+    latencies = write(mode, filename, list(range(args.runs)), args.companies)
+    total = time.perf_counter() - start
+    edge = max(len(latencies) // 10, 1)
+    return {
+        "total_s": round(total, 2),
+        "first_10pct_write_ms_p50": ms(percentile(latencies[:edge], 50)),
+        "last_10pct_write_ms_p50": ms(percentile(latencies[-edge:], 50)),
+        "kept": kept(mode, filename),
+        "file_kb": round(Path(filename).stat().st_size / 1024),
+    }
+
+
+def run_concurrent(mode: str, filename: str, args) -> dict:
+    chunks = [list(range(w, args.runs, args.writers)) for w in range(args.writers)]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.writers) as pool:
+        results = list(
+            pool.map(
+                write,
+                [mode] * args.writers,
+                [filename] * args.writers,
+                chunks,
+                [args.companies] * args.writers,
+            )
+        )
+    total = time.perf_counter() - start
+    latencies = [latency for result in results for latency in result]
+    return {
+        "writers": args.writers,
+        "total_s": round(total, 2),
+        "write_ms": {
+            "p50": ms(percentile(latencies, 50)),
+            "p95": ms(percentile(latencies, 95)),
+        },
+        "kept": f"{kept(mode, filename)}/{args.runs}",
+    }
+
+
+def time_listing(json_file: str, sqlite_file: str, args) -> dict:
+    from app.services.runs import SQLiteRunBackend, decode_cursor, encode_cursor
+
+    backend = SQLiteRunBackend(sqlite_file)
+    company = "company 3"
+    timings = {"json": [], "sqlite": []}
+    for _ in range(args.queries):
+        start = time.perf_counter()
+        runs = json.loads(Path(json_file).read_text())
+        page = [r for r in reversed(runs) if r["company_name"].lower() == company]
+        page = page[: args.page]
+        timings["json"].append(time.perf_counter() - start)
+
+        # what GET /runs runs in a worker thread: a first page, then the next
+        start = time.perf_counter()
+        page = backend.list(company, None, args.page, None)
+        if page:
+            after = decode_cursor(encode_cursor(page[-1]))
+            backend.list(company, None, args.page, after)
+        timings["sqlite"].append((time.perf_counter() - start) / 2)
+    return {
+        mode: {"page_ms_p50": ms(percentile(values, 50))}
+        for mode, values in timings.items()
+    }
+
+
+def run(args) -> dict:
+    report = {"runs": args.runs, "companies": args.companies}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, suffix in (("json", "json"), ("sqlite", "sqlite3")):
+            report[mode] = {
+                "sequential": run_sequential(
+                    mode, os.path.join(tmp, f"sequential.{suffix}"), args
+                ),
+                "concurrent": run_concurrent(
+                    mode, os.path.join(tmp, f"concurrent.{suffix}"), args
+                ),
+            }
+        report["list_by_company"] = time_listing(
+            os.path.join(tmp, "sequential.json"),
+            os.path.join(tmp, "sequential.sqlite3"),
+            args,
+        )
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=300)
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--page", type=int, default=20)
+    args = parser.parse_args()
+    print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
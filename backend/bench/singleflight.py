@@ -0,0 +1,70 @@
+"""
+Single-flight harness: fire 50 concurrent identical stage calls at a fake
+slow upstream and check that only one upstream request is made.
+
+    uv run python -m bench.singleflight
+"""
+
+import asyncio
+import time
+
+from app.services.cache import MemoryBackend, StageCache, cached_stage, normalize_url
+from app.services.singleflight import SingleFlight
+
+CONCURRENCY = 50
+UPSTREAM_LATENCY = 0.5
+JOB_URL = "https://careers.salesforce.com/en/jobs/jr308796/summer-2026-intern-software-engineer/"
+
+
+class FakeService:
+    """Stands in for ParallelService with a slow, counted upstream."""
+
+    def __init__(self, cache: StageCache | None, flight: SingleFlight | None):
+        self.cache = cache
+        self.flight = flight
+        self.upstream_calls = 0
+
+    @cached_stage(
+        "search_job_description",
+        prompt_version="1",
+        model="fake",
+        key=normalize_url,
+    )
+    async def search_job_description(self, job_url: str) -> dict:
+        self.upstream_calls += 1
+        await asyncio.sleep(UPSTREAM_LATENCY)
+        return {"job_info": {"job_url": job_url}}
+
+
+async def run_async(with_flight: bool) -> dict:
+    service = FakeService(
+        StageCache(MemoryBackend()), SingleFlight() if with_flight else None
+    )
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(service.search_job_description(JOB_URL) for _ in range(CONCURRENCY))
+    )
+    assert all(r == results[0] for r in results)
+    return {
+        "path": "async",
+        "singleflight": with_flight,
+        "requests": CONCURRENCY,
+        "upstream_calls": service.upstream_calls,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def main():
+    reports = [
+        asyncio.run(run_async(with_flight=False)),
+        asyncio.run(run_async(with_flight=True)),
+    ]
+    for report in reports:
+        print(report)
+
+    assert reports[1]["upstream_calls"] == 1, reports[1]
+    print(f"OK: {CONCURRENCY} concurrent identical requests -> 1 upstream call")
+
+
+if __name__ == "__main__":
+    main()
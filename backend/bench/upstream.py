@@ -0,0 +1,410 @@
+"""
+Local stand-in for the OpenAI and Parallel APIs.
+
+Replays responses recorded in test_runs.json, or the latest run of a SQLite
+run store given as BENCH_RUNS (plus a synthetic resume), with configurable
+injected latency, so the pipeline can be benchmarked without
+network access or API spend. Point the SDKs at it with OPENAI_BASE_URL and
+PARALLEL_BASE_URL.
+"""
+
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+
+FIXTURE_FILE = Path(__file__).resolve().parent.parent / "test_runs.json"
+RUNS_FILE = Path(os.getenv("BENCH_RUNS", FIXTURE_FILE))
+
+RESUME = {
+    "user_info": {
+        "name": "Jane Doe",
+        "email": "jane.doe@example.com",
+        "phone": "(555) 123-4567",
+        "linkedin": "https://www.linkedin.com/in/jane-doe/",
+    },
+    "education": [
+        {
+            "school": "University of California, Berkeley",
+            "degree": "B.S. Computer Science",
+            "graduation_date": "May 2027",
+        }
+    ],
+    "experience": [
+        {
+            "company": "Acme Corp",
+            "role": "Software Engineer Intern",
+            "dates": "Jun 2025 - Aug 2025",
+            "bullets": [
+                "Built a Python service handling 2M requests/day",
+                "Cut p95 latency 40% by adding a Redis cache",
+            ],
+        }
+    ],
+    "skills": ["Python", "Java", "React", "SQL", "AWS", "Docker"],
+}
+
+SUMMARY = (
+    "Covered project experience and debugging. Clear structure and concrete "
+    "examples; keeps forgetting to quantify impact and discuss trade-offs."
+)
+FEEDBACK = (
+    "Strengths: you structured the answer clearly and gave a concrete example. "
+    "Areas for improvement: quantify the impact and explain the trade-offs you "
+    "considered. Overall a solid answer."
+)
+
+
+def load_recorded_run(path: Path) -> dict:
+    """
+    The stage outputs of the newest run in a SQLite run store, over the
+    committed fixture for the stages a pipeline run does not record.
+    """
+    from app.services.runs import SQLiteRunBackend
+
+    backend = SQLiteRunBackend(str(path))
+    newest = backend.list(None, None, 1, None)
+    if not newest:
+        raise ValueError(f"No runs recorded in {path}")
+    record = backend.get(newest[0]["run_id"])
+    fixture = json.loads(FIXTURE_FILE.read_text())[-1]
+    outputs = {k: v for k, v in record.outputs.items() if v is not None}
+    return {**fixture, **outputs}
+
+
+def load_fixtures(path: Path = RUNS_FILE) -> dict:
+    """The most recent recorded run, keyed by stage output name."""
+    if path.suffix in (".sqlite3", ".db"):
+        run = load_recorded_run(path)
+    else:
+        run = json.loads(path.read_text())[-1]
+    reasons = {
+        category: value.get("reason")
+        for category, value in (run["fit_score"].get("categories") or {}).items()
+    }
+    return {
+        **run,
+        "user_data": RESUME,
+        "feedback": FEEDBACK,
+        "summary": SUMMARY,
+        "fit_reasons": reasons,
+    }
+
+
+# (substring of the prompt, fixture key) - first match wins
+PROMPT_ROUTES = [
+    ("running summary of a mock interview", "summary"),
+    ("interviewer in a mock interview", "feedback"),
+    ("Extract structured data from the following resume", "user_data"),
+    ("Extract the company NAME", "company_name"),
+    ("messy job description", "job_data"),
+    ("LinkedIn-style search output", "profile_data"),
+    ("company research search output", "company_data"),
+    ("references search output", "references"),
+    ("reasons for a hiring fit score", "fit_reasons"),
+    ('"Fit Score"', "fit_score"),
+    ("leetcode problems", "leetcode_problems"),
+    ("practice interview questions", "questions"),
+    ("expert interview-analysis engine", "cheat_sheet"),
+    ("Given the interview question", "feedback"),
+]
+
+
+@dataclass
+class LatencyConfig:
+    openai: float = 0.5
+    parallel: float = 1.0
+    jitter: float = 0.2  # +/- fraction of the base latency
+    search: float | None = None  # Parallel search only, defaults to `parallel`
+    per_token: float = 0.0  # OpenAI decode time per completion token
+    per_prompt_token: float = 0.0  # OpenAI prefill time per uncached prompt token
+    per_query: float = 0.0  # Parallel search time per search query beyond the first
+
+    def prefill(self, uncached_tokens: int) -> float:
+        """OpenAI time to first token."""
+        return self.openai + uncached_tokens * self.per_prompt_token
+
+    def delay(self, base: float) -> float:
+        return max(base * (1 + random.uniform(-self.jitter, self.jitter)), 0)
+
+
+def route_prompt(prompt: str) -> str | None:
+    for needle, key in PROMPT_ROUTES:
+        if needle in prompt:
+            return key
+    return None
+
+
+class PromptCache:
+    """
+    Provider-style prompt caching: the longest previously seen prefix of a
+    prompt, from 1024 tokens up in 128-token steps, is reported as
+    `cached_tokens` and skips prefill.
+    """
+
+    MIN_TOKENS = 1024
+    STEP = 128
+
+    def __init__(self):
+        self.seen: set = set()
+
+    def lookup(self, model: str, prompt: str) -> int:
+        cached, hit = 0, True
+        for end in range(self.MIN_TOKENS, len(prompt) // 4 + 1, self.STEP):
+            key = (model, hash(prompt[: end * 4]))
+            if hit and key in self.seen:
+                cached = end
+            else:
+                hit = False
+                self.seen.add(key)
+        return cached
+
+
+class ServerRateLimit:
+    """
+    Requests-per-minute limit per model / endpoint, enforced like the real
+    APIs: a token bucket holding one second's worth of requests, 429 with
+    retry-after when it's empty, and x-ratelimit-* headers on every reply.
+    """
+
+    def __init__(self, rpm: float):
+        self.rate = rpm / 60
+        self.burst = max(self.rate, 1)
+        self.rpm = rpm
+        self.buckets: dict = {}
+
+    def check(self, key: str) -> tuple[bool, dict]:
+        now = time.monotonic()
+        tokens, updated = self.buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self.buckets[key] = (tokens, now)
+        wait = max((1 - tokens) / self.rate, 0)
+        headers = {
+            "x-ratelimit-limit-requests": str(int(self.rpm)),
+            "x-ratelimit-remaining-requests": str(int(tokens)),
+            "x-ratelimit-reset-requests": f"{wait * 1000:.0f}ms",
+        }
+        if not allowed:
+            headers["retry-after-ms"] = f"{wait * 1000:.0f}"
+        return allowed, headers
+
+
+def malform(content: str) -> str:
+    """The ways free-form JSON replies go wrong: fences, chatter, truncation."""
+    return random.choice(
+        [
+            f"```json\n{content}\n```",
+            f"Here is the JSON you asked for:\n{content}\nLet me know if you need more.",
+            content[: len(content) // 2],
+        ]
+    )
+
+
+def create_upstream(
+    latency: LatencyConfig,
+    fixtures: dict | None = None,
+    malformed_rate: float = 0.0,
+    rpm: float | None = None,
+) -> FastAPI:
+    """
+    Args:
+        latency (LatencyConfig): Injected per-call latency.
+        fixtures (dict): Replies keyed by stage output name.
+        malformed_rate (float): Share of JSON replies to chat calls without a
+            json_schema response_format that come back malformed.
+        rpm (float): Requests per minute allowed per model / Parallel
+            endpoint before answering 429; None for no limit.
+    """
+    fixtures = fixtures or load_fixtures()
+    app = FastAPI()
+    app.state.calls = {"openai": 0, "parallel": 0, "malformed": 0, "rate_limited": 0}
+    limits = ServerRateLimit(rpm) if rpm else None
+    prompt_cache = PromptCache()
+
+    def rate_limited(key: str, response: Response) -> JSONResponse | None:
+        if limits is None:
+            return None
+        allowed, headers = limits.check(key)
+        if allowed:
+            response.headers.update(headers)
+            return None
+        app.state.calls["rate_limited"] += 1
+        return JSONResponse(
+            status_code=429,
+            content={"error": {"type": "rate_limit_exceeded", "message": key}},
+            headers=headers,
+        )
+
+    def completion(model: str, prompt: str, content: str, cached: int = 0) -> dict:
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": content},
+                }
+            ],
+            "usage": {
+                "prompt_tokens": len(prompt) // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": (len(prompt) + len(content)) // 4,
+                "prompt_tokens_details": {"cached_tokens": cached},
+            },
+        }
+
+    def stream_completion(
+        model: str, prompt: str, content: str, cached: int, headers: dict
+    ):
+        """The reply as chat.completion.chunk SSE events, a word at a time."""
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+
+        def chunk(delta: dict, finish_reason=None, usage=None) -> str:
+            choices = [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            body = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [] if usage else choices,
+                "usage": usage,
+            }
+            return f"data: {json.dumps(body)}\n\n"
+
+        async def events():
+            # time to first token, then decode time per word
+            await asyncio.sleep(
+                latency.delay(latency.prefill(len(prompt) // 4 - cached))
+            )
+            yield chunk({"role": "assistant", "content": ""})
+            for word in re.findall(r"\s*\S+", content):
+                await asyncio.sleep(len(word) / 4 * latency.per_token)
+                yield chunk({"content": word})
+            yield chunk({}, "stop")
+            usage = completion(model, prompt, content, cached)["usage"]
+            yield chunk({}, usage=usage)
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(
+            events(), media_type="text/event-stream", headers=headers
+        )
+
+    @app.post("/v1/chat/completions")
+    async def chat(request: Request, response: Response):
+        body = await request.json()
+        app.state.calls["openai"] += 1
+        if limited := rate_limited(body["model"], response):
+            return limited
+        prompt = "\n".join(str(m.get("content", "")) for m in body["messages"])
+        key = route_prompt(prompt)
+        value = fixtures.get(key) if key else {}
+        # json_schema replies are guaranteed to parse, free-form ones aren't
+        structured = (body.get("response_format") or {}).get("type") == "json_schema"
+        if structured and isinstance(value, dict):
+            # a strict schema only gets the keys it declares back
+            schema = body["response_format"]["json_schema"]["schema"]
+            properties = schema.get("properties") or value
+            value = {k: v for k, v in value.items() if k in properties}
+        content = value if isinstance(value, str) else json.dumps(value)
+        if not isinstance(value, str) and not structured:
+            if random.random() < malformed_rate:
+                app.state.calls["malformed"] += 1
+                content = malform(content)
+        cached = prompt_cache.lookup(body["model"], prompt)
+        if body.get("stream"):
+            headers = {
+                k: v for k, v in response.headers.items() if k.startswith("x-ratelimit")
+            }
+            return stream_completion(body["model"], prompt, content, cached, headers)
+        completion_tokens = len(content) // 4
+        await asyncio.sleep(
+            latency.delay(
+                latency.prefill(len(prompt) // 4 - cached)
+                + completion_tokens * latency.per_token
+            )
+        )
+        return completion(body["model"], prompt, content, cached)
+
+    def excerpts(*keys: str) -> list:
+        return [json.dumps(fixtures.get(key)) for key in keys]
+
+    @app.post("/v1beta/search")
+    async def search(request: Request, response: Response):
+        body = await request.json()
+        app.state.calls["parallel"] += 1
+        if limited := rate_limited("search", response):
+            return limited
+        base = latency.parallel if latency.search is None else latency.search
+        extra = max(len(body.get("search_queries") or []) - 1, 0)
+        await asyncio.sleep(latency.delay(base + extra * latency.per_query))
+        queries = " ".join(body.get("search_queries") or [])
+        keys = ("profile_data",) if "linkedin" in queries else ("references",)
+        return {
+            "search_id": f"search_{uuid.uuid4().hex}",
+            "results": [
+                {"url": "https://example.com/result", "excerpts": excerpts(*keys)}
+            ],
+        }
+
+    @app.post("/v1beta/extract")
+    async def extract(request: Request, response: Response):
+        body = await request.json()
+        app.state.calls["parallel"] += 1
+        if limited := rate_limited("extract", response):
+            return limited
+        await asyncio.sleep(latency.delay(latency.parallel))
+        return {
+            "extract_id": f"extract_{uuid.uuid4().hex}",
+            "results": [
+                {"url": url, "excerpts": excerpts("job_data")} for url in body["urls"]
+            ],
+            "errors": [],
+        }
+
+    return app
+
+
+class UpstreamServer:
+    """Runs the stand-in upstream with uvicorn on a free port in a thread."""
+
+    def __init__(self, app: FastAPI):
+        self.app = app
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        config = uvicorn.Config(
+            app, host="127.0.0.1", port=self.port, log_level="warning"
+        )
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def __enter__(self) -> "UpstreamServer":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
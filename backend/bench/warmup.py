@@ -0,0 +1,169 @@
+"""
+A /pipeline traffic spike on a few postings, with and without a cache
+warm-up beforehand.
+
+Fires `--requests` concurrent /pipeline requests spread over `--urls`
+postings (each at its own company, each request with its own interviewer
+profile) at the local stand-in twice: `cold` starts from an empty stage cache
+and company index, `warm` first calls POST /admin/warmup for the same
+postings. Reports warm-up time and coverage, spike latency, upstream calls
+made during the spike, how many responses had company_data, and the hit rate
+of the warmed stages.
+
+    uv run python -m bench.warmup --requests 40 --urls 4
+    uv run python -m bench.warmup --search-latency 4 --per-query 1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+import httpx
+
+from bench.pipeline import percentile, sample_resume_pdf
+from bench.upstream import LatencyConfig, UpstreamServer, create_upstream
+
+ADMIN_TOKEN = "bench"
+
+
+def posting(i: int) -> str:
+    return f"https://careers.company{i}.com/jobs/{1000 + i}"
+
+
+async def run_mode(app, upstream, mode: str, args) -> dict:
+    urls = [posting(i) for i in range(args.urls)]
+    report = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=None
+        ) as client:
+            response = await client.post(
+                "/resume",
+                files={"file": ("resume.pdf", sample_resume_pdf(), "application/pdf")},
+            )
+            response.raise_for_status()
+            resume_id = response.json()["resume_id"]
+
+            if mode == "warm":
+                start = time.perf_counter()
+                response = await client.post(
+                    "/admin/warmup",
+                    data={"jobUrls": urls},
+                    headers={"X-Admin-Token": ADMIN_TOKEN},
+                )
+                response.raise_for_status()
+                warmup = response.json()
+                report["warmup"] = {
+                    "duration_s": round(time.perf_counter() - start, 2),
+                    "coverage": warmup["coverage"],
+                    "stages": {
+                        name: stage["coverage"]
+                        for name, stage in warmup["stages"].items()
+                    },
+                }
+
+            async def one(i: int) -> tuple:
+                start = time.perf_counter()
+                response = await client.post(
+                    "/pipeline",
+                    data={
+                        "jobUrl": urls[i % len(urls)],
+                        "linkedin": f"https://www.linkedin.com/in/interviewer-{i}/",
+                        "resume_id": resume_id,
+                    },
+                )
+                response.raise_for_status()
+                served = response.json()["company_data"] is not None
+                return time.perf_counter() - start, served
+
+            before = dict(upstream.state.calls)
+            start = time.perf_counter()
+            outcomes = await asyncio.gather(*(one(i) for i in range(args.requests)))
+            wall = time.perf_counter() - start
+            stats = (await client.get("/stats")).json()
+
+    latencies = [latency for latency, _ in outcomes]
+    cache = stats["cache"]["stages"]
+    report.update(
+        {
+            "spike_wall_s": round(wall, 2),
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50) * 1000),
+                "p95": round(percentile(latencies, 95) * 1000),
+            },
+            "spike_upstream_calls": {
+                kind: upstream.state.calls[kind] - before.get(kind, 0)
+                for kind in ("openai", "parallel")
+            },
+            "responses_with_company_data": (
+                f"{sum(served for _, served in outcomes)}/{args.requests}"
+            ),
+            "hit_rate": {
+                stage: round(cache[stage]["hit_rate"], 3)
+                for stage in ("search_job_description", "find_references")
+                if stage in cache
+            },
+        }
+    )
+    if mode == "warm":
+        report["hit_rate_since_warmup"] = {
+            stage: values["hit_rate"]
+            for stage, values in stats["warmup"]["hit_rate_since_last"].items()
+        }
+    return report
+
+
+async def run(args) -> dict:
+    latency = LatencyConfig(
+        args.openai_latency,
+        args.parallel_latency,
+        args.jitter,
+        search=args.search_latency,
+        per_query=args.per_query,
+    )
+    upstream = create_upstream(latency)
+    with UpstreamServer(upstream) as server:
+        os.environ["OPENAI_BASE_URL"] = f"{server.url}/v1"
+        os.environ["PARALLEL_BASE_URL"] = server.url
+        os.environ.setdefault("OPENAI_API_KEY", "bench")
+        os.environ.setdefault("PARALLEL_API_KEY", "bench")
+        os.environ["CACHE_BACKEND"] = "memory"
+        os.environ["COMPANY_INDEX_BACKEND"] = "memory"
+        os.environ["RUN_RECORDS_BACKEND"] = "memory"
+        os.environ["WARMUP_RATE"] = str(args.rate)
+        os.environ["WARMUP_CONCURRENCY"] = str(args.concurrency)
+        os.environ["WARMUP_TOKEN"] = ADMIN_TOKEN
+
+        from app.main import app
+
+        report = {"requests": args.requests, "urls": args.urls}
+        for mode in ("cold", "warm"):
+            report[mode] = await run_mode(app, upstream, mode, args)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--urls", type=int, default=4)
+    parser.add_argument("--openai-latency", type=float, default=0.5)
+    parser.add_argument("--parallel-latency", type=float, default=1.0)
+    parser.add_argument("--search-latency", type=float, default=2.0)
+    parser.add_argument(
+        "--per-query",
+        type=float,
+        default=0.5,
+        help="Extra search seconds per query; company research sends five",
+    )
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--concurrency", type=int, default=4, help="Warm-up slots")
+    parser.add_argument("--rate", type=float, default=2.0, help="Warm-ups per second")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
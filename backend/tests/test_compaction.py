@@ -0,0 +1,39 @@
+from app.services.compaction import (
+    Compactor,
+    _shrink,
+    _Sizes,
+    count_tokens,
+    minify,
+    prune,
+)
+
+
+def payload(n):
+    return {
+        "job": {"description": "build services " * n, "skills": ["python"] * 3},
+        "user": {"experience": [f"project {i} " * 20 for i in range(n)]},
+    }
+
+
+def test_stays_within_budget_trimming_low_priority_first():
+    compactor = Compactor({"cheat_sheet": 300})
+    out = compactor.compact("cheat_sheet", payload(200), {"job": 1, "user": 0})
+    assert sum(count_tokens(value) for value in out.values()) <= 300
+    assert out["user"] == "null"
+    assert out["job"].startswith('{"description":"build services')
+
+
+def test_under_budget_is_untouched():
+    compactor = Compactor({"cheat_sheet": 10_000})
+    out = compactor.compact("cheat_sheet", payload(5))
+    assert out["user"] == minify(prune(payload(5)["user"]))
+
+
+def test_shrink_tracks_sizes():
+    value = {"a": ["x" * 50] * 10, "b": {"c": "y" * 200, "d": [{"e": "z" * 30}]}}
+    sizes = _Sizes()
+    while value is not None:
+        size = sizes.of(value)
+        value, removed = _shrink(value, sizes)
+        if value is not None:
+            assert sizes.of(value) == len(minify(value)) == size - removed
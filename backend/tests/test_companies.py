@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from app.services.companies import resolve_company_from_url, same_company
+from app.services.parallel_service import ParallelService
+
+
+@pytest.mark.parametrize(
+    "url, company",
+    [
+        ("https://jobs.careers.microsoft.com/global/en/job/123", "Microsoft"),
+        ("https://careers.salesforce.com/en/jobs/jr308796/intern/", "Salesforce"),
+        ("https://www.metacareers.com/jobs/1", "Meta"),
+        ("https://boards.greenhouse.io/stripe/jobs/1", "Stripe"),
+        ("https://acme.wd5.myworkdayjobs.com/en-US/External/job/1", "Acme"),
+        ("https://apply.workable.com/acme/j/ABC", "Acme"),
+        ("https://jobs.jobvite.com/acme/job/oABC", "Acme"),
+    ],
+)
+def test_resolves_employer(url, company):
+    assert resolve_company_from_url(url) == company
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        # the careers host of a job search, not an employer
+        "https://careers.google.com/jobs/results/1",
+        # job boards name themselves, not the employer
+        "https://jobs.workable.com/view/abc",
+        "https://www.linkedin.com/jobs/view/123",
+        "https://www.careers.com/jobs/1",
+    ],
+)
+def test_does_not_return_generic_or_board_names(url):
+    assert resolve_company_from_url(url) is None
+
+
+def test_careers_sites_are_optional():
+    url = "https://careers.salesforce.com/en/jobs/1"
+    assert resolve_company_from_url(url, careers_sites=False) is None
+    assert (
+        resolve_company_from_url("https://jobs.jobvite.com/acme/job/1", False)
+        == "Acme"
+    )
+
+
+def test_same_company():
+    assert same_company("Meta", "Meta Platforms")
+    assert same_company("Salesforce", "salesforce.com")
+    assert not same_company("Careers", "Microsoft")
+
+
+class StubService(ParallelService):
+    def __init__(self, job_company):
+        self.job_company = job_company
+        self.llm_calls = 0
+
+    async def search_job_description(self, job_url):
+        return {"job_info": {"company": self.job_company}}
+
+    async def extract_company_name(self, job_url):
+        self.llm_calls += 1
+        return "From LLM"
+
+
+def resolve(url, job_company):
+    return asyncio.run(StubService(job_company).resolve_company_name(url))
+
+
+def test_job_data_overrides_contradicting_careers_host():
+    url = "https://jobs.acme-staffing.com/postings/1"
+    assert resolve(url, "Globex Corporation") == "Globex"
+
+
+def test_careers_host_kept_when_job_data_agrees_or_is_missing():
+    url = "https://careers.salesforce.com/en/jobs/1"
+    assert resolve(url, "Salesforce, Inc.") == "Salesforce"
+    assert resolve(url, None) == "Salesforce"
+
+
+def test_job_board_slug_is_trusted_over_job_data():
+    assert resolve("https://boards.greenhouse.io/stripe/jobs/1", "Other") == "Stripe"
+
+
+def test_falls_back_to_llm():
+    service = StubService(None)
+    url = "https://jobs.workable.com/view/abc"
+    assert asyncio.run(service.resolve_company_name(url)) == "From LLM"
+    assert service.llm_calls == 1
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.company_index import CompanyIndex, MemoryCompanyStore, ResearchPending
+from app.services.parallel_service import ParallelService
+from app.services.pipeline import RESULT_KEYS, PipelineRun
+from app.services.runs import RunRecordStore
+from app.services.scheduler import Stage, StageGraph
+
+
+class IndexOnlyService(ParallelService):
+    def __init__(self, companies):
+        self.companies = companies
+
+
+def test_miss_is_pending_until_researched():
+    companies = CompanyIndex(MemoryCompanyStore())
+    service = IndexOnlyService(companies)
+    with pytest.raises(ResearchPending):
+        asyncio.run(service.company_data("Acme"))
+    companies.store.update(
+        "acme", "Acme", company_info={"mission": "m"}, refreshed_at=time.time()
+    )
+    data = asyncio.run(service.company_data("Acme"))
+    assert data["company_info"] == {"mission": "m"}
+
+
+def test_miss_is_not_reused():
+    companies = CompanyIndex(MemoryCompanyStore())
+    service = IndexOnlyService(companies)
+
+    async def company_name(job_url):
+        return "Acme"
+
+    async def nothing(job_url):
+        return None
+
+    graph = StageGraph(
+        [
+            Stage("company_name", company_name, ("job_url",)),
+            Stage(
+                "company_data",
+                service.company_data,
+                ("company_name",),
+                critical=False,
+            ),
+            *(
+                Stage(name, nothing, ("job_url",))
+                for name in RESULT_KEYS
+                if name not in ("company_name", "company_data")
+            ),
+        ]
+    )
+    runs = RunRecordStore()
+    inputs = {"job_url": "https://acme.example/jobs/1"}
+
+    first = PipelineRun(graph, inputs, runs)
+    results = asyncio.run(first.run())
+    assert "company_data" in results["errors"]
+    assert "company_data" not in first.record.outputs
+
+    companies.store.update(
+        "acme", "Acme", company_info={"mission": "m"}, refreshed_at=time.time()
+    )
+    second = PipelineRun(graph, inputs, runs, previous_run_id=first.run_id)
+    asyncio.run(second.run())
+    assert "company_name" in second.reuse
+    assert "company_data" not in second.reuse
+    assert second.record.outputs["company_data"]["company_info"] == {"mission": "m"}
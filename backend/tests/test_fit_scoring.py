@@ -0,0 +1,44 @@
+import asyncio
+
+from app.services import parallel_service
+from app.services.fit_scoring import FitScorer, ResumeFeatures
+from app.services.parallel_service import ParallelService
+
+RESUME = {
+    "skills": ["Python", "SQL", "Kubernetes"],
+    "experience": [
+        {"role": "Software Engineer Intern", "company": "Acme", "bullets": ["x"]}
+    ],
+}
+
+
+class ScoringService(ParallelService):
+    def __init__(self):
+        self.fit_scorer = FitScorer(mode="local", reasons="local")
+        self._resume_features = {}
+
+
+def job(title, skills):
+    return {"job_info": {"title": title, "skills": skills}}
+
+
+def test_resume_features_are_built_once_per_resume(monkeypatch):
+    built, original = [], ResumeFeatures.of
+
+    def of(resume):
+        built.append(resume)
+        return original(resume)
+
+    monkeypatch.setattr(parallel_service.ResumeFeatures, "of", staticmethod(of))
+    service = ScoringService()
+
+    async def main():
+        return await asyncio.gather(
+            service.generate_fit_score(job("Backend", ["Python"]), RESUME),
+            service.generate_fit_score(job("Data", ["SQL"]), dict(RESUME)),
+            service.generate_fit_score(job("Infra", ["Go"]), {"skills": ["Go"]}),
+        )
+
+    scores = asyncio.run(main())
+    assert len(built) == 2
+    assert all(isinstance(s["overall_fit_score"], int) for s in scores)
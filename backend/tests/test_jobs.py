@@ -0,0 +1,38 @@
+import asyncio
+
+from app.services.jobs import Job, JobQueue, MemoryJobStore, QueueFull
+
+
+def test_memory_store_evicts_oldest_finished_jobs():
+    store = MemoryJobStore(max_finished=2)
+    running = Job(id="running", status="running")
+    store.save(running)
+    for i in range(4):
+        store.save(Job(id=f"done-{i}", status="done"))
+    assert store.get("running") is running
+    assert store.get("done-0") is None and store.get("done-1") is None
+    assert store.get("done-3") is not None
+
+
+class Run:
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self.graph = type("Graph", (), {"stages": {"job_data": None}})()
+
+
+def test_submit_saves_before_queueing():
+    async def main():
+        queue = JobQueue(MemoryJobStore(), max_depth=1)
+        job = await queue.submit(Run("a"))
+        assert (await queue.get("a")).status == "queued"
+        assert queue._queue.get_nowait()[0] is job
+        queue._queue.put_nowait((job, None))
+        try:
+            await queue.submit(Run("b"))
+        except QueueFull:
+            pass
+        else:
+            raise AssertionError("expected QueueFull")
+        assert await queue.get("b") is None
+
+    asyncio.run(main())